@@ -0,0 +1,42 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3b9f6c2d4e11
+Revises: 8462a38d6702
+Create Date: 2026-02-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f6c2d4e11'
+down_revision: Union[str, Sequence[str], None] = '8462a38d6702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_class_session_date_start_time_id',
+        'class_session',
+        ['date', 'start_time', 'id'],
+    )
+    op.create_index('ix_payment_paid_at_id', 'payment', ['paid_at', 'id'])
+    op.create_index('ix_charge_due_date_id', 'charge', ['due_date', 'id'])
+    op.create_index(
+        'ix_attendance_class_session_id_id',
+        'attendance',
+        ['class_session_id', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attendance_class_session_id_id', table_name='attendance')
+    op.drop_index('ix_charge_due_date_id', table_name='charge')
+    op.drop_index('ix_payment_paid_at_id', table_name='payment')
+    op.drop_index(
+        'ix_class_session_date_start_time_id', table_name='class_session'
+    )
@@ -0,0 +1,144 @@
+"""Add attendance rollup
+
+Revision ID: a9c3e5f7b1d4
+Revises: f2b7d4e9a1c6
+Create Date: 2026-02-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e5f7b1d4'
+down_revision: Union[str, Sequence[str], None] = 'f2b7d4e9a1c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'attendance_rollup',
+        sa.Column(
+            'student_id', postgresql.UUID(as_uuid=True), nullable=False
+        ),
+        sa.Column('class_group_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'present_count', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.Column(
+            'absent_count', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.Column(
+            'excused_count', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.Column(
+            'makeup_count', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.ForeignKeyConstraint(['class_group_id'], ['class_group.id']),
+        sa.ForeignKeyConstraint(['student_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('student_id', 'class_group_id'),
+    )
+    op.create_index(
+        'ix_attendance_rollup_class_group_id',
+        'attendance_rollup',
+        ['class_group_id'],
+    )
+    # Attendance is locked so no mark slips in between the backfill and
+    # the triggers.
+    op.execute('LOCK TABLE attendance IN SHARE MODE')
+    op.execute(
+        """
+        INSERT INTO attendance_rollup (
+            student_id, class_group_id,
+            present_count, absent_count, excused_count, makeup_count
+        )
+        SELECT attendance.student_id, class_session.class_group_id,
+               count(*) FILTER (WHERE attendance.status = 'PRESENT'),
+               count(*) FILTER (WHERE attendance.status = 'ABSENT'),
+               count(*) FILTER (WHERE attendance.status = 'EXCUSED'),
+               count(*) FILTER (WHERE attendance.is_makeup)
+        FROM attendance
+        JOIN class_session ON class_session.id = attendance.class_session_id
+        GROUP BY attendance.student_id, class_session.class_group_id
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_attendance_rollup(
+            mark attendance, delta integer
+        ) RETURNS void
+        LANGUAGE sql AS $$
+            INSERT INTO attendance_rollup AS rollup (
+                student_id, class_group_id,
+                present_count, absent_count, excused_count, makeup_count
+            )
+            SELECT mark.student_id, class_session.class_group_id,
+                   delta * (mark.status = 'PRESENT')::int,
+                   delta * (mark.status = 'ABSENT')::int,
+                   delta * (mark.status = 'EXCUSED')::int,
+                   delta * mark.is_makeup::int
+            FROM class_session
+            WHERE class_session.id = mark.class_session_id
+            ON CONFLICT (student_id, class_group_id) DO UPDATE
+            SET present_count = rollup.present_count + excluded.present_count,
+                absent_count = rollup.absent_count + excluded.absent_count,
+                excused_count = rollup.excused_count + excluded.excused_count,
+                makeup_count = rollup.makeup_count + excluded.makeup_count
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION roll_up_attendance_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM apply_attendance_rollup(OLD, -1);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM apply_attendance_rollup(NEW, 1);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_attendance_rollup_insert_delete
+        AFTER INSERT OR DELETE ON attendance
+        FOR EACH ROW EXECUTE FUNCTION roll_up_attendance_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_attendance_rollup_update
+        AFTER UPDATE OF status, is_makeup, class_session_id, student_id
+        ON attendance
+        FOR EACH ROW
+        WHEN (
+            (OLD.status, OLD.is_makeup, OLD.class_session_id, OLD.student_id)
+            IS DISTINCT FROM
+            (NEW.status, NEW.is_makeup, NEW.class_session_id, NEW.student_id)
+        )
+        EXECUTE FUNCTION roll_up_attendance_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER tr_attendance_rollup_update ON attendance')
+    op.execute(
+        'DROP TRIGGER tr_attendance_rollup_insert_delete ON attendance'
+    )
+    op.execute('DROP FUNCTION roll_up_attendance_change()')
+    op.execute('DROP FUNCTION apply_attendance_rollup(attendance, integer)')
+    op.drop_index(
+        'ix_attendance_rollup_class_group_id', table_name='attendance_rollup'
+    )
+    op.drop_table('attendance_rollup')
@@ -0,0 +1,33 @@
+"""Add payment allocation charge index
+
+Revision ID: b4d6f8a2c3e5
+Revises: a9c3e5f7b1d4
+Create Date: 2026-02-25 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d6f8a2c3e5'
+down_revision: Union[str, Sequence[str], None] = 'a9c3e5f7b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_payment_allocation_charge_id',
+        'payment_allocation',
+        ['charge_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_payment_allocation_charge_id', table_name='payment_allocation'
+    )
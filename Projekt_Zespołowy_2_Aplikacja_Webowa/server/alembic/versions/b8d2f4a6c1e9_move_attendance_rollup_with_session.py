@@ -0,0 +1,86 @@
+"""Move attendance rollup with its session
+
+Revision ID: b8d2f4a6c1e9
+Revises: e6b8d0f2a4c7
+Create Date: 2026-03-25 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f4a6c1e9'
+down_revision: Union[str, Sequence[str], None] = 'e6b8d0f2a4c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sessions moved before this revision left their counts with the old
+    # group, so the rollup is rebuilt under the same lock as its backfill.
+    op.execute('LOCK TABLE attendance, class_session IN SHARE MODE')
+    op.execute('DELETE FROM attendance_rollup')
+    op.execute(
+        """
+        INSERT INTO attendance_rollup (
+            student_id, class_group_id,
+            present_count, absent_count, excused_count, makeup_count
+        )
+        SELECT attendance.student_id, class_session.class_group_id,
+               count(*) FILTER (WHERE attendance.status = 'PRESENT'),
+               count(*) FILTER (WHERE attendance.status = 'ABSENT'),
+               count(*) FILTER (WHERE attendance.status = 'EXCUSED'),
+               count(*) FILTER (WHERE attendance.is_makeup)
+        FROM attendance
+        JOIN class_session ON class_session.id = attendance.class_session_id
+        GROUP BY attendance.student_id, class_session.class_group_id
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION move_attendance_rollup() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO attendance_rollup AS rollup (
+                student_id, class_group_id,
+                present_count, absent_count, excused_count, makeup_count
+            )
+            SELECT mark.student_id, moved.class_group_id,
+                   moved.delta * (mark.status = 'PRESENT')::int,
+                   moved.delta * (mark.status = 'ABSENT')::int,
+                   moved.delta * (mark.status = 'EXCUSED')::int,
+                   moved.delta * mark.is_makeup::int
+            FROM attendance AS mark
+            CROSS JOIN (
+                VALUES (OLD.class_group_id, -1), (NEW.class_group_id, 1)
+            ) AS moved (class_group_id, delta)
+            WHERE mark.class_session_id = NEW.id
+            ON CONFLICT (student_id, class_group_id) DO UPDATE
+            SET present_count = rollup.present_count + excluded.present_count,
+                absent_count = rollup.absent_count + excluded.absent_count,
+                excused_count = rollup.excused_count + excluded.excused_count,
+                makeup_count = rollup.makeup_count + excluded.makeup_count;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_class_session_attendance_rollup
+        AFTER UPDATE OF class_group_id ON class_session
+        FOR EACH ROW
+        WHEN (OLD.class_group_id IS DISTINCT FROM NEW.class_group_id)
+        EXECUTE FUNCTION move_attendance_rollup()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        'DROP TRIGGER tr_class_session_attendance_rollup ON class_session'
+    )
+    op.execute('DROP FUNCTION move_attendance_rollup()')
@@ -0,0 +1,90 @@
+"""Add class session overlap exclusion constraints
+
+Revision ID: c41e7a9d2b58
+Revises: 3b9f6c2d4e11
+Create Date: 2026-02-03 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d2b58'
+down_revision: Union[str, Sequence[str], None] = '3b9f6c2d4e11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Pairs of scheduled sessions the new constraints would reject. They were
+# possible before the session writes checked for conflicts.
+OVERLAPPING_SESSIONS = """
+    SELECT earlier.id, later.id
+    FROM class_session AS earlier
+    JOIN class_session AS later
+        ON later.id > earlier.id
+        AND later.{column} = earlier.{column}
+        AND tsrange(later.date + later.start_time, later.date + later.end_time)
+            && tsrange(
+                earlier.date + earlier.start_time,
+                earlier.date + earlier.end_time
+            )
+    WHERE earlier.status = 'scheduled' AND later.status = 'scheduled'
+    ORDER BY earlier.id, later.id
+"""
+
+
+def check_no_overlapping_sessions() -> None:
+    """Fail with the conflicting sessions instead of a bare constraint error."""
+    bind = op.get_bind()
+    conflicts = [
+        f'sessions {earlier_id} and {later_id} share {column}'
+        for column in ('room_id', 'instructor_id')
+        for earlier_id, later_id in bind.execute(
+            sa.text(OVERLAPPING_SESSIONS.format(column=column))
+        )
+    ]
+    if conflicts:
+        raise RuntimeError(
+            'Scheduled class sessions overlap, so the overlap constraints '
+            'cannot be added. Cancel or move one session of each pair and '
+            'run the upgrade again: ' + '; '.join(conflicts)
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    check_no_overlapping_sessions()
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        """
+        ALTER TABLE class_session
+        ADD CONSTRAINT ex_class_session_room_overlap
+        EXCLUDE USING gist (
+            room_id WITH =,
+            tsrange(date + start_time, date + end_time) WITH &&
+        )
+        WHERE (status = 'scheduled' AND room_id IS NOT NULL)
+        DEFERRABLE INITIALLY DEFERRED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE class_session
+        ADD CONSTRAINT ex_class_session_instructor_overlap
+        EXCLUDE USING gist (
+            instructor_id WITH =,
+            tsrange(date + start_time, date + end_time) WITH &&
+        )
+        WHERE (status = 'scheduled' AND instructor_id IS NOT NULL)
+        DEFERRABLE INITIALLY DEFERRED
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'ex_class_session_instructor_overlap', 'class_session'
+    )
+    op.drop_constraint('ex_class_session_room_overlap', 'class_session')
@@ -0,0 +1,33 @@
+"""Add user calendar token
+
+Revision ID: c5e7a9b1d3f6
+Revises: b8d2f4a6c1e9
+Create Date: 2026-03-26 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7a9b1d3f6'
+down_revision: Union[str, Sequence[str], None] = 'b8d2f4a6c1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'user', sa.Column('calendar_token', sa.String(length=64), nullable=True)
+    )
+    op.create_index(
+        op.f('ix_user_calendar_token'), 'user', ['calendar_token'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_calendar_token'), table_name='user')
+    op.drop_column('user', 'calendar_token')
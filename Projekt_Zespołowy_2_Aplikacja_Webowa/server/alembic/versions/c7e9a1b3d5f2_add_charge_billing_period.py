@@ -0,0 +1,38 @@
+"""Add charge billing period
+
+Revision ID: c7e9a1b3d5f2
+Revises: b4d6f8a2c3e5
+Create Date: 2026-03-04 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e9a1b3d5f2'
+down_revision: Union[str, Sequence[str], None] = 'b4d6f8a2c3e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('charge', sa.Column('billing_period', sa.Date()))
+    op.create_unique_constraint(
+        'uq_charge_student_billing_period',
+        'charge',
+        ['student_id', 'billing_period'],
+    )
+    op.execute("ALTER TYPE notification_type ADD VALUE 'NEW_CHARGE'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop an enum value, NEW_CHARGE stays in the type.
+    op.execute("DELETE FROM notification WHERE type = 'NEW_CHARGE'")
+    op.drop_constraint(
+        'uq_charge_student_billing_period', 'charge', type_='unique'
+    )
+    op.drop_column('charge', 'billing_period')
@@ -0,0 +1,40 @@
+"""Add notification outbox retries
+
+Revision ID: d2f4a6c8e1b3
+Revises: c7e9a1b3d5f2
+Create Date: 2026-03-11 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f4a6c8e1b3'
+down_revision: Union[str, Sequence[str], None] = 'c7e9a1b3d5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'notification',
+        sa.Column(
+            'attempts', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    op.create_index(
+        'ix_notification_pending_id',
+        'notification',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_pending_id', table_name='notification')
+    op.drop_column('notification', 'attempts')
@@ -0,0 +1,33 @@
+"""Drop attendance keyset index
+
+Revision ID: d9f1b3c5e7a2
+Revises: c5e7a9b1d3f6
+Create Date: 2026-03-27 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1b3c5e7a2'
+down_revision: Union[str, Sequence[str], None] = 'c5e7a9b1d3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Attendance pages are ordered by the session date, which this index
+    # cannot serve, and uq_attendance_session_student already covers
+    # lookups by session.
+    op.drop_index('ix_attendance_class_session_id_id', table_name='attendance')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_attendance_class_session_id_id',
+        'attendance',
+        ['class_session_id', 'id'],
+    )
@@ -0,0 +1,96 @@
+"""Add charge semester
+
+Revision ID: e1a3c5d7f9b2
+Revises: d9f1b3c5e7a2
+Create Date: 2026-03-30 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a3c5d7f9b2'
+down_revision: Union[str, Sequence[str], None] = 'd9f1b3c5e7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Billing-run charges take the only semester the student was enrolled in
+# that covers the charged month, or else the only semester they were
+# enrolled in at all. Ambiguous charges keep a NULL semester.
+BACKFILL_SEMESTER = """
+UPDATE charge
+SET semester_id = candidate.semester_id
+FROM (
+    SELECT charge.id AS charge_id, min(class_group.semester_id) AS semester_id
+    FROM charge
+    JOIN enrollment ON enrollment.student_id = charge.student_id
+    JOIN class_group ON class_group.id = enrollment.class_group_id
+    JOIN semester ON semester.id = class_group.semester_id
+    WHERE charge.billing_period IS NOT NULL
+      AND charge.semester_id IS NULL
+      {condition}
+    GROUP BY charge.id
+    HAVING count(DISTINCT class_group.semester_id) = 1
+) AS candidate
+WHERE charge.id = candidate.charge_id
+"""
+COVERS_PERIOD = """
+      AND semester.start_date < charge.billing_period + interval '1 month'
+      AND semester.end_date >= charge.billing_period
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('charge', sa.Column('semester_id', sa.Integer()))
+    op.create_foreign_key(
+        'charge_semester_id_fkey',
+        'charge',
+        'semester',
+        ['semester_id'],
+        ['id'],
+    )
+    op.execute(BACKFILL_SEMESTER.format(condition=COVERS_PERIOD))
+    op.execute(BACKFILL_SEMESTER.format(condition=''))
+    op.drop_constraint(
+        'uq_charge_student_billing_period', 'charge', type_='unique'
+    )
+    op.create_unique_constraint(
+        'uq_charge_student_semester_billing_period',
+        'charge',
+        ['student_id', 'semester_id', 'billing_period'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Charges of overlapping semesters cannot share the old key, keep the
+    # first one of each student and month as a billing-run charge.
+    op.execute(
+        """
+        UPDATE charge
+        SET billing_period = NULL
+        WHERE billing_period IS NOT NULL
+          AND EXISTS (
+              SELECT 1
+              FROM charge AS earlier
+              WHERE earlier.student_id = charge.student_id
+                AND earlier.billing_period = charge.billing_period
+                AND earlier.id < charge.id
+          )
+        """
+    )
+    op.drop_constraint(
+        'uq_charge_student_semester_billing_period', 'charge', type_='unique'
+    )
+    op.create_unique_constraint(
+        'uq_charge_student_billing_period',
+        'charge',
+        ['student_id', 'billing_period'],
+    )
+    op.drop_constraint(
+        'charge_semester_id_fkey', 'charge', type_='foreignkey'
+    )
+    op.drop_column('charge', 'semester_id')
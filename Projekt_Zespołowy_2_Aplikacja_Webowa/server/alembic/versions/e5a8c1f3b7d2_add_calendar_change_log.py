@@ -0,0 +1,198 @@
+"""Add calendar change log
+
+Revision ID: e5a8c1f3b7d2
+Revises: c41e7a9d2b58
+Create Date: 2026-02-04 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8c1f3b7d2'
+down_revision: Union[str, Sequence[str], None] = 'c41e7a9d2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'calendar_change',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'transaction_id',
+            sa.BigInteger(),
+            server_default=sa.text('(pg_current_xact_id()::text)::bigint'),
+            nullable=False,
+        ),
+        sa.Column('class_group_id', sa.Integer(), nullable=False),
+        sa.Column('class_session_id', sa.Integer(), nullable=True),
+        sa.Column(
+            'instructor_id', postgresql.UUID(as_uuid=True), nullable=True
+        ),
+        sa.Column(
+            'student_id', postgresql.UUID(as_uuid=True), nullable=True
+        ),
+        sa.Column('date', sa.Date(), nullable=True),
+        sa.Column('start_time', sa.Time(), nullable=True),
+        sa.Column('end_time', sa.Time(), nullable=True),
+        sa.Column(
+            'changed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_calendar_change_transaction_id',
+        'calendar_change',
+        ['transaction_id'],
+    )
+    op.execute(
+        """
+        CREATE FUNCTION log_class_session_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                INSERT INTO calendar_change (
+                    class_group_id, class_session_id, instructor_id,
+                    date, start_time, end_time
+                )
+                VALUES (
+                    OLD.class_group_id, OLD.id, OLD.instructor_id,
+                    OLD.date, OLD.start_time, OLD.end_time
+                );
+            END IF;
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO calendar_change (
+                    class_group_id, class_session_id, instructor_id,
+                    date, start_time, end_time
+                )
+                VALUES (
+                    NEW.class_group_id, NEW.id, NEW.instructor_id,
+                    NEW.date, NEW.start_time, NEW.end_time
+                );
+            ELSIF TG_OP = 'UPDATE' THEN
+                IF (NEW.class_group_id, NEW.instructor_id)
+                    IS DISTINCT FROM (OLD.class_group_id, OLD.instructor_id)
+                THEN
+                    INSERT INTO calendar_change (
+                        class_group_id, class_session_id, instructor_id,
+                        date, start_time, end_time
+                    )
+                    VALUES (
+                        NEW.class_group_id, NEW.id, NEW.instructor_id,
+                        NEW.date, NEW.start_time, NEW.end_time
+                    );
+                END IF;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_class_session_calendar_change
+        AFTER INSERT OR DELETE ON class_session
+        FOR EACH ROW EXECUTE FUNCTION log_class_session_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_class_session_calendar_update
+        AFTER UPDATE ON class_session
+        FOR EACH ROW
+        WHEN (
+            (
+                OLD.class_group_id, OLD.date, OLD.start_time, OLD.end_time,
+                OLD.status, OLD.room_id, OLD.instructor_id
+            ) IS DISTINCT FROM (
+                NEW.class_group_id, NEW.date, NEW.start_time, NEW.end_time,
+                NEW.status, NEW.room_id, NEW.instructor_id
+            )
+        )
+        EXECUTE FUNCTION log_class_session_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION log_class_group_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO calendar_change (class_group_id) VALUES (NEW.id);
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_class_group_calendar_change
+        AFTER UPDATE OF name, topic_id, level_id ON class_group
+        FOR EACH ROW
+        WHEN (
+            (OLD.name, OLD.topic_id, OLD.level_id)
+            IS DISTINCT FROM (NEW.name, NEW.topic_id, NEW.level_id)
+        )
+        EXECUTE FUNCTION log_class_group_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION log_enrollment_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                INSERT INTO calendar_change (class_group_id, student_id)
+                VALUES (OLD.class_group_id, OLD.student_id);
+            END IF;
+            IF TG_OP = 'INSERT' OR (
+                TG_OP = 'UPDATE'
+                AND (NEW.class_group_id, NEW.student_id)
+                    IS DISTINCT FROM (OLD.class_group_id, OLD.student_id)
+            ) THEN
+                INSERT INTO calendar_change (class_group_id, student_id)
+                VALUES (NEW.class_group_id, NEW.student_id);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_enrollment_calendar_change
+        AFTER INSERT OR DELETE
+        OR UPDATE OF status, class_group_id, student_id ON enrollment
+        FOR EACH ROW EXECUTE FUNCTION log_enrollment_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        'DROP TRIGGER tr_enrollment_calendar_change ON enrollment'
+    )
+    op.execute(
+        'DROP TRIGGER tr_class_group_calendar_change ON class_group'
+    )
+    op.execute(
+        'DROP TRIGGER tr_class_session_calendar_update ON class_session'
+    )
+    op.execute(
+        'DROP TRIGGER tr_class_session_calendar_change ON class_session'
+    )
+    op.execute('DROP FUNCTION log_enrollment_change()')
+    op.execute('DROP FUNCTION log_class_group_change()')
+    op.execute('DROP FUNCTION log_class_session_change()')
+    op.drop_index(
+        'ix_calendar_change_transaction_id', table_name='calendar_change'
+    )
+    op.drop_table('calendar_change')
@@ -0,0 +1,51 @@
+"""Add overdue payment reminders
+
+Revision ID: e6b8d0f2a4c7
+Revises: d2f4a6c8e1b3
+Create Date: 2026-03-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b8d0f2a4c7'
+down_revision: Union[str, Sequence[str], None] = 'd2f4a6c8e1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_charge_status_due_date',
+        'charge',
+        ['status', 'due_date'],
+        unique=False,
+    )
+    op.add_column(
+        'notification',
+        sa.Column(
+            'charge_id',
+            sa.Integer(),
+            sa.ForeignKey('charge.id'),
+            nullable=True,
+        ),
+    )
+    # A charge gets at most one overdue reminder.
+    op.create_index(
+        'uq_notification_overdue_charge',
+        'notification',
+        ['charge_id'],
+        unique=True,
+        postgresql_where=sa.text("type = 'PAYMENT_OVERDUE'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_notification_overdue_charge', table_name='notification')
+    op.drop_column('notification', 'charge_id')
+    op.drop_index('ix_charge_status_due_date', table_name='charge')
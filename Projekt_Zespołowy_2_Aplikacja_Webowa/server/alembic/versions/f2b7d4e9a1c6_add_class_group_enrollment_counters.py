@@ -0,0 +1,111 @@
+"""Add class group enrollment counters
+
+Revision ID: f2b7d4e9a1c6
+Revises: e5a8c1f3b7d2
+Create Date: 2026-02-11 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d4e9a1c6'
+down_revision: Union[str, Sequence[str], None] = 'e5a8c1f3b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'class_group',
+        sa.Column(
+            'enrolled_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    op.add_column(
+        'class_group',
+        sa.Column(
+            'waitlist_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    # Enrollments are locked so none slip in between the backfill and the
+    # triggers.
+    op.execute('LOCK TABLE enrollment IN SHARE MODE')
+    op.execute(
+        """
+        UPDATE class_group
+        SET enrolled_count = counts.enrolled_count,
+            waitlist_count = counts.waitlist_count
+        FROM (
+            SELECT class_group_id,
+                   count(*) FILTER (WHERE status = 'ACTIVE')
+                       AS enrolled_count,
+                   count(*) FILTER (WHERE status = 'WAITLISTED')
+                       AS waitlist_count
+            FROM enrollment
+            GROUP BY class_group_id
+        ) AS counts
+        WHERE class_group.id = counts.class_group_id
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION count_enrollment_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT'
+                AND OLD.status IN ('ACTIVE', 'WAITLISTED') THEN
+                UPDATE class_group
+                SET enrolled_count
+                        = enrolled_count - (OLD.status = 'ACTIVE')::int,
+                    waitlist_count
+                        = waitlist_count - (OLD.status = 'WAITLISTED')::int
+                WHERE id = OLD.class_group_id;
+            END IF;
+            IF TG_OP <> 'DELETE'
+                AND NEW.status IN ('ACTIVE', 'WAITLISTED') THEN
+                UPDATE class_group
+                SET enrolled_count
+                        = enrolled_count + (NEW.status = 'ACTIVE')::int,
+                    waitlist_count
+                        = waitlist_count + (NEW.status = 'WAITLISTED')::int
+                WHERE id = NEW.class_group_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_enrollment_counter_insert_delete
+        AFTER INSERT OR DELETE ON enrollment
+        FOR EACH ROW EXECUTE FUNCTION count_enrollment_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tr_enrollment_counter_update
+        AFTER UPDATE OF status, class_group_id ON enrollment
+        FOR EACH ROW
+        WHEN (
+            (OLD.status, OLD.class_group_id)
+            IS DISTINCT FROM (NEW.status, NEW.class_group_id)
+        )
+        EXECUTE FUNCTION count_enrollment_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER tr_enrollment_counter_update ON enrollment')
+    op.execute(
+        'DROP TRIGGER tr_enrollment_counter_insert_delete ON enrollment'
+    )
+    op.execute('DROP FUNCTION count_enrollment_change()')
+    op.drop_column('class_group', 'waitlist_count')
+    op.drop_column('class_group', 'enrolled_count')
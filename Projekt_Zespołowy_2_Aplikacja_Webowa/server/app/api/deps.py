@@ -1,7 +1,10 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import current_user
+from app.core.db import get_async_session
 from app.models.user import User, UserRole
+from app.services.common import calendar_feed as calendar_feed_service
 
 
 async def current_student(user: User = Depends(current_user)) -> User:
@@ -22,3 +25,40 @@ async def current_instructor_or_admin(
             detail="Not enough permissions.",
         )
     return user
+
+
+async def calendar_feed_user(
+    token: str = Query(min_length=1),
+    session: AsyncSession = Depends(get_async_session),
+) -> User:
+    """The owner of a calendar feed URL, for apps that send no cookies."""
+    user = await calendar_feed_service.get_calendar_token_user(session, token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar feed not found.",
+        )
+    return user
+
+
+async def calendar_feed_student(
+    user: User = Depends(calendar_feed_user),
+) -> User:
+    return await current_student(user)
+
+
+async def calendar_feed_instructor_or_admin(
+    user: User = Depends(calendar_feed_user),
+) -> User:
+    return await current_instructor_or_admin(user)
+
+
+async def calendar_feed_superuser(
+    user: User = Depends(calendar_feed_user),
+) -> User:
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions.",
+        )
+    return user
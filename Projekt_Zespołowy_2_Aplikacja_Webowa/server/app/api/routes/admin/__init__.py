@@ -5,6 +5,7 @@ from app.api.routes.admin import (
     calendar,
     charge,
     enrollment,
+    export,
     payment,
     schedule,
     users,
@@ -19,6 +20,7 @@ router.include_router(enrollment.router)
 router.include_router(attendance.router)
 router.include_router(charge.router)
 router.include_router(payment.router)
+router.include_router(export.router)
 router.include_router(users.router)
 
 
@@ -1,18 +1,29 @@
 from datetime import date
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import current_superuser
-from app.core.db import get_async_session
+from app.core.db import get_async_session, get_read_session
 from app.models.attendance import AttendanceStatus
 from app.schemas.attendance import (
     AttendanceCreate,
     AttendanceRead,
     AttendanceUpdate,
+    ClassGroupAttendanceReportRow,
+    StudentAttendanceReportRow,
 )
 from app.services.admin import attendance as attendance_service
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response
 
 router = APIRouter(
     prefix="/attendance",
@@ -23,6 +34,7 @@ router = APIRouter(
 
 @router.get("", response_model=list[AttendanceRead])
 async def list_attendance(
+    response: Response,
     student_id: uuid.UUID | None = None,
     class_group_id: int | None = None,
     session_id: int | None = None,
@@ -36,21 +48,62 @@ async def list_attendance(
     is_makeup: bool | None = None,
     limit: int = Query(default=100, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = None,
+    stream: bool = False,
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await attendance_service.list_attendance(
-        session,
-        student_id=student_id,
-        class_group_id=class_group_id,
-        session_id=session_id,
-        instructor_id=instructor_id,
-        semester_id=semester_id,
-        from_date=from_date,
-        to_date=to_date,
-        status=status_filter,
-        is_makeup=is_makeup,
-        limit=limit,
-        offset=offset,
+    filters = {
+        "student_id": student_id,
+        "class_group_id": class_group_id,
+        "session_id": session_id,
+        "instructor_id": instructor_id,
+        "semester_id": semester_id,
+        "from_date": from_date,
+        "to_date": to_date,
+        "status": status_filter,
+        "is_makeup": is_makeup,
+    }
+    try:
+        if stream:
+            query = attendance_service.ATTENDANCE_KEYSET.apply(
+                attendance_service.attendance_query(**filters), cursor
+            )
+            return ndjson_response(session, query, AttendanceRead)
+        items, next_cursor = await attendance_service.list_attendance(
+            session, **filters, limit=limit, offset=offset, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+@router.get(
+    "/reports/class-groups/{class_group_id}",
+    response_model=list[StudentAttendanceReportRow],
+)
+async def class_group_attendance_report(
+    class_group_id: int,
+    session: AsyncSession = Depends(get_read_session),
+):
+    return await attendance_service.report_class_group_attendance(
+        session, class_group_id
+    )
+
+
+@router.get(
+    "/reports/semesters/{semester_id}",
+    response_model=list[ClassGroupAttendanceReportRow],
+)
+async def semester_attendance_report(
+    semester_id: int,
+    session: AsyncSession = Depends(get_read_session),
+):
+    return await attendance_service.report_semester_attendance(
+        session, semester_id
     )
 
 
@@ -1,28 +1,37 @@
 from datetime import date
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import calendar_feed_superuser
 from app.auth.users import current_superuser
-from app.core.db import get_async_session
+from app.core.config import get_settings
+from app.core.db import get_read_session
 from app.schemas.calendar import CalendarEntryRead
 from app.services.admin import calendar as calendar_service
+from app.utils.icalendar import ics_response
 
-router = APIRouter(
-    prefix="/schedule",
-    tags=["admin"],
-    dependencies=[Depends(current_superuser)],
-)
+# The feed is polled by calendar apps, so it is authenticated by its URL
+# instead of the session cookie the other admin routes require.
+router = APIRouter(prefix="/schedule", tags=["admin"])
+settings = get_settings()
 
 
-@router.get("/calendar", response_model=list[CalendarEntryRead])
+@router.get(
+    "/calendar",
+    response_model=list[CalendarEntryRead],
+    dependencies=[Depends(current_superuser)],
+)
 async def get_calendar(
     from_date: date | None = None,
     to_date: date | None = None,
     room_id: int | None = None,
     instructor_id: uuid.UUID | None = None,
-    session: AsyncSession = Depends(get_async_session),
+    student_id: uuid.UUID | None = None,
+    topic_id: int | None = None,
+    level_id: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await calendar_service.list_calendar_entries(
         session,
@@ -30,4 +39,18 @@ async def get_calendar(
         to_date=to_date,
         room_id=room_id,
         instructor_id=instructor_id,
+        student_id=student_id,
+        topic_id=topic_id,
+        level_id=level_id,
+    )
+
+
+@router.get("/calendar.ics", dependencies=[Depends(calendar_feed_superuser)])
+async def get_calendar_feed(
+    sync_token: int | None = Query(default=None, ge=0),
+    session: AsyncSession = Depends(get_read_session),
+):
+    feed = await calendar_service.get_calendar_feed(session, since=sync_token)
+    return ics_response(
+        feed.events, settings.PROJECT_NAME, feed.sync_token, feed.full
     )
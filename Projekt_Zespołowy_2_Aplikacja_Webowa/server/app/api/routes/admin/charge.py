@@ -1,15 +1,30 @@
 from datetime import date
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import current_superuser
 from app.core.db import get_async_session
 from app.models.payment import ChargeStatus, ChargeType
 from app.models.user import User
-from app.schemas.payment import ChargeCreate, ChargeRead, ChargeUpdate
+from app.schemas.payment import (
+    BillingRunCreate,
+    BillingRunResult,
+    ChargeCreate,
+    ChargeRead,
+    ChargeUpdate,
+)
 from app.services.admin import charges as charge_service
+from app.utils.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response
 
 router = APIRouter(
     tags=["admin"],
@@ -19,23 +34,42 @@ router = APIRouter(
 
 @router.get("/charges", response_model=list[ChargeRead])
 async def list_charges(
+    response: Response,
     student_id: uuid.UUID | None = None,
     status_filter: ChargeStatus | None = Query(default=None, alias="status"),
     type_filter: ChargeType | None = Query(default=None, alias="type"),
     due_from: date | None = None,
     due_to: date | None = None,
     overdue: bool | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await charge_service.list_charges(
-        session,
-        student_id=student_id,
-        status=status_filter,
-        charge_type=type_filter,
-        due_from=due_from,
-        due_to=due_to,
-        overdue=overdue,
-    )
+    filters = {
+        "student_id": student_id,
+        "status": status_filter,
+        "charge_type": type_filter,
+        "due_from": due_from,
+        "due_to": due_to,
+        "overdue": overdue,
+    }
+    try:
+        if stream:
+            query = charge_service.CHARGE_KEYSET.apply(
+                charge_service.charges_query(**filters), cursor
+            )
+            return ndjson_response(session, query, ChargeRead)
+        items, next_cursor = await charge_service.list_charges(
+            session, **filters, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.get("/charges/{charge_id}", response_model=ChargeRead)
@@ -62,7 +96,7 @@ async def list_student_charges(
     overdue: bool | None = None,
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await charge_service.list_charges(
+    charges, _ = await charge_service.list_charges(
         session,
         student_id=student_id,
         status=status_filter,
@@ -71,6 +105,7 @@ async def list_student_charges(
         due_to=due_to,
         overdue=overdue,
     )
+    return charges
 
 
 @router.post(
@@ -97,6 +132,25 @@ async def create_charge(
         ) from exc
 
 
+@router.post("/billing-runs", response_model=BillingRunResult)
+async def create_billing_run(
+    payload: BillingRunCreate,
+    user: User = Depends(current_superuser),
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        billing_period, created = await charge_service.create_billing_run(
+            session, data=payload, created_by=user.id
+        )
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+        ) from exc
+    return BillingRunResult(
+        billing_period=billing_period, charges_created=created
+    )
+
+
 @router.patch("/charges/{charge_id}", response_model=ChargeRead)
 async def update_charge(
     charge_id: int,
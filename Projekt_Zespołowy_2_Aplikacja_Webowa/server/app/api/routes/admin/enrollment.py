@@ -108,18 +108,10 @@ async def delete_enrollment(
 
 @router.post(
     "/class-groups/{class_group_id}/waitlist/promote",
-    response_model=EnrollmentRead,
+    response_model=list[EnrollmentRead],
 )
 async def promote_waitlist(
     class_group_id: int,
     session: AsyncSession = Depends(get_async_session),
 ):
-    enrollment = await enrollment_service.promote_waitlist(
-        session, class_group_id
-    )
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No waitlisted enrollment to promote.",
-        )
-    return enrollment
+    return await enrollment_service.promote_waitlist(session, class_group_id)
@@ -0,0 +1,70 @@
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.users import current_superuser
+from app.core.db import get_read_session
+from app.services.admin import exports as export_service
+from app.utils.export import ExportFormat, export_response
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["admin"],
+    dependencies=[Depends(current_superuser)],
+)
+
+
+def _export(
+    session: AsyncSession,
+    query: Select,
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    try:
+        return export_response(session, query, export_format, filename)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+
+@router.get("/payments")
+async def export_payments(
+    export_format: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format"
+    ),
+    paid_from: datetime | None = None,
+    paid_to: datetime | None = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    query = export_service.payments_export_query(paid_from, paid_to)
+    return _export(session, query, export_format, "payments")
+
+
+@router.get("/charges")
+async def export_charges(
+    export_format: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format"
+    ),
+    due_from: date | None = None,
+    due_to: date | None = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    query = export_service.charges_export_query(due_from, due_to)
+    return _export(session, query, export_format, "charges")
+
+
+@router.get("/allocations")
+async def export_allocations(
+    export_format: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format"
+    ),
+    paid_from: datetime | None = None,
+    paid_to: datetime | None = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    query = export_service.allocations_export_query(paid_from, paid_to)
+    return _export(session, query, export_format, "allocations")
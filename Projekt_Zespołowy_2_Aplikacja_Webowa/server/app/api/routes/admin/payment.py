@@ -1,13 +1,21 @@
-from datetime import datetime
+from datetime import date, datetime
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import current_superuser
-from app.core.db import get_async_session
+from app.core.db import get_async_session, get_read_session
 from app.models.payment import PaymentMethod
 from app.schemas.payment import (
+    AutoAllocationResult,
     BillingSummary,
     PaymentAllocationCreate,
     PaymentAllocationRead,
@@ -15,8 +23,12 @@ from app.schemas.payment import (
     PaymentCreate,
     PaymentRead,
     PaymentUpdate,
+    ReceivablesAgingRow,
 )
 from app.services.admin import payments as payment_service
+from app.services.common import billing as billing_service
+from app.utils.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response
 
 router = APIRouter(
     tags=["admin"],
@@ -26,19 +38,38 @@ router = APIRouter(
 
 @router.get("/payments", response_model=list[PaymentRead])
 async def list_payments(
+    response: Response,
     student_id: uuid.UUID | None = None,
     paid_from: datetime | None = None,
     paid_to: datetime | None = None,
     method: PaymentMethod | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await payment_service.list_payments(
-        session,
-        student_id=student_id,
-        paid_from=paid_from,
-        paid_to=paid_to,
-        method=method,
-    )
+    filters = {
+        "student_id": student_id,
+        "paid_from": paid_from,
+        "paid_to": paid_to,
+        "method": method,
+    }
+    try:
+        if stream:
+            query = payment_service.PAYMENT_KEYSET.apply(
+                payment_service.payments_query(**filters), cursor
+            )
+            return ndjson_response(session, query, PaymentRead)
+        items, next_cursor = await payment_service.list_payments(
+            session, **filters, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.get("/payments/{payment_id}", response_model=PaymentRead)
@@ -63,7 +94,10 @@ async def list_student_payments(
     student_id: uuid.UUID,
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await payment_service.list_payments(session, student_id=student_id)
+    payments, _ = await payment_service.list_payments(
+        session, student_id=student_id
+    )
+    return payments
 
 
 @router.post(
@@ -174,6 +208,30 @@ async def create_payment_allocation(
         raise HTTPException(status_code=status_code, detail=str(exc)) from exc
 
 
+@router.post(
+    "/payments/{payment_id}/allocations/auto",
+    response_model=list[PaymentAllocationRead],
+)
+async def auto_allocate_payment(
+    payment_id: int,
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        return await payment_service.auto_allocate_payment(session, payment_id)
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+        ) from exc
+
+
+@router.post("/payments/auto-allocate", response_model=AutoAllocationResult)
+async def auto_allocate_payments(
+    session: AsyncSession = Depends(get_async_session),
+):
+    written = await payment_service.auto_allocate_payments(session)
+    return AutoAllocationResult(allocations_written=written)
+
+
 @router.patch(
     "/payments/{payment_id}/allocations/{charge_id}",
     response_model=PaymentAllocationRead,
@@ -226,3 +284,11 @@ async def billing_summary(
     session: AsyncSession = Depends(get_async_session),
 ):
     return await payment_service.summarize_student_billing(session, student_id)
+
+
+@router.get("/billing/aging", response_model=list[ReceivablesAgingRow])
+async def receivables_aging(
+    as_of: date | None = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    return await billing_service.receivables_aging(session, today=as_of)
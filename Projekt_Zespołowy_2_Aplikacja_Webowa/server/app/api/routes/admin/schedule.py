@@ -1,6 +1,13 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import current_superuser
@@ -13,6 +20,7 @@ from app.schemas.class_group import (
     ClassGroupUpdate,
 )
 from app.schemas.class_session import (
+    ClassGroupBulkGenerateSessions,
     ClassGroupGenerateSessions,
     ClassSessionBulkCancel,
     ClassSessionBulkUpdate,
@@ -38,11 +46,14 @@ from app.schemas.topic import TopicCreate, TopicRead, TopicUpdate
 from app.services.admin import (
     class_groups,
     class_sessions,
+    conflicts,
     rooms,
     semesters,
     skill_levels,
     topics,
 )
+from app.utils.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response
 
 router = APIRouter(
     prefix="/schedule",
@@ -315,6 +326,38 @@ async def delete_class_group(
     await class_groups.delete_class_group(session, class_group)
 
 
+@router.post(
+    "/class-groups/generate-sessions",
+    response_model=list[ClassSessionRead],
+    status_code=status.HTTP_201_CREATED,
+)
+async def generate_sessions_for_class_groups(
+    payload: ClassGroupBulkGenerateSessions,
+    session: AsyncSession = Depends(get_async_session),
+):
+    if payload.start_date > payload.end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Start date must be before end date.",
+        )
+    try:
+        return await class_groups.generate_sessions_for_class_groups(
+            session, payload
+        )
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+        ) from exc
+    except conflicts.ScheduleConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+
 @router.post(
     "/class-groups/{class_group_id}/generate-sessions",
     response_model=list[ClassSessionRead],
@@ -340,10 +383,14 @@ async def generate_class_group_sessions(
         return await class_groups.generate_sessions(
             session, class_group, payload
         )
-    except ValueError as exc:
+    except conflicts.ScheduleConflictError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail=str(exc)
         ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
 
 
 @router.delete(
@@ -374,6 +421,7 @@ async def delete_class_group_sessions(
 
 @router.get("/class-sessions", response_model=list[ClassSessionRead])
 async def list_class_sessions(
+    response: Response,
     from_date: date | None = None,
     to_date: date | None = None,
     class_group_id: int | None = None,
@@ -381,16 +429,34 @@ async def list_class_sessions(
         default=None, alias="status"
     ),
     room_id: int | None = None,
-    session: AsyncSession = Depends(get_async_session),
-):
-    return await class_sessions.list_class_sessions(
-        session,
-        from_date=from_date,
-        to_date=to_date,
-        class_group_id=class_group_id,
-        status=status_filter,
-        room_id=room_id,
-    )
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+):
+    filters = {
+        "from_date": from_date,
+        "to_date": to_date,
+        "class_group_id": class_group_id,
+        "status": status_filter,
+        "room_id": room_id,
+    }
+    try:
+        if stream:
+            query = class_sessions.CLASS_SESSION_KEYSET.apply(
+                class_sessions.class_sessions_query(**filters), cursor
+            )
+            return ndjson_response(session, query, ClassSessionRead)
+        items, next_cursor = await class_sessions.list_class_sessions(
+            session, **filters, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.post(
@@ -418,10 +484,18 @@ async def bulk_update_class_sessions(
         return await class_sessions.bulk_update_class_sessions(
             session, payload.session_ids, payload.updates
         )
-    except ValueError as exc:
+    except LookupError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
         ) from exc
+    except conflicts.ScheduleConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
 
 
 @router.get(
@@ -451,9 +525,18 @@ async def create_class_session(
     class_session_create: ClassSessionCreate,
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await class_sessions.create_class_session(
-        session, class_session_create
-    )
+    try:
+        return await class_sessions.create_class_session(
+            session, class_session_create
+        )
+    except conflicts.ScheduleConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
 
 
 @router.patch(
@@ -473,9 +556,18 @@ async def update_class_session(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Class session not found.",
         )
-    return await class_sessions.update_class_session(
-        session, class_session, class_session_update
-    )
+    try:
+        return await class_sessions.update_class_session(
+            session, class_session, class_session_update
+        )
+    except conflicts.ScheduleConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
 
 
 @router.delete(
@@ -558,14 +650,23 @@ async def reschedule_class_session(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Class session not found.",
         )
-    return await class_sessions.reschedule_class_session(
-        session,
-        class_session,
-        payload.new_date,
-        payload.new_start_time,
-        payload.new_end_time,
-        payload.reason,
-    )
+    try:
+        return await class_sessions.reschedule_class_session(
+            session,
+            class_session,
+            payload.new_date,
+            payload.new_start_time,
+            payload.new_end_time,
+            payload.reason,
+        )
+    except conflicts.ScheduleConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
 
 
 @router.get(
@@ -1,6 +1,6 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_async_session
@@ -10,8 +10,20 @@ from app.services.all import schedule as schedule_service
 router = APIRouter(prefix="/public", tags=["public"])
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {
+        candidate.strip().removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    }
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/schedule", response_model=PublicScheduleResponse)
 async def get_public_schedule(
+    request: Request,
+    response: Response,
     from_date: date = Query(..., alias="from"),
     to_date: date = Query(..., alias="to"),
     level: str | None = None,
@@ -23,7 +35,7 @@ async def get_public_schedule(
     session: AsyncSession = Depends(get_async_session),
 ):
     resolved_room_id = room_id if room_id is not None else location_id
-    return await schedule_service.list_public_schedule(
+    etag, payload = await schedule_service.get_public_schedule(
         session,
         from_date=from_date,
         to_date=to_date,
@@ -33,3 +45,10 @@ async def get_public_schedule(
         weekday=weekday,
         include_full=include_full,
     )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    response.headers.update(headers)
+    return payload
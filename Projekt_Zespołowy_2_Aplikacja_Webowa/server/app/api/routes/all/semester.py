@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_async_session
+from app.core.db import get_read_session
 from app.schemas.semester import SemesterMap
 from app.services.all import semesters as semester_service
 
@@ -10,6 +10,6 @@ router = APIRouter(prefix="/public", tags=["public"])
 
 @router.get("/semesters", response_model=list[SemesterMap])
 async def list_semesters(
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await semester_service.list_semesters(session)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_async_session
+from app.core.db import get_read_session
 from app.schemas.topic import TopicMap
 from app.services.all import topic as topic_service
 
@@ -10,6 +10,6 @@ router = APIRouter(prefix="/public", tags=["public"])
 
 @router.get("/topics", response_model=list[TopicMap])
 async def list_topics(
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await topic_service.list_topics(session)
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import current_student
-from app.core.db import get_async_session
+from app.core.db import get_read_session
 from app.models.attendance import AttendanceStatus
 from app.models.user import User
 from app.schemas.attendance import (
@@ -29,7 +29,7 @@ async def list_attendance(
     limit: int = Query(default=100, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await attendance_service.list_student_attendance(
         session,
@@ -56,7 +56,7 @@ async def attendance_summary(
     ),
     is_makeup: bool | None = None,
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await attendance_service.summarize_student_attendance(
         session,
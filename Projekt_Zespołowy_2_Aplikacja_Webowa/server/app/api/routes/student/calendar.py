@@ -1,15 +1,18 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import current_student
-from app.core.db import get_async_session
+from app.api.deps import calendar_feed_student, current_student
+from app.core.config import get_settings
+from app.core.db import get_read_session
 from app.models.user import User
 from app.schemas.calendar import CalendarEntryRead
 from app.services.student import calendar as calendar_service
+from app.utils.icalendar import ics_response
 
 router = APIRouter(prefix="/me", tags=["student"])
+settings = get_settings()
 
 
 @router.get("/calendar", response_model=list[CalendarEntryRead])
@@ -17,8 +20,10 @@ async def get_calendar(
     from_date: date | None = None,
     to_date: date | None = None,
     room_id: int | None = None,
+    topic_id: int | None = None,
+    level_id: int | None = None,
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await calendar_service.list_calendar_entries(
         session,
@@ -26,4 +31,20 @@ async def get_calendar(
         from_date=from_date,
         to_date=to_date,
         room_id=room_id,
+        topic_id=topic_id,
+        level_id=level_id,
+    )
+
+
+@router.get("/calendar.ics")
+async def get_calendar_feed(
+    sync_token: int | None = Query(default=None, ge=0),
+    user: User = Depends(calendar_feed_student),
+    session: AsyncSession = Depends(get_read_session),
+):
+    feed = await calendar_service.get_calendar_feed(
+        session, student_id=user.id, since=sync_token
+    )
+    return ics_response(
+        feed.events, settings.PROJECT_NAME, feed.sync_token, feed.full
     )
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import current_user
-from app.core.db import get_async_session
+from app.core.db import get_read_session
 from app.schemas.class_group import (
     ClassGroupAvailabilityRead,
     ClassGroupWithAvailability,
@@ -22,7 +22,7 @@ async def list_class_groups(
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     sort: str | None = None,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await class_group_service.list_class_groups(
         session,
@@ -43,7 +43,7 @@ async def list_class_groups(
 )
 async def get_class_group(
     class_group_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     class_group = await class_group_service.get_class_group_with_availability(
         session, class_group_id
@@ -62,7 +62,7 @@ async def get_class_group(
 )
 async def get_class_group_availability(
     class_group_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     availability = await class_group_service.get_class_group_availability(
         session, class_group_id
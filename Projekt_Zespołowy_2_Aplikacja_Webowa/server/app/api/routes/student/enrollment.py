@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import current_student
-from app.core.db import get_async_session
+from app.core.db import get_async_session, get_read_session
 from app.models.enrollment import EnrollmentStatus
 from app.models.user import User
 from app.schemas.enrollment import (
@@ -24,7 +24,7 @@ async def list_enrollments(
     ),
     active_only: bool = False,
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await enrollment_service.list_student_enrollments(
         session,
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import current_student
-from app.core.db import get_async_session
+from app.core.db import get_read_session
 from app.models.payment import ChargeStatus, ChargeType
 from app.models.user import User
 from app.schemas.payment import (
@@ -25,7 +25,7 @@ async def list_charges(
     due_to: date | None = None,
     overdue: bool | None = None,
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await payment_service.list_student_charges(
         session,
@@ -42,7 +42,7 @@ async def list_charges(
 async def get_charge(
     charge_id: int,
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     charge = await payment_service.get_student_charge(session, charge_id)
     if not charge or charge.student_id != user.id:
@@ -56,7 +56,7 @@ async def get_charge(
 @router.get("/payments", response_model=list[PaymentRead])
 async def list_payments(
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await payment_service.list_student_payments(
         session, student_id=user.id
@@ -67,7 +67,7 @@ async def list_payments(
 async def get_payment(
     payment_id: int,
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     payment = await payment_service.get_student_payment(session, payment_id)
     if not payment or payment.user_id != user.id:
@@ -81,7 +81,7 @@ async def get_payment(
 @router.get("/billing/summary", response_model=StudentBillingSummary)
 async def billing_summary(
     user: User = Depends(current_student),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     full_name = f"{user.first_name} {user.last_name}"
     return await payment_service.summarize_student_billing(
@@ -3,11 +3,14 @@ from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import BaseUserManager, exceptions
 from fastapi_users.router.common import ErrorCode
 from enum import Enum
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.users import get_user_manager, current_user, current_superuser
-
+from app.core.db import get_async_session
+from app.schemas.calendar import CalendarFeedTokenRead
 from app.schemas.user import UserRead, UserUpdate, UserUpdateSecure
 from app.models.user import User, UserRole
+from app.services.common import calendar_feed as calendar_feed_service
 
 router = APIRouter()
 
@@ -91,6 +94,26 @@ async def update_me_securely(
     return updated_user
 
 
+@router.post("/me/calendar-token", response_model=CalendarFeedTokenRead)
+async def rotate_calendar_token(
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    token = await calendar_feed_service.rotate_calendar_token(session, user)
+    return {
+        "token": token,
+        "feed_url": calendar_feed_service.calendar_feed_url(user),
+    }
+
+
+@router.delete("/me/calendar-token", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_calendar_token(
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    await calendar_feed_service.revoke_calendar_token(session, user)
+
+
 async def get_user_or_404(
     id: str,
     user_manager: BaseUserManager = Depends(get_user_manager),
@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.auth.users import current_superuser
+from app.core.instrumentation import request_metrics
 
 router = APIRouter(tags=["utils"], prefix="/utils")
 
@@ -6,3 +9,8 @@ router = APIRouter(tags=["utils"], prefix="/utils")
 @router.get("/health")
 async def health_check() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/metrics", dependencies=[Depends(current_superuser)])
+async def metrics() -> dict:
+    return request_metrics.snapshot()
@@ -1,13 +1,18 @@
 from typing import Any
 import uuid
 from fastapi import Request
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import (
     BaseUserManager,
     InvalidPasswordException,
     UUIDIDMixin,
+    exceptions,
     schemas,
 )
+from fastapi_users.db import BaseUserDatabase
 from fastapi_users.jwt import generate_jwt
+from app.auth.passwords import PooledPasswordHelper, pooled_password_helper
+from app.auth.tokens import invalidate_user_tokens
 from app.models.user import User, UserRole
 from app.core.config import get_settings
 from app.email.send_email import (
@@ -23,6 +28,16 @@ settings = get_settings()
 class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     reset_password_token_secret = settings.RESET_PASSWORD_SECRET
     verification_token_secret = settings.VERIFICATION_TOKEN_SECRET
+    password_helper: PooledPasswordHelper
+
+    # Hashing goes through the pooled helper's async methods, so the
+    # methods of the base manager that hash inline are overridden below.
+    def __init__(
+        self,
+        user_db: BaseUserDatabase[User, uuid.UUID],
+        password_helper: PooledPasswordHelper = pooled_password_helper,
+    ) -> None:
+        super().__init__(user_db, password_helper)
 
     async def create(
         self,
@@ -46,9 +61,56 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
                 if updates:
                     user_create = user_create.model_copy(update=updates)
 
-        return await super().create(
-            user_create=user_create, safe=safe, request=request
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        user_dict["hashed_password"] = await self.password_helper.hash_async(
+            user_dict.pop("password")
         )
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(
+        self, credentials: OAuth2PasswordRequestForm
+    ) -> User | None:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Hash anyway, so response times do not reveal unknown emails.
+            await self.password_helper.hash_async(credentials.password)
+            return None
+
+        verified, updated_hash = (
+            await self.password_helper.verify_and_update_async(
+                credentials.password, user.hashed_password
+            )
+        )
+        if not verified:
+            return None
+        if updated_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_hash})
+        return user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {
+                field: value
+                for field, value in update_dict.items()
+                if field != "password"
+            }
+            update_dict["hashed_password"] = (
+                await self.password_helper.hash_async(password)
+            )
+        return await super()._update(user, update_dict)
 
     async def validate_password(
         self, password: str, user: schemas.BaseUserCreate | User
@@ -93,6 +155,8 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
         update_dict: dict[str, Any],
         request: Request | None = None,
     ) -> None:
+        # Cached sessions hold a copy of the whole user.
+        invalidate_user_tokens(user.id)
         if "email" in update_dict:
             token_data = {
                 "sub": str(user.id),
@@ -127,3 +191,18 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
             f"Verification requested for user {user.id}. Verification token: {token}"
         )
         await send_verification_email(user, token)
+
+    async def on_after_verify(
+        self, user: User, request: Request | None = None
+    ) -> None:
+        invalidate_user_tokens(user.id)
+
+    async def on_after_reset_password(
+        self, user: User, request: Request | None = None
+    ) -> None:
+        invalidate_user_tokens(user.id)
+
+    async def on_after_delete(
+        self, user: User, request: Request | None = None
+    ) -> None:
+        invalidate_user_tokens(user.id)
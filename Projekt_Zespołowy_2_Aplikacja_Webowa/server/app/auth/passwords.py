@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from app.core.config import get_settings
+
+
+def build_password_hash() -> PasswordHash:
+    # Hashes made with other parameters still verify and are upgraded to
+    # the current ones on the next login.
+    settings = get_settings()
+    return PasswordHash(
+        (
+            Argon2Hasher(
+                time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+                memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+                parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+            ),
+            BcryptHasher(),
+        )
+    )
+
+
+class PooledPasswordHelper(PasswordHelper):
+    """Password helper that hashes on a bounded thread pool.
+
+    Argon2 and bcrypt release the GIL, so hashes run in parallel without
+    blocking the event loop. At most `PASSWORD_HASH_WORKERS` run at once,
+    the rest queue, which keeps a registration peak from starving the
+    threadpool shared by the rest of the app.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(build_password_hash())
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=get_settings().PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def hash_async(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), self.hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool(),
+            self.verify_and_update,
+            plain_password,
+            hashed_password,
+        )
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+pooled_password_helper = PooledPasswordHelper()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import logging
+import uuid
+
+from fastapi_users import BaseUserManager, exceptions
+from fastapi_users.authentication.strategy.db import (
+    AccessTokenDatabase,
+    DatabaseStrategy,
+)
+from sqlalchemy import delete, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.models.user import AccessToken, User
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Token to a detached copy of its user. Every worker process has its own
+# cache, so a logout elsewhere takes up to the TTL to be noticed here.
+access_token_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ACCESS_TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def _snapshot(user: User) -> User:
+    snapshot = User(
+        **{
+            attribute.key: getattr(user, attribute.key)
+            for attribute in inspect(User).column_attrs
+        }
+    )
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_user_tokens(user_id: uuid.UUID) -> None:
+    access_token_cache.evict_where(lambda _, user: user.id == user_id)
+
+
+class CachedDatabaseStrategy(DatabaseStrategy[User, uuid.UUID, AccessToken]):
+    """Database strategy that remembers recently read tokens.
+
+    A cache hit costs no query: the cached user is merged into the
+    request's session without loading it. Entries never outlive the
+    token they were read from.
+    """
+
+    def __init__(
+        self,
+        database: AccessTokenDatabase[AccessToken],
+        session: AsyncSession,
+        lifetime_seconds: int | None = None,
+    ) -> None:
+        super().__init__(database, lifetime_seconds)
+        self.session = session
+
+    async def read_token(
+        self,
+        token: str | None,
+        user_manager: BaseUserManager[User, uuid.UUID],
+    ) -> User | None:
+        if token is None:
+            return None
+        cached = access_token_cache.get(token)
+        if cached is not None:
+            return await self.session.merge(cached, load=False)
+
+        generation = access_token_cache.generation
+        now = datetime.now(timezone.utc)
+        max_age = None
+        if self.lifetime_seconds:
+            max_age = now - timedelta(seconds=self.lifetime_seconds)
+        access_token = await self.database.get_by_token(token, max_age)
+        if access_token is None:
+            return None
+        try:
+            user = await user_manager.get(
+                user_manager.parse_id(access_token.user_id)
+            )
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        ttl_seconds = access_token_cache.ttl_seconds
+        if max_age is not None:
+            ttl_seconds = min(
+                ttl_seconds,
+                (access_token.created_at - max_age).total_seconds(),
+            )
+        access_token_cache.set(
+            token,
+            _snapshot(user),
+            generation=generation,
+            ttl_seconds=ttl_seconds,
+        )
+        return user
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        await super().destroy_token(token, user)
+        access_token_cache.evict_where(lambda key, _: key == token)
+
+
+async def prune_expired_access_tokens(
+    session: AsyncSession, batch_size: int | None = None
+) -> int:
+    """Delete access tokens older than the session lifetime.
+
+    Tokens go in batches, each committed on its own, so the delete never
+    holds many row locks for long. Returns the number of tokens deleted.
+    """
+    batch_size = batch_size or settings.ACCESS_TOKEN_PRUNE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.COOKIE_MAX_AGE
+    )
+    pruned = 0
+    while True:
+        expired = (
+            select(AccessToken.token)
+            .where(AccessToken.created_at < cutoff)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            delete(AccessToken)
+            .where(AccessToken.token.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        pruned += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    if pruned:
+        logger.info("Pruned %d expired access tokens", pruned)
+    return pruned
@@ -7,11 +7,9 @@ from fastapi_users.authentication import CookieTransport, AuthenticationBackend
 from fastapi_users_db_sqlalchemy.access_token import (
     SQLAlchemyAccessTokenDatabase,
 )
-from fastapi_users.authentication.strategy.db import (
-    AccessTokenDatabase,
-    DatabaseStrategy,
-)
+from fastapi_users.authentication.strategy.db import AccessTokenDatabase
 from app.auth.manager import UserManager
+from app.auth.tokens import CachedDatabaseStrategy
 from app.core.db import get_async_session
 from app.models.user import User, AccessToken
 from app.core.config import get_settings
@@ -48,9 +46,11 @@ def get_database_strategy(
     access_token_db: AccessTokenDatabase[AccessToken] = Depends(
         get_access_token_db
     ),
-) -> DatabaseStrategy:
-    return DatabaseStrategy(
+    session: AsyncSession = Depends(get_async_session),
+) -> CachedDatabaseStrategy:
+    return CachedDatabaseStrategy(
         access_token_db,
+        session,
         lifetime_seconds=settings.COOKIE_MAX_AGE,
     )
 
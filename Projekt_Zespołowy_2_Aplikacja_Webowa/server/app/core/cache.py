@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from itertools import chain
+import time
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """In-process LRU cache with a per-entry time to live.
+
+    `clear()` bumps `generation`; passing the generation captured before a
+    database read to `set()` keeps results computed before an invalidation
+    from being stored after it.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        generation: int | None = None,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evict_where(self, predicate: Callable[[K, V], bool]) -> int:
+        """Drop the entries matching `predicate`, like a partial `clear()`.
+
+        The generation is bumped as well, so a read that started before
+        the eviction cannot store a stale value after it.
+        """
+        self.generation += 1
+        keys = [
+            key
+            for key, (_, value) in self._entries.items()
+            if predicate(key, value)
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def invalidate_on_commit(cache: TTLCache, *models: type) -> None:
+    """Clear `cache` once a transaction that wrote to `models` commits.
+
+    Covers both flushed ORM objects and `insert`/`update`/`delete`
+    statements executed through a session.
+    """
+    tables = {model.__table__ for model in models}
+    info_key = f"invalidate_cache_{id(cache)}"
+
+    @event.listens_for(Session, "after_flush")
+    def _after_flush(session: Session, flush_context: Any) -> None:
+        for instance in chain(session.new, session.dirty, session.deleted):
+            if isinstance(instance, models):
+                session.info[info_key] = True
+                return
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+        if orm_execute_state.is_select:
+            return
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table in tables:
+            orm_execute_state.session.info[info_key] = True
+
+    @event.listens_for(Session, "after_commit")
+    def _after_commit(session: Session) -> None:
+        if session.info.pop(info_key, False):
+            cache.clear()
+
+    @event.listens_for(Session, "after_soft_rollback")
+    def _after_rollback(session: Session, previous_transaction: Any) -> None:
+        session.info.pop(info_key, None)
@@ -1,18 +1,87 @@
 from collections.abc import AsyncGenerator
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import get_settings
 
+READ_PRIMARY_COOKIE = "read_primary"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
 settings = get_settings()
 engine = create_async_engine(str(settings.DATABASE_URI))
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+replica_engine = (
+    create_async_engine(settings.DB_REPLICA_DSN)
+    if settings.DB_REPLICA_DSN
+    else None
+)
+replica_session_maker = (
+    async_sessionmaker(replica_engine, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_session(
+    request: Request,
+    primary_session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints.
+
+    Uses the replica when one is configured, except right after the client
+    wrote something, so that it always reads its own writes.
+    """
+    if replica_session_maker is None or READ_PRIMARY_COOKIE in request.cookies:
+        yield primary_session
+        return
+    async with replica_session_maker() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client to the primary for a while after a successful write.
+
+    Sets a short-lived cookie on responses to non-safe requests, which
+    `get_read_session` honours for `DB_REPLICA_STICKY_SECONDS`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or replica_session_maker is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}=1; "
+                    f"Max-Age={settings.DB_REPLICA_STICKY_SECONDS}; "
+                    f"Path=/; HttpOnly; SameSite={settings.COOKIE_SAMESITE}"
+                    + ("; Secure" if settings.COOKIE_SECURE else ""),
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+DB_TIME_HEADER = "X-DB-Time"
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _route_name(scope: Scope) -> str:
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return f"{scope.get('method', '')} <unmatched>".strip()
+    # Routes of included routers may only know the path below their prefix,
+    # so the prefix is taken from the requested path.
+    depth = template.count("/")
+    prefix = scope.get("path", "").rsplit("/", depth)[0]
+    return f"{scope.get('method', '')} {prefix}{template}".strip()
+
+
+@dataclass
+class RequestStats:
+    scope: Scope
+    query_count: int = 0
+    db_time: float = 0.0
+
+    @property
+    def route(self) -> str:
+        return _route_name(self.scope)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = cumulative + self.counts[-1]
+        return {"sum": round(self.total, 3), "buckets": buckets}
+
+
+@dataclass
+class RouteMetrics:
+    count: int = 0
+    latency_ms: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS_MS)
+    )
+    query_count: Histogram = field(
+        default_factory=lambda: Histogram(QUERY_COUNT_BUCKETS)
+    )
+    db_time_ms: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS_MS)
+    )
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteMetrics] = {}
+
+    def observe(
+        self,
+        route: str,
+        latency_ms: float,
+        query_count: int,
+        db_time_ms: float,
+    ) -> None:
+        metrics = self.routes.setdefault(route, RouteMetrics())
+        metrics.count += 1
+        metrics.latency_ms.observe(latency_ms)
+        metrics.query_count.observe(query_count)
+        metrics.db_time_ms.observe(db_time_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "routes": [
+                {
+                    "route": route,
+                    "count": metrics.count,
+                    "latencyMs": metrics.latency_ms.snapshot(),
+                    "queryCount": metrics.query_count.snapshot(),
+                    "dbTimeMs": metrics.db_time_ms.snapshot(),
+                }
+                for route, metrics in sorted(self.routes.items())
+            ]
+        }
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+
+request_metrics = MetricsRegistry()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.db_time += elapsed
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000,
+            stats.route if stats is not None else "<no request>",
+            " ".join(statement.split()),
+        )
+
+
+def instrument_engines() -> None:
+    """Count and time every statement run by any SQLAlchemy engine.
+
+    Async engines execute through their sync `Engine`, so listening on the
+    class covers the primary engine as well as engines created in tests.
+    """
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryMetricsMiddleware:
+    """Expose per-request query count and database time.
+
+    Adds `X-Query-Count` and `X-DB-Time` (milliseconds) headers and records
+    per-route latency and query-count histograms.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.query_count)
+                headers[DB_TIME_HEADER] = f"{stats.db_time * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            request_metrics.observe(
+                stats.route,
+                (time.perf_counter() - started) * 1000,
+                stats.query_count,
+                stats.db_time * 1000,
+            )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Job:
+    """A maintenance task the API process runs every `interval_seconds`.
+
+    Each run gets a fresh session. Jobs must be safe to run from several
+    API processes at once.
+    """
+
+    name: str
+    interval_seconds: float
+    run: Callable[[AsyncSession], Awaitable[object]]
+
+
+async def run_job(job: Job) -> None:
+    async with db.async_session_maker() as session:
+        try:
+            await job.run(session)
+        except Exception:
+            logger.exception("Job %s failed", job.name)
+
+
+async def _run_periodically(job: Job) -> None:
+    while True:
+        await asyncio.sleep(job.interval_seconds)
+        await run_job(job)
+
+
+@asynccontextmanager
+async def run_jobs(jobs: Sequence[Job]) -> AsyncIterator[None]:
+    """Run the jobs in the background while the context is open.
+
+    Jobs with a non-positive interval are disabled.
+    """
+    tasks = [
+        asyncio.create_task(_run_periodically(job), name=job.name)
+        for job in jobs
+        if job.interval_seconds > 0
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+
+
+@lru_cache
+def template_environment() -> Environment:
+    # Templates ship with the code, so there is no need to stat them for
+    # changes on every render. A negative cache size never evicts.
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+def precompile_templates() -> int:
+    """Compile every email template into the shared environment.
+
+    Called once at startup, so no request pays for parsing a template.
+    Returns the number of templates compiled.
+    """
+    environment = template_environment()
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
+def get_template(template_name: str) -> Template:
+    return template_environment().get_template(template_name)
+
+
+def render_template(template_name: str, body: Mapping[str, Any]) -> str:
+    return get_template(template_name).render(body)
+
+
+def render_bodies(
+    template_name: str, bodies: Iterable[Mapping[str, Any]]
+) -> list[str]:
+    """Render one template for many recipients.
+
+    The template is looked up once and rendered with each body in turn,
+    which suits mass mailings such as billing runs. The work is CPU-bound,
+    so callers on the event loop should run it in a thread.
+    """
+    template = get_template(template_name)
+    return [template.render(body) for body in bodies]
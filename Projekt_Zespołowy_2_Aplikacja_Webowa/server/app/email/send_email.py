@@ -1,6 +1,6 @@
+from decimal import Decimal
 from pathlib import Path
-from typing import Any, cast
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from typing import Any
 from pydantic import BaseModel, NameEmail
 import logging
 
@@ -9,6 +9,8 @@ from app.models.payment import Charge
 from app.models.schedule import ClassGroup
 from app.models.user import User
 from app.core.config import get_settings
+from app.email.rendering import render_template
+from app.email.smtp import build_message, smtp_pool
 from app.utils.email_formatting import (
     _format_charge_type,
     _format_class_group_schedule,
@@ -24,8 +26,19 @@ class EmailSchema(BaseModel):
 async def send_with_template(
     email: EmailSchema,
     template_path: str,
-    attachments: list | None = None,
+    attachments: list[str | Path] | None = None,
 ) -> None:
+    await send_html(
+        email, render_template(template_path, email.body), attachments
+    )
+
+
+async def send_html(
+    email: EmailSchema,
+    html: str,
+    attachments: list[str | Path] | None = None,
+) -> None:
+    """Send an already rendered body, e.g. one from `render_bodies`."""
     settings = get_settings()
     if (
         not settings.SMTP_HOST
@@ -34,26 +47,11 @@ async def send_with_template(
         or not settings.EMAILS_FROM_EMAIL
     ):
         raise EnvironmentError("SMTP settings are not properly configured.")
-    if not attachments:
-        attachments = []
-
-    conf = ConnectionConfig(
-        MAIL_USERNAME=settings.SMTP_USER,
-        MAIL_PASSWORD=settings.SMTP_PASSWORD,
-        MAIL_PORT=settings.SMTP_PORT,
-        MAIL_FROM=settings.EMAILS_FROM_EMAIL,
-        MAIL_FROM_NAME=settings.EMAILS_FROM_NAME,
-        MAIL_SERVER=settings.SMTP_HOST,
-        MAIL_STARTTLS=settings.SMTP_TLS,
-        MAIL_SSL_TLS=settings.SMTP_SSL,
-        TEMPLATE_FOLDER=Path(__file__).parent / "templates",
-    )
 
-    recipients = [item.email for item in email.email]
     allowed_recipients = [
         recipient
-        for recipient in recipients
-        if not _is_blocked_domain(recipient)
+        for recipient in email.email
+        if not _is_blocked_domain(recipient.email)
     ]
     if not allowed_recipients:
         logging.info(
@@ -62,18 +60,12 @@ async def send_with_template(
         )
         return
 
-    message = MessageSchema(
-        subject=email.subject,
-        recipients=cast(list[NameEmail], allowed_recipients),
-        subtype=MessageType.html,
-        template_body=email.body,
-        attachments=attachments,
-    )
-    fm = FastMail(conf)
     if settings.APP_ENV == "production" or (
         settings.APP_ENV == "development" and settings.SEND_EMAILS
     ):
-        await fm.send_message(message, template_name=template_path)
+        await smtp_pool.send(
+            build_message(email.subject, allowed_recipients, html, attachments)
+        )
     else:
         logging.info(
             "Email sending is disabled in the current environment.",
@@ -153,9 +145,12 @@ async def send_reset_password_email(user: User, token: str) -> None:
     )
 
 
-async def send_enrollment_confirmation_email(
+ENROLLMENT_CONFIRMATION_TEMPLATE = "enrollment_confirmation_dark.html"
+
+
+def build_enrollment_confirmation_email(
     user: User, class_group: ClassGroup, status: EnrollmentStatus
-) -> None:
+) -> EmailSchema:
     settings = get_settings()
     user_full_name = f"{user.first_name} {user.last_name}".strip()
     schedule_link = f"{settings.FRONTEND_BASE_URL}/my-schedule"
@@ -171,43 +166,63 @@ async def send_enrollment_confirmation_email(
             "Jesteś na liście rezerwowej. Damy znać, gdy zwolni się miejsce."
         ),
     }
-    await send_with_template(
-        EmailSchema(
-            subject="TipTap - Potwierdzenie zapisu na zajęcia",
-            email=[NameEmail(email=user.email, name=user_full_name)],
-            body={
-                "first_name": user.first_name,
-                "class_group_name": class_group.name,
-                "class_group_schedule": _format_class_group_schedule(
-                    class_group
-                ),
-                "enrollment_status": status_labels.get(status, status.value),
-                "status_message": status_messages.get(status, ""),
-                "schedule_link": schedule_link,
-            },
-        ),
-        "enrollment_confirmation_dark.html",
+    return EmailSchema(
+        subject="TipTap - Potwierdzenie zapisu na zajęcia",
+        email=[NameEmail(email=user.email, name=user_full_name)],
+        body={
+            "first_name": user.first_name,
+            "class_group_name": class_group.name,
+            "class_group_schedule": _format_class_group_schedule(class_group),
+            "enrollment_status": status_labels.get(status, status.value),
+            "status_message": status_messages.get(status, ""),
+            "schedule_link": schedule_link,
+        },
     )
 
 
-async def send_new_charge_email(user: User, charge: Charge) -> None:
+NEW_CHARGE_TEMPLATE = "new_charge_dark.html"
+
+
+def build_new_charge_email(user: User, charge: Charge) -> EmailSchema:
     settings = get_settings()
     user_full_name = f"{user.first_name} {user.last_name}".strip()
     billing_link = f"{settings.FRONTEND_BASE_URL}/billing"
     amount_due = f"{charge.amount_due:.2f}".replace(".", ",")
     due_date = charge.due_date.strftime("%d.%m.%Y")
-    await send_with_template(
-        EmailSchema(
-            subject="TipTap - Nowa należność na Twoim koncie",
-            email=[NameEmail(email=user.email, name=user_full_name)],
-            body={
-                "first_name": user.first_name,
-                "amount_due": f"{amount_due} zł",
-                "due_date": due_date,
-                "charge_type": _format_charge_type(charge.type),
-                "charge_id": charge.id,
-                "billing_link": billing_link,
-            },
-        ),
-        "new_charge_dark.html",
+    return EmailSchema(
+        subject="TipTap - Nowa należność na Twoim koncie",
+        email=[NameEmail(email=user.email, name=user_full_name)],
+        body={
+            "first_name": user.first_name,
+            "amount_due": f"{amount_due} zł",
+            "due_date": due_date,
+            "charge_type": _format_charge_type(charge.type),
+            "charge_id": charge.id,
+            "billing_link": billing_link,
+        },
+    )
+
+
+PAYMENT_OVERDUE_TEMPLATE = "payment_overdue_dark.html"
+
+
+def build_payment_overdue_email(
+    user: User, charge: Charge, amount_remaining: Decimal
+) -> EmailSchema:
+    settings = get_settings()
+    user_full_name = f"{user.first_name} {user.last_name}".strip()
+    billing_link = f"{settings.FRONTEND_BASE_URL}/billing"
+    remaining = f"{amount_remaining:.2f}".replace(".", ",")
+    due_date = charge.due_date.strftime("%d.%m.%Y")
+    return EmailSchema(
+        subject="TipTap - Przypomnienie o zaległej płatności",
+        email=[NameEmail(email=user.email, name=user_full_name)],
+        body={
+            "first_name": user.first_name,
+            "amount_remaining": f"{remaining} zł",
+            "due_date": due_date,
+            "charge_type": _format_charge_type(charge.type),
+            "charge_id": charge.id,
+            "billing_link": billing_link,
+        },
     )
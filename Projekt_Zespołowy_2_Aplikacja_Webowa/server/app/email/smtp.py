@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+from email.headerregistry import Address
+from email.message import EmailMessage
+from email.utils import formataddr
+import mimetypes
+from pathlib import Path
+
+import aiosmtplib
+from pydantic import NameEmail
+
+from app.core.config import get_settings
+
+
+def build_message(
+    subject: str,
+    recipients: list[NameEmail],
+    html: str,
+    attachments: list[str | Path] | None = None,
+) -> EmailMessage:
+    settings = get_settings()
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = formataddr(
+        (settings.EMAILS_FROM_NAME or "", str(settings.EMAILS_FROM_EMAIL))
+    )
+    message["To"] = [
+        Address(display_name=recipient.name, addr_spec=recipient.email)
+        for recipient in recipients
+    ]
+    message.set_content(html, subtype="html")
+    for attachment in attachments or []:
+        path = Path(attachment)
+        content_type = mimetypes.guess_type(path.name)[0]
+        maintype, subtype = (content_type or "application/octet-stream").split(
+            "/", 1
+        )
+        message.add_attachment(
+            path.read_bytes(),
+            maintype=maintype,
+            subtype=subtype,
+            filename=path.name,
+        )
+    return message
+
+
+class SMTPPool:
+    """Reuses open SMTP connections across messages.
+
+    At most `SMTP_POOL_SIZE` messages are sent at once. A connection the
+    server closed while idle is replaced and the message sent again.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._idle: list[aiosmtplib.SMTP] = []
+        self._slots = asyncio.Semaphore(1)
+
+    def _bind_to_running_loop(self) -> None:
+        # Connections cannot outlive the event loop that opened them.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._idle = []
+            self._slots = asyncio.Semaphore(get_settings().SMTP_POOL_SIZE)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        settings = get_settings()
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            use_tls=settings.SMTP_SSL,
+            start_tls=settings.SMTP_TLS and not settings.SMTP_SSL,
+            username=settings.SMTP_USER,
+            password=(
+                settings.SMTP_PASSWORD.get_secret_value()
+                if settings.SMTP_PASSWORD
+                else None
+            ),
+        )
+        await client.connect()
+        return client
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client = self._idle.pop()
+            if client.is_connected:
+                return client
+        return await self._connect()
+
+    async def send(self, message: EmailMessage) -> None:
+        self._bind_to_running_loop()
+        async with self._slots:
+            client = await self._acquire()
+            try:
+                try:
+                    await client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    client = await self._connect()
+                    await client.send_message(message)
+            except BaseException:
+                client.close()
+                raise
+            self._idle.append(client)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+smtp_pool = SMTPPool()
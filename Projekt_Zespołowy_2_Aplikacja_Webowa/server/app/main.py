@@ -1,13 +1,92 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.main import api_router
+from app.auth.passwords import pooled_password_helper
+from app.auth.tokens import prune_expired_access_tokens
 from app.core.config import get_settings
+from app.core.db import ReadYourWritesMiddleware
+from app.core.instrumentation import (
+    DB_TIME_HEADER,
+    QUERY_COUNT_HEADER,
+    QueryMetricsMiddleware,
+    instrument_engines,
+)
+from app.core.jobs import Job, run_jobs
+from app.email.rendering import precompile_templates
+from app.email.smtp import smtp_pool
+from app.services.admin.charges import reconcile_charge_statuses
+from app.services.admin.payments import auto_allocate_payments
+from app.services.common.calendar_feed import prune_calendar_changes
+from app.services.common.enrollment_counters import (
+    reconcile_enrollment_counters,
+)
+from app.services.common.notifications import (
+    scan_overdue_charges,
+    send_pending_notifications,
+)
+from app.utils.icalendar import SYNC_FULL_HEADER, SYNC_TOKEN_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    precompile_templates()
+    jobs = [
+        Job(
+            "reconcile enrollment counters",
+            settings.ENROLLMENT_COUNTER_RECONCILE_INTERVAL_SECONDS,
+            reconcile_enrollment_counters,
+        ),
+        Job(
+            "send notifications",
+            settings.NOTIFICATION_SEND_INTERVAL_SECONDS,
+            send_pending_notifications,
+        ),
+        Job(
+            "auto-allocate payments",
+            settings.PAYMENT_AUTO_ALLOCATE_INTERVAL_SECONDS,
+            auto_allocate_payments,
+        ),
+        Job(
+            "reconcile charge statuses",
+            settings.CHARGE_STATUS_RECONCILE_INTERVAL_SECONDS,
+            reconcile_charge_statuses,
+        ),
+        Job(
+            "scan overdue charges",
+            settings.PAYMENT_OVERDUE_SCAN_INTERVAL_SECONDS,
+            scan_overdue_charges,
+        ),
+        Job(
+            "prune expired access tokens",
+            settings.ACCESS_TOKEN_PRUNE_INTERVAL_SECONDS,
+            prune_expired_access_tokens,
+        ),
+        Job(
+            "prune calendar changes",
+            settings.CALENDAR_CHANGE_PRUNE_INTERVAL_SECONDS,
+            prune_calendar_changes,
+        ),
+    ]
+    async with run_jobs(jobs):
+        yield
+    await smtp_pool.close()
+    pooled_password_helper.shutdown()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title=settings.PROJECT_NAME, debug=settings.DEBUG)
+    app = FastAPI(
+        title=settings.PROJECT_NAME, debug=settings.DEBUG, lifespan=lifespan
+    )
 
+    instrument_engines()
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(QueryMetricsMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ALLOWED_ORIGINS,
@@ -18,6 +97,14 @@ def create_app() -> FastAPI:
             "Content-Type",
             "X-Requested-With",
         ],
+        expose_headers=[
+            "ETag",
+            NEXT_CURSOR_HEADER,
+            SYNC_TOKEN_HEADER,
+            SYNC_FULL_HEADER,
+            QUERY_COUNT_HEADER,
+            DB_TIME_HEADER,
+        ],
     )
 
     app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,4 +1,5 @@
-from .attendance import Attendance
+from .attendance import Attendance, AttendanceRollup
+from .calendar_change import CalendarChange
 from .enrollment import Enrollment
 from .log import AuditLog
 from .notification import Notification
@@ -17,7 +18,9 @@ from .user import User
 
 __all__ = [
     "Attendance",
+    "AttendanceRollup",
     "AuditLog",
+    "CalendarChange",
     "ClassGroup",
     "ClassSession",
     "Charge",
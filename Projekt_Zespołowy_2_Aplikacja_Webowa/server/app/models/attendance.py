@@ -4,7 +4,15 @@ from datetime import datetime
 from enum import Enum
 import uuid
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Enum as SqlEnum
@@ -47,3 +55,130 @@ class Attendance(Base):
     is_makeup: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=False
     )
+
+
+class AttendanceRollup(Base):
+    """Attendance counts of one student in one class group.
+
+    Maintained by ATTENDANCE_ROLLUP_TRIGGERS on every attendance write and
+    whenever a session with attendance moves to another class group.
+    """
+
+    __tablename__ = "attendance_rollup"
+    __table_args__ = (
+        Index("ix_attendance_rollup_class_group_id", "class_group_id"),
+    )
+
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("user.id"), primary_key=True
+    )
+    class_group_id: Mapped[int] = mapped_column(
+        ForeignKey("class_group.id"), primary_key=True
+    )
+    present_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    absent_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    excused_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    makeup_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+
+
+ATTENDANCE_ROLLUP_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION apply_attendance_rollup(
+        mark attendance, delta integer
+    ) RETURNS void
+    LANGUAGE sql AS $$
+        INSERT INTO attendance_rollup AS rollup (
+            student_id, class_group_id,
+            present_count, absent_count, excused_count, makeup_count
+        )
+        SELECT mark.student_id, class_session.class_group_id,
+               delta * (mark.status = 'PRESENT')::int,
+               delta * (mark.status = 'ABSENT')::int,
+               delta * (mark.status = 'EXCUSED')::int,
+               delta * mark.is_makeup::int
+        FROM class_session
+        WHERE class_session.id = mark.class_session_id
+        ON CONFLICT (student_id, class_group_id) DO UPDATE
+        SET present_count = rollup.present_count + excluded.present_count,
+            absent_count = rollup.absent_count + excluded.absent_count,
+            excused_count = rollup.excused_count + excluded.excused_count,
+            makeup_count = rollup.makeup_count + excluded.makeup_count
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION roll_up_attendance_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM apply_attendance_rollup(OLD, -1);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM apply_attendance_rollup(NEW, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tr_attendance_rollup_insert_delete
+    AFTER INSERT OR DELETE ON attendance
+    FOR EACH ROW EXECUTE FUNCTION roll_up_attendance_change()
+    """,
+    """
+    CREATE TRIGGER tr_attendance_rollup_update
+    AFTER UPDATE OF status, is_makeup, class_session_id, student_id
+    ON attendance
+    FOR EACH ROW
+    WHEN (
+        (OLD.status, OLD.is_makeup, OLD.class_session_id, OLD.student_id)
+        IS DISTINCT FROM
+        (NEW.status, NEW.is_makeup, NEW.class_session_id, NEW.student_id)
+    )
+    EXECUTE FUNCTION roll_up_attendance_change()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION move_attendance_rollup() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO attendance_rollup AS rollup (
+            student_id, class_group_id,
+            present_count, absent_count, excused_count, makeup_count
+        )
+        SELECT mark.student_id, moved.class_group_id,
+               moved.delta * (mark.status = 'PRESENT')::int,
+               moved.delta * (mark.status = 'ABSENT')::int,
+               moved.delta * (mark.status = 'EXCUSED')::int,
+               moved.delta * mark.is_makeup::int
+        FROM attendance AS mark
+        CROSS JOIN (
+            VALUES (OLD.class_group_id, -1), (NEW.class_group_id, 1)
+        ) AS moved (class_group_id, delta)
+        WHERE mark.class_session_id = NEW.id
+        ON CONFLICT (student_id, class_group_id) DO UPDATE
+        SET present_count = rollup.present_count + excluded.present_count,
+            absent_count = rollup.absent_count + excluded.absent_count,
+            excused_count = rollup.excused_count + excluded.excused_count,
+            makeup_count = rollup.makeup_count + excluded.makeup_count;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tr_class_session_attendance_rollup
+    AFTER UPDATE OF class_group_id ON class_session
+    FOR EACH ROW
+    WHEN (OLD.class_group_id IS DISTINCT FROM NEW.class_group_id)
+    EXECUTE FUNCTION move_attendance_rollup()
+    """,
+)
+
+for statement in ATTENDANCE_ROLLUP_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement))
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+import uuid
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Date,
+    DateTime,
+    Index,
+    Time,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+CURRENT_TRANSACTION_ID = "(pg_current_xact_id()::text)::bigint"
+
+
+class CalendarChange(Base):
+    """Change log of everything that can alter a calendar feed.
+
+    Rows are written by triggers on `class_session`, `class_group` and
+    `enrollment`:
+
+    * session rows (`class_session_id` set) for an added, edited or deleted
+      session, once for the old and once for the new owner when it moves;
+    * group rows (`class_session_id` and `student_id` empty) when the
+      group's name, topic or level changes;
+    * enrollment rows (`student_id` set) when a student joins or leaves
+      a group.
+    """
+
+    __tablename__ = "calendar_change"
+    __table_args__ = (
+        Index("ix_calendar_change_transaction_id", "transaction_id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    transaction_id: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text(CURRENT_TRANSACTION_ID),
+        nullable=False,
+    )
+    class_group_id: Mapped[int] = mapped_column(nullable=False)
+    class_session_id: Mapped[int | None] = mapped_column()
+    instructor_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    student_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    date: Mapped[date | None] = mapped_column(Date)
+    start_time: Mapped[time | None] = mapped_column(Time)
+    end_time: Mapped[time | None] = mapped_column(Time)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+CALENDAR_CHANGE_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION log_class_session_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO calendar_change (
+                class_group_id, class_session_id, instructor_id,
+                date, start_time, end_time
+            )
+            VALUES (
+                OLD.class_group_id, OLD.id, OLD.instructor_id,
+                OLD.date, OLD.start_time, OLD.end_time
+            );
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO calendar_change (
+                class_group_id, class_session_id, instructor_id,
+                date, start_time, end_time
+            )
+            VALUES (
+                NEW.class_group_id, NEW.id, NEW.instructor_id,
+                NEW.date, NEW.start_time, NEW.end_time
+            );
+        ELSIF TG_OP = 'UPDATE' THEN
+            IF (NEW.class_group_id, NEW.instructor_id)
+                IS DISTINCT FROM (OLD.class_group_id, OLD.instructor_id)
+            THEN
+                INSERT INTO calendar_change (
+                    class_group_id, class_session_id, instructor_id,
+                    date, start_time, end_time
+                )
+                VALUES (
+                    NEW.class_group_id, NEW.id, NEW.instructor_id,
+                    NEW.date, NEW.start_time, NEW.end_time
+                );
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tr_class_session_calendar_change
+    AFTER INSERT OR DELETE ON class_session
+    FOR EACH ROW EXECUTE FUNCTION log_class_session_change()
+    """,
+    """
+    CREATE TRIGGER tr_class_session_calendar_update
+    AFTER UPDATE ON class_session
+    FOR EACH ROW
+    WHEN (
+        (
+            OLD.class_group_id, OLD.date, OLD.start_time, OLD.end_time,
+            OLD.status, OLD.room_id, OLD.instructor_id
+        ) IS DISTINCT FROM (
+            NEW.class_group_id, NEW.date, NEW.start_time, NEW.end_time,
+            NEW.status, NEW.room_id, NEW.instructor_id
+        )
+    )
+    EXECUTE FUNCTION log_class_session_change()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION log_class_group_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO calendar_change (class_group_id) VALUES (NEW.id);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tr_class_group_calendar_change
+    AFTER UPDATE OF name, topic_id, level_id ON class_group
+    FOR EACH ROW
+    WHEN (
+        (OLD.name, OLD.topic_id, OLD.level_id)
+        IS DISTINCT FROM (NEW.name, NEW.topic_id, NEW.level_id)
+    )
+    EXECUTE FUNCTION log_class_group_change()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION log_enrollment_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO calendar_change (class_group_id, student_id)
+            VALUES (OLD.class_group_id, OLD.student_id);
+        END IF;
+        IF TG_OP = 'INSERT' OR (
+            TG_OP = 'UPDATE'
+            AND (NEW.class_group_id, NEW.student_id)
+                IS DISTINCT FROM (OLD.class_group_id, OLD.student_id)
+        ) THEN
+            INSERT INTO calendar_change (class_group_id, student_id)
+            VALUES (NEW.class_group_id, NEW.student_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tr_enrollment_calendar_change
+    AFTER INSERT OR DELETE
+    OR UPDATE OF status, class_group_id, student_id ON enrollment
+    FOR EACH ROW EXECUTE FUNCTION log_enrollment_change()
+    """,
+)
+
+for statement in CALENDAR_CHANGE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement))
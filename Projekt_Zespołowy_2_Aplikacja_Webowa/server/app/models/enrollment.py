@@ -4,7 +4,15 @@ from datetime import datetime
 from enum import Enum
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    event,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Enum as SqlEnum
@@ -53,3 +61,55 @@ class Enrollment(Base):
     cancelled_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True)
     )
+
+
+# `class_group.enrolled_count` and `waitlist_count` follow every change of
+# an enrollment in the same transaction. The trigger's update locks the
+# group row until commit, so concurrent changes to one group never lose
+# an increment.
+ENROLLMENT_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION count_enrollment_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT'
+            AND OLD.status IN ('ACTIVE', 'WAITLISTED') THEN
+            UPDATE class_group
+            SET enrolled_count
+                    = enrolled_count - (OLD.status = 'ACTIVE')::int,
+                waitlist_count
+                    = waitlist_count - (OLD.status = 'WAITLISTED')::int
+            WHERE id = OLD.class_group_id;
+        END IF;
+        IF TG_OP <> 'DELETE'
+            AND NEW.status IN ('ACTIVE', 'WAITLISTED') THEN
+            UPDATE class_group
+            SET enrolled_count
+                    = enrolled_count + (NEW.status = 'ACTIVE')::int,
+                waitlist_count
+                    = waitlist_count + (NEW.status = 'WAITLISTED')::int
+            WHERE id = NEW.class_group_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tr_enrollment_counter_insert_delete
+    AFTER INSERT OR DELETE ON enrollment
+    FOR EACH ROW EXECUTE FUNCTION count_enrollment_change()
+    """,
+    """
+    CREATE TRIGGER tr_enrollment_counter_update
+    AFTER UPDATE OF status, class_group_id ON enrollment
+    FOR EACH ROW
+    WHEN (
+        (OLD.status, OLD.class_group_id)
+        IS DISTINCT FROM (NEW.status, NEW.class_group_id)
+    )
+    EXECUTE FUNCTION count_enrollment_change()
+    """,
+)
+
+for statement in ENROLLMENT_COUNTER_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement))
@@ -5,7 +5,7 @@ from enum import Enum
 import uuid
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Enum as SqlEnum
@@ -16,6 +16,7 @@ from .base import Base
 class NotificationType(str, Enum):
     PAYMENT_OVERDUE = "PAYMENT_OVERDUE"
     ENROLL_CONFIRM = "ENROLL_CONFIRM"
+    NEW_CHARGE = "NEW_CHARGE"
 
 
 class NotificationStatus(str, Enum):
@@ -26,6 +27,20 @@ class NotificationStatus(str, Enum):
 
 class Notification(Base):
     __tablename__ = "notification"
+    __table_args__ = (
+        Index(
+            "ix_notification_pending_id",
+            "id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # A charge gets at most one overdue reminder.
+        Index(
+            "uq_notification_overdue_charge",
+            "charge_id",
+            unique=True,
+            postgresql_where=text("type = 'PAYMENT_OVERDUE'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     type: Mapped[NotificationType] = mapped_column(
@@ -34,6 +49,7 @@ class Notification(Base):
     recipient_user_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id")
     )
+    charge_id: Mapped[int | None] = mapped_column(ForeignKey("charge.id"))
     email_to: Mapped[str | None] = mapped_column(String(255))
     subject: Mapped[str | None] = mapped_column(String(255))
     body: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
@@ -46,6 +62,9 @@ class Notification(Base):
         DateTime(timezone=True)
     )
     sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    attempts: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
     error: Mapped[str | None] = mapped_column(Text)
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id")
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     Text,
     UniqueConstraint,
@@ -42,6 +43,16 @@ class PaymentMethod(str, Enum):
 
 class Charge(Base):
     __tablename__ = "charge"
+    __table_args__ = (
+        Index("ix_charge_due_date_id", "due_date", "id"),
+        Index("ix_charge_status_due_date", "status", "due_date"),
+        UniqueConstraint(
+            "student_id",
+            "semester_id",
+            "billing_period",
+            name="uq_charge_student_semester_billing_period",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     student_id: Mapped[uuid.UUID] = mapped_column(
@@ -57,6 +68,10 @@ class Charge(Base):
         nullable=False,
         default=ChargeStatus.OPEN,
     )
+    # First day of the month a billing run charged and the semester it
+    # charged for, NULL for manual charges.
+    billing_period: Mapped[date | None] = mapped_column(Date)
+    semester_id: Mapped[int | None] = mapped_column(ForeignKey("semester.id"))
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id")
     )
@@ -67,6 +82,7 @@ class Charge(Base):
 
 class Payment(Base):
     __tablename__ = "payment"
+    __table_args__ = (Index("ix_payment_paid_at_id", "paid_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -90,6 +106,7 @@ class PaymentAllocation(Base):
             "charge_id",
             name="uq_payment_allocation_payment_charge",
         ),
+        Index("ix_payment_allocation_charge_id", "charge_id"),
     )
 
     payment_id: Mapped[int] = mapped_column(
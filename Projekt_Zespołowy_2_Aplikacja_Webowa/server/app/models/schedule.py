@@ -6,16 +6,20 @@ import uuid
 
 from sqlalchemy import (
     Boolean,
+    DDL,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     SmallInteger,
     String,
     Text,
     Time,
+    event,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -51,6 +55,13 @@ class ClassGroup(Base):
     )
     room_id: Mapped[int | None] = mapped_column(ForeignKey("room.id"))
     capacity: Mapped[int] = mapped_column(nullable=False)
+    # Kept in step with `enrollment` by ENROLLMENT_COUNTER_TRIGGERS.
+    enrolled_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    waitlist_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
     day_of_week: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     start_time: Mapped[time] = mapped_column(Time, nullable=False)
     end_time: Mapped[time] = mapped_column(Time, nullable=False)
@@ -73,6 +84,32 @@ class ClassGroup(Base):
 
 class ClassSession(Base):
     __tablename__ = "class_session"
+    __table_args__ = (
+        Index(
+            "ix_class_session_date_start_time_id",
+            "date",
+            "start_time",
+            "id",
+        ),
+        ExcludeConstraint(
+            ("room_id", "="),
+            (text("tsrange(date + start_time, date + end_time)"), "&&"),
+            name="ex_class_session_room_overlap",
+            using="gist",
+            where=text("status = 'scheduled' AND room_id IS NOT NULL"),
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+        ExcludeConstraint(
+            ("instructor_id", "="),
+            (text("tsrange(date + start_time, date + end_time)"), "&&"),
+            name="ex_class_session_instructor_overlap",
+            using="gist",
+            where=text("status = 'scheduled' AND instructor_id IS NOT NULL"),
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     class_group_id: Mapped[int] = mapped_column(
@@ -118,3 +155,10 @@ class InstructorSubstitution(Base):
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id")
     )
+
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
@@ -21,6 +21,11 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
     role: Mapped[UserRole] = mapped_column(
         String(32), nullable=False, default=UserRole.STUDENT
     )
+    # Secret of the user's calendar feed URL, which calendar apps poll
+    # without a session cookie.
+    calendar_token: Mapped[str | None] = mapped_column(
+        String(64), unique=True, index=True
+    )
 
 
 class AccessToken(SQLAlchemyBaseAccessTokenTableUUID, Base):
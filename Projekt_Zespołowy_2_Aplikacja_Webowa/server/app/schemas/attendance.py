@@ -71,6 +71,17 @@ class StudentAttendanceSummary(CamelCaseSchema, BaseModel):
     attendance_rate: float | None = None
 
 
+class StudentAttendanceReportRow(StudentAttendanceSummary):
+    student_id: uuid.UUID
+    first_name: str
+    last_name: str
+
+
+class ClassGroupAttendanceReportRow(StudentAttendanceSummary):
+    class_group_id: int
+    class_group_name: str
+
+
 class SessionAttendanceStudent(CamelCaseSchema, BaseModel):
     student_id: uuid.UUID
     first_name: str
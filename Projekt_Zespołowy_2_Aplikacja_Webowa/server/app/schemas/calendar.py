@@ -9,6 +9,11 @@ from app.models.schedule import ClassSessionStatus
 from app.schemas.base import CamelCaseSchema
 
 
+class CalendarFeedTokenRead(CamelCaseSchema, BaseModel):
+    token: str
+    feed_url: str
+
+
 class CalendarEntryRead(CamelCaseSchema, BaseModel):
     class_session_id: int
     class_group_id: int
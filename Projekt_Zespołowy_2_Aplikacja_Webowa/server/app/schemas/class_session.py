@@ -50,6 +50,10 @@ class ClassGroupGenerateSessions(CamelCaseSchema, BaseModel):
     skip_dates: list[dt.date] = Field(default_factory=list)
 
 
+class ClassGroupBulkGenerateSessions(ClassGroupGenerateSessions):
+    class_group_ids: list[int] = Field(min_length=1)
+
+
 class ClassSessionCancel(CamelCaseSchema, BaseModel):
     reason: str | None = None
 
@@ -17,6 +17,8 @@ class ChargeRead(CamelCaseSchema, BaseModel):
     amount_due: Decimal
     type: ChargeType
     status: ChargeStatus
+    billing_period: date | None = None
+    semester_id: int | None = None
     created_by: uuid.UUID | None = None
     created_at: datetime
 
@@ -34,6 +36,18 @@ class ChargeUpdate(CamelCaseSchema, BaseModel):
     status: ChargeStatus | None = None
 
 
+class BillingRunCreate(CamelCaseSchema, BaseModel):
+    semester_id: int
+    period: date
+    due_date: date
+    amount_per_class_group: Decimal = Field(..., gt=0)
+
+
+class BillingRunResult(CamelCaseSchema, BaseModel):
+    billing_period: date
+    charges_created: int
+
+
 class PaymentRead(CamelCaseSchema, BaseModel):
     id: int
     user_id: uuid.UUID
@@ -72,6 +86,10 @@ class PaymentAllocationUpdate(CamelCaseSchema, BaseModel):
     amount_allocated: Decimal = Field(..., gt=0)
 
 
+class AutoAllocationResult(CamelCaseSchema, BaseModel):
+    allocations_written: int
+
+
 class BillingSummary(CamelCaseSchema, BaseModel):
     total_open: Decimal
     total_overdue: Decimal
@@ -79,6 +97,18 @@ class BillingSummary(CamelCaseSchema, BaseModel):
     open_charges: list[ChargeRead] = Field(default_factory=list)
 
 
+class ReceivablesAgingRow(CamelCaseSchema, BaseModel):
+    student_id: uuid.UUID
+    first_name: str
+    last_name: str
+    email: str
+    overdue_up_to_30: Decimal
+    overdue_31_to_60: Decimal
+    overdue_61_to_90: Decimal
+    overdue_over_90: Decimal
+    total_overdue: Decimal
+
+
 class StudentBillingSummary(CamelCaseSchema, BaseModel):
     current_month_due: Decimal
     total_overdue: Decimal
@@ -3,16 +3,27 @@ from __future__ import annotations
 from datetime import date
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance import (
+    Attendance,
+    AttendanceRollup,
+    AttendanceStatus,
+)
 from app.models.schedule import ClassGroup, ClassSession
+from app.models.user import User
 from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
+from app.services.student.attendance import summary_payload
+from app.utils.pagination import Keyset
 
+# The key spans two tables, so no index serves it: every page joins the
+# matching marks to their sessions and sorts them. The session date order
+# is kept because it is the order the list has always had.
+ATTENDANCE_KEYSET = Keyset((ClassSession.date, Attendance.id), descending=True)
 
-async def list_attendance(
-    session: AsyncSession,
+
+def attendance_query(
     student_id: uuid.UUID | None = None,
     class_group_id: int | None = None,
     session_id: int | None = None,
@@ -22,9 +33,7 @@ async def list_attendance(
     to_date: date | None = None,
     status: AttendanceStatus | None = None,
     is_makeup: bool | None = None,
-    limit: int = 100,
-    offset: int = 0,
-) -> list[Attendance]:
+) -> Select:
     query = select(Attendance).join(
         ClassSession, Attendance.class_session_id == ClassSession.id
     )
@@ -48,10 +57,38 @@ async def list_attendance(
         query = query.where(Attendance.status == status)
     if is_makeup is not None:
         query = query.where(Attendance.is_makeup.is_(is_makeup))
-    query = query.order_by(ClassSession.date.desc(), Attendance.id.desc())
-    query = query.offset(offset).limit(limit)
-    result = await session.execute(query)
-    return list(result.scalars().all())
+    return query
+
+
+async def list_attendance(
+    session: AsyncSession,
+    student_id: uuid.UUID | None = None,
+    class_group_id: int | None = None,
+    session_id: int | None = None,
+    instructor_id: uuid.UUID | None = None,
+    semester_id: int | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    status: AttendanceStatus | None = None,
+    is_makeup: bool | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> tuple[list[Attendance], str | None]:
+    query = attendance_query(
+        student_id=student_id,
+        class_group_id=class_group_id,
+        session_id=session_id,
+        instructor_id=instructor_id,
+        semester_id=semester_id,
+        from_date=from_date,
+        to_date=to_date,
+        status=status,
+        is_makeup=is_makeup,
+    )
+    if cursor is None and offset:
+        query = query.offset(offset)
+    return await ATTENDANCE_KEYSET.fetch_page(session, query, cursor, limit)
 
 
 async def get_attendance(
@@ -86,3 +123,57 @@ async def delete_attendance(
 ) -> None:
     await session.delete(attendance)
     await session.commit()
+
+
+async def report_class_group_attendance(
+    session: AsyncSession, class_group_id: int
+) -> list[dict]:
+    result = await session.execute(
+        select(AttendanceRollup, User.first_name, User.last_name)
+        .join(User, AttendanceRollup.student_id == User.id)
+        .where(AttendanceRollup.class_group_id == class_group_id)
+        .order_by(User.last_name, User.first_name, User.id)
+    )
+    return [
+        {
+            "student_id": rollup.student_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            **summary_payload(
+                rollup.present_count,
+                rollup.absent_count,
+                rollup.excused_count,
+                rollup.makeup_count,
+            ),
+        }
+        for rollup, first_name, last_name in result.all()
+    ]
+
+
+async def report_semester_attendance(
+    session: AsyncSession, semester_id: int
+) -> list[dict]:
+    result = await session.execute(
+        select(
+            ClassGroup.id,
+            ClassGroup.name,
+            func.sum(AttendanceRollup.present_count),
+            func.sum(AttendanceRollup.absent_count),
+            func.sum(AttendanceRollup.excused_count),
+            func.sum(AttendanceRollup.makeup_count),
+        )
+        .outerjoin(
+            AttendanceRollup, AttendanceRollup.class_group_id == ClassGroup.id
+        )
+        .where(ClassGroup.semester_id == semester_id)
+        .group_by(ClassGroup.id)
+        .order_by(ClassGroup.name, ClassGroup.id)
+    )
+    return [
+        {
+            "class_group_id": class_group_id,
+            "class_group_name": name,
+            **summary_payload(*counts),
+        }
+        for class_group_id, name, *counts in result.all()
+    ]
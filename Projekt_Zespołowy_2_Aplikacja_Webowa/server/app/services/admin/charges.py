@@ -1,32 +1,43 @@
 from __future__ import annotations
 
+from collections.abc import Collection
 from datetime import date
 from decimal import Decimal
+import logging
 import uuid
 
-from sqlalchemy import func, select
+from sqlalchemy import Date, Select, case, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.email.send_email import send_new_charge_email
+from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.payment import (
     Charge,
     ChargeStatus,
     ChargeType,
     PaymentAllocation,
 )
+from app.models.schedule import ClassGroup
+from app.models.semester import Semester
 from app.models.user import User
-from app.schemas.payment import ChargeCreate, ChargeUpdate
+from app.schemas.payment import BillingRunCreate, ChargeCreate, ChargeUpdate
+from app.services.common.notifications import enqueue_new_charge_emails
+from app.utils.pagination import Keyset
 
+logger = logging.getLogger(__name__)
 
-async def list_charges(
-    session: AsyncSession,
+CHARGE_KEYSET = Keyset((Charge.due_date, Charge.id), descending=True)
+
+
+def charges_query(
     student_id: uuid.UUID | None = None,
     status: ChargeStatus | None = None,
     charge_type: ChargeType | None = None,
     due_from: date | None = None,
     due_to: date | None = None,
     overdue: bool | None = None,
-) -> list[Charge]:
+) -> Select:
     query = select(Charge)
     if student_id is not None:
         query = query.where(Charge.student_id == student_id)
@@ -44,9 +55,29 @@ async def list_charges(
             [ChargeStatus.OPEN, ChargeStatus.PARTIAL]
         )
         query = query.where(overdue_clause if overdue else ~overdue_clause)
-    query = query.order_by(Charge.due_date.desc(), Charge.id.desc())
-    result = await session.execute(query)
-    return list(result.scalars().all())
+    return query
+
+
+async def list_charges(
+    session: AsyncSession,
+    student_id: uuid.UUID | None = None,
+    status: ChargeStatus | None = None,
+    charge_type: ChargeType | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    overdue: bool | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> tuple[list[Charge], str | None]:
+    query = charges_query(
+        student_id=student_id,
+        status=status,
+        charge_type=charge_type,
+        due_from=due_from,
+        due_to=due_to,
+        overdue=overdue,
+    )
+    return await CHARGE_KEYSET.fetch_page(session, query, cursor, limit)
 
 
 async def get_charge(session: AsyncSession, charge_id: int) -> Charge | None:
@@ -70,12 +101,77 @@ async def create_charge(
         created_by=created_by,
     )
     session.add(charge)
+    await session.flush()
+    await enqueue_new_charge_emails(session, [charge])
     await session.commit()
     await session.refresh(charge)
-    await send_new_charge_email(student, charge)
     return charge
 
 
+async def create_billing_run(
+    session: AsyncSession,
+    data: BillingRunCreate,
+    created_by: uuid.UUID | None,
+) -> tuple[date, int]:
+    """Charge the monthly fee of every student enrolled in a semester.
+
+    Each student gets one charge per month and semester, priced per active
+    enrollment in the semester. Students already charged for the month by
+    a run of the same semester are skipped, so a run can be repeated
+    safely, while a run of an overlapping semester still charges them.
+    The emails are queued for the notification job.
+    Returns the billing period and the number of created charges.
+    """
+    semester = await session.get(Semester, data.semester_id)
+    if not semester:
+        raise LookupError("Semester not found.")
+    billing_period = data.period.replace(day=1)
+    charged = (
+        select(
+            Enrollment.student_id,
+            literal(data.due_date, Date),
+            data.amount_per_class_group * func.count(Enrollment.id),
+            literal(ChargeType.MONTHLY_FEE, Charge.type.type),
+            literal(ChargeStatus.OPEN, Charge.status.type),
+            literal(billing_period, Date),
+            literal(semester.id, Charge.semester_id.type),
+            literal(created_by, Charge.created_by.type),
+        )
+        .join(ClassGroup, ClassGroup.id == Enrollment.class_group_id)
+        .join(User, User.id == Enrollment.student_id)
+        .where(
+            ClassGroup.semester_id == semester.id,
+            Enrollment.status == EnrollmentStatus.ACTIVE,
+            User.is_active.is_(True),
+        )
+        .group_by(Enrollment.student_id)
+    )
+    statement = (
+        insert(Charge)
+        .from_select(
+            [
+                Charge.student_id,
+                Charge.due_date,
+                Charge.amount_due,
+                Charge.type,
+                Charge.status,
+                Charge.billing_period,
+                Charge.semester_id,
+                Charge.created_by,
+            ],
+            charged,
+        )
+        .on_conflict_do_nothing(
+            constraint="uq_charge_student_semester_billing_period"
+        )
+        .returning(Charge)
+    )
+    charges = list(await session.scalars(statement))
+    await enqueue_new_charge_emails(session, charges)
+    await session.commit()
+    return billing_period, len(charges)
+
+
 async def update_charge(
     session: AsyncSession, charge: Charge, data: ChargeUpdate
 ) -> Charge:
@@ -85,10 +181,11 @@ async def update_charge(
         raise ValueError("Only cancellation is allowed.")
     for key, value in updates.items():
         setattr(charge, key, value)
+    if "amount_due" in updates:
+        await session.flush()
+        await recalculate_charge_statuses(session, charge_ids=[charge.id])
     await session.commit()
     await session.refresh(charge)
-    if "amount_due" in updates and charge.status != ChargeStatus.CANCELLED:
-        await recalculate_charge_status(session, charge)
     return charge
 
 
@@ -99,28 +196,62 @@ async def cancel_charge(session: AsyncSession, charge: Charge) -> Charge:
     return charge
 
 
-async def recalculate_charge_status(
-    session: AsyncSession, charge: Charge
-) -> Charge:
-    if charge.status == ChargeStatus.CANCELLED:
-        return charge
-    result = await session.execute(
+async def recalculate_charge_statuses(
+    session: AsyncSession,
+    charge_ids: Collection[int] | None = None,
+    student_id: uuid.UUID | None = None,
+) -> int:
+    """Derive charge statuses from their allocations in one statement.
+
+    Covers the given charges, the charges of a student, or the whole ledger
+    when neither is given. Cancelled charges are left alone. Does not
+    commit. Returns the number of charges whose status changed.
+    """
+    charge = aliased(Charge)
+    totals = (
         select(
+            charge.id.label("charge_id"),
             func.coalesce(
-                func.sum(PaymentAllocation.amount_allocated),
-                Decimal("0"),
-            )
-        ).where(PaymentAllocation.charge_id == charge.id)
+                func.sum(PaymentAllocation.amount_allocated), Decimal("0")
+            ).label("total_allocated"),
+        )
+        .outerjoin(PaymentAllocation, PaymentAllocation.charge_id == charge.id)
+        .where(charge.status != ChargeStatus.CANCELLED)
+        .group_by(charge.id)
     )
-    total_allocated = result.scalar_one()
-    if total_allocated <= Decimal("0"):
-        new_status = ChargeStatus.OPEN
-    elif total_allocated >= charge.amount_due:
-        new_status = ChargeStatus.PAID
-    else:
-        new_status = ChargeStatus.PARTIAL
-    if charge.status != new_status:
-        charge.status = new_status
-        await session.commit()
-        await session.refresh(charge)
-    return charge
+    if charge_ids is not None:
+        totals = totals.where(charge.id.in_(charge_ids))
+    if student_id is not None:
+        totals = totals.where(charge.student_id == student_id)
+    totals = totals.subquery("totals")
+    new_status = case(
+        (
+            totals.c.total_allocated <= Decimal("0"),
+            literal(ChargeStatus.OPEN, Charge.status.type),
+        ),
+        (
+            totals.c.total_allocated >= Charge.amount_due,
+            literal(ChargeStatus.PAID, Charge.status.type),
+        ),
+        else_=literal(ChargeStatus.PARTIAL, Charge.status.type),
+    )
+    result = await session.execute(
+        update(Charge)
+        .where(Charge.id == totals.c.charge_id, Charge.status != new_status)
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def reconcile_charge_statuses(session: AsyncSession) -> int:
+    """Repair charge statuses that drifted from the allocations.
+
+    The write paths keep statuses current, so drift only comes from
+    changes made outside the API. Returns the number of repaired charges.
+    """
+    repaired = await recalculate_charge_statuses(session)
+    await session.commit()
+    if repaired:
+        logger.warning("Repaired the status of %d charges", repaired)
+    return repaired
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
-from sqlalchemy import or_, select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.schedule import (
@@ -11,7 +11,12 @@ from app.models.schedule import (
     ClassSessionStatus,
 )
 from app.schemas.class_group import ClassGroupCreate, ClassGroupUpdate
-from app.schemas.class_session import ClassGroupGenerateSessions
+from app.schemas.class_session import (
+    ClassGroupBulkGenerateSessions,
+    ClassGroupGenerateSessions,
+)
+from app.services.admin import conflicts
+from app.services.common.waitlist import fill_free_seats
 
 
 def _matches_day_of_week(day_of_week: int, target_date: date) -> bool:
@@ -45,8 +50,11 @@ async def update_class_group(
     session: AsyncSession, class_group: ClassGroup, data: ClassGroupUpdate
 ) -> ClassGroup:
     updates = data.model_dump(exclude_unset=True)
+    previous_capacity = class_group.capacity
     for key, value in updates.items():
         setattr(class_group, key, value)
+    if class_group.capacity > previous_capacity:
+        await fill_free_seats(session, class_group.id)
     await session.commit()
     await session.refresh(class_group)
     return class_group
@@ -59,40 +67,81 @@ async def delete_class_group(
     await session.commit()
 
 
-async def _find_conflicting_dates(
-    session: AsyncSession,
-    class_group: ClassGroup,
-    candidate_dates: list[date],
+def _candidate_dates(
+    class_group: ClassGroup, data: ClassGroupGenerateSessions
 ) -> list[date]:
-    if not candidate_dates:
+    first_date = next(
+        (
+            data.start_date + timedelta(days=offset)
+            for offset in range(7)
+            if _matches_day_of_week(
+                class_group.day_of_week,
+                data.start_date + timedelta(days=offset),
+            )
+        ),
+        None,
+    )
+    if first_date is None:
         return []
+    skip_dates = set(data.skip_dates)
+    candidate_dates: list[date] = []
+    current_date = first_date
+    while current_date <= data.end_date:
+        if current_date not in skip_dates:
+            candidate_dates.append(current_date)
+        current_date += timedelta(days=7)
+    return candidate_dates
+
+
+def _session_rows(
+    class_groups: list[ClassGroup], data: ClassGroupGenerateSessions
+) -> list[dict]:
+    return [
+        {
+            "class_group_id": class_group.id,
+            "date": target_date,
+            "start_time": class_group.start_time,
+            "end_time": class_group.end_time,
+            "instructor_id": class_group.instructor_id,
+            "room_id": class_group.room_id,
+            "status": ClassSessionStatus.SCHEDULED,
+        }
+        for class_group in class_groups
+        for target_date in _candidate_dates(class_group, data)
+    ]
+
 
-    filters = []
-    if class_group.room_id is not None:
-        filters.append(ClassSession.room_id == class_group.room_id)
-    if class_group.instructor_id is not None:
-        filters.append(ClassSession.instructor_id == class_group.instructor_id)
-    if not filters:
+async def generate_sessions_bulk(
+    session: AsyncSession,
+    class_groups: list[ClassGroup],
+    data: ClassGroupGenerateSessions,
+) -> list[ClassSession]:
+    rows = _session_rows(class_groups, data)
+    if not rows:
         return []
 
-    result = await session.execute(
-        select(ClassSession).where(
-            ClassSession.date.in_(candidate_dates),
-            ClassSession.status == ClassSessionStatus.SCHEDULED,
-            or_(*filters),
-        )
+    names = {class_group.id: class_group.name for class_group in class_groups}
+    await conflicts.ensure_no_conflicts(
+        session,
+        [
+            conflicts.SessionSlot(
+                date=row["date"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                room_id=row["room_id"],
+                instructor_id=row["instructor_id"],
+                label=names[row["class_group_id"]],
+            )
+            for row in rows
+        ],
     )
-    existing_sessions = list(result.scalars().all())
-
-    conflicts: set[date] = set()
-    for existing in existing_sessions:
-        if (
-            class_group.start_time < existing.end_time
-            and class_group.end_time > existing.start_time
-        ):
-            conflicts.add(existing.date)
-
-    return sorted(conflicts)
+    async with conflicts.conflict_guard(session):
+        result = await session.scalars(
+            insert(ClassSession).returning(ClassSession), rows
+        )
+        sessions = list(result.all())
+        await session.commit()
+    return sessions
 
 
 async def generate_sessions(
@@ -100,40 +149,31 @@ async def generate_sessions(
     class_group: ClassGroup,
     data: ClassGroupGenerateSessions,
 ) -> list[ClassSession]:
-    skip_dates = set(data.skip_dates)
-    candidate_dates: list[date] = []
-    current_date = data.start_date
-    while current_date <= data.end_date:
-        if current_date not in skip_dates and _matches_day_of_week(
-            class_group.day_of_week, current_date
-        ):
-            candidate_dates.append(current_date)
-        current_date += timedelta(days=1)
+    return await generate_sessions_bulk(session, [class_group], data)
 
-    conflicts = await _find_conflicting_dates(
-        session, class_group, candidate_dates
+
+async def generate_sessions_for_class_groups(
+    session: AsyncSession, data: ClassGroupBulkGenerateSessions
+) -> list[ClassSession]:
+    class_group_ids = sorted(set(data.class_group_ids))
+    result = await session.execute(
+        select(ClassGroup)
+        .where(ClassGroup.id.in_(class_group_ids))
+        .order_by(ClassGroup.id)
     )
-    if conflicts:
-        conflict_list = ", ".join(item.isoformat() for item in conflicts)
-        raise ValueError(f"Conflicting sessions found on: {conflict_list}.")
-
-    sessions = [
-        ClassSession(
-            class_group_id=class_group.id,
-            date=target_date,
-            start_time=class_group.start_time,
-            end_time=class_group.end_time,
-            instructor_id=class_group.instructor_id,
-            room_id=class_group.room_id,
-            status=ClassSessionStatus.SCHEDULED,
-        )
-        for target_date in candidate_dates
+    class_groups = list(result.scalars().all())
+    found_ids = {class_group.id for class_group in class_groups}
+    missing_ids = [
+        class_group_id
+        for class_group_id in class_group_ids
+        if class_group_id not in found_ids
     ]
-    session.add_all(sessions)
-    await session.commit()
-    for class_session in sessions:
-        await session.refresh(class_session)
-    return sessions
+    if missing_ids:
+        missing = ", ".join(
+            str(class_group_id) for class_group_id in missing_ids
+        )
+        raise LookupError(f"Class groups not found: {missing}.")
+    return await generate_sessions_bulk(session, class_groups, data)
 
 
 async def delete_class_group_sessions(
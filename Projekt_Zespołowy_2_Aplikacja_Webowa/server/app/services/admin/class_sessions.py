@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, time
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import Select, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.schedule import (
@@ -14,18 +14,24 @@ from app.models.schedule import (
 from app.schemas.class_session import (
     ClassSessionBulkUpdatePayload,
     ClassSessionCreate,
+    ClassSessionRead,
     ClassSessionUpdate,
 )
+from app.services.admin import conflicts
+from app.utils.pagination import Keyset
 
+CLASS_SESSION_KEYSET = Keyset(
+    (ClassSession.date, ClassSession.start_time, ClassSession.id)
+)
 
-async def list_class_sessions(
-    session: AsyncSession,
+
+def class_sessions_query(
     from_date: date | None = None,
     to_date: date | None = None,
     class_group_id: int | None = None,
     status: ClassSessionStatus | None = None,
     room_id: int | None = None,
-) -> list[ClassSession]:
+) -> Select:
     query = select(ClassSession)
     if from_date is not None:
         query = query.where(ClassSession.date >= from_date)
@@ -37,9 +43,27 @@ async def list_class_sessions(
         query = query.where(ClassSession.status == status)
     if room_id is not None:
         query = query.where(ClassSession.room_id == room_id)
-    query = query.order_by(ClassSession.date, ClassSession.start_time)
-    result = await session.execute(query)
-    return list(result.scalars().all())
+    return query
+
+
+async def list_class_sessions(
+    session: AsyncSession,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    class_group_id: int | None = None,
+    status: ClassSessionStatus | None = None,
+    room_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> tuple[list[ClassSession], str | None]:
+    query = class_sessions_query(
+        from_date=from_date,
+        to_date=to_date,
+        class_group_id=class_group_id,
+        status=status,
+        room_id=room_id,
+    )
+    return await CLASS_SESSION_KEYSET.fetch_page(session, query, cursor, limit)
 
 
 async def get_class_session(
@@ -48,12 +72,26 @@ async def get_class_session(
     return await session.get(ClassSession, class_session_id)
 
 
+def _scheduled_slots(
+    class_sessions: list[ClassSession],
+) -> list[conflicts.SessionSlot]:
+    return [
+        conflicts.SessionSlot.from_session(class_session)
+        for class_session in class_sessions
+        if class_session.status == ClassSessionStatus.SCHEDULED
+    ]
+
+
 async def create_class_session(
     session: AsyncSession, data: ClassSessionCreate
 ) -> ClassSession:
     class_session = ClassSession(**data.model_dump())
+    await conflicts.ensure_no_conflicts(
+        session, _scheduled_slots([class_session])
+    )
     session.add(class_session)
-    await session.commit()
+    async with conflicts.conflict_guard(session):
+        await session.commit()
     await session.refresh(class_session)
     return class_session
 
@@ -66,7 +104,16 @@ async def update_class_session(
     updates = data.model_dump(exclude_unset=True)
     for key, value in updates.items():
         setattr(class_session, key, value)
-    await session.commit()
+    try:
+        with session.no_autoflush:
+            await conflicts.ensure_no_conflicts(
+                session, _scheduled_slots([class_session])
+            )
+    except ValueError:
+        await session.rollback()
+        raise
+    async with conflicts.conflict_guard(session):
+        await session.commit()
     await session.refresh(class_session)
     return class_session
 
@@ -116,10 +163,24 @@ async def reschedule_class_session(
         rescheduled_from_id=class_session.id,
         status=ClassSessionStatus.SCHEDULED,
     )
+    await conflicts.ensure_no_conflicts(
+        session,
+        [
+            conflicts.SessionSlot(
+                date=new_date,
+                start_time=new_start_time,
+                end_time=new_end_time,
+                room_id=class_session.room_id,
+                instructor_id=class_session.instructor_id,
+                session_id=class_session.id,
+            )
+        ],
+    )
     class_session.status = ClassSessionStatus.CANCELLED
     class_session.cancellation_reason = reason or "Rescheduled"
     session.add(new_session)
-    await session.commit()
+    async with conflicts.conflict_guard(session):
+        await session.commit()
     await session.refresh(class_session)
     await session.refresh(new_session)
     return new_session
@@ -130,20 +191,24 @@ async def bulk_cancel_class_sessions(
     class_group_id: int,
     dates: list[date],
     reason: str | None,
-) -> list[ClassSession]:
+) -> list[ClassSessionRead]:
     result = await session.execute(
-        select(ClassSession).where(
+        update(ClassSession)
+        .where(
             ClassSession.class_group_id == class_group_id,
             ClassSession.date.in_(dates),
         )
+        .values(
+            status=ClassSessionStatus.CANCELLED,
+            cancellation_reason=reason,
+        )
+        .returning(*ClassSession.__table__.columns)
+        .execution_options(synchronize_session=False)
     )
-    sessions = list(result.scalars().all())
-    for class_session in sessions:
-        class_session.status = ClassSessionStatus.CANCELLED
-        class_session.cancellation_reason = reason
+    sessions = [
+        ClassSessionRead.model_validate(dict(row)) for row in result.mappings()
+    ]
     await session.commit()
-    for class_session in sessions:
-        await session.refresh(class_session)
     return sessions
 
 
@@ -151,21 +216,50 @@ async def bulk_update_class_sessions(
     session: AsyncSession,
     session_ids: list[int],
     updates: ClassSessionBulkUpdatePayload,
-) -> list[ClassSession]:
+) -> list[ClassSessionRead]:
     session_id_set = set(session_ids)
-    result = await session.execute(
-        select(ClassSession).where(ClassSession.id.in_(session_id_set))
-    )
-    sessions = list(result.scalars().all())
-    if len(sessions) != len(session_id_set):
-        raise ValueError("Some class sessions were not found.")
     update_data = updates.model_dump(exclude_unset=True)
-    for class_session in sessions:
-        for key, value in update_data.items():
-            setattr(class_session, key, value)
-    await session.commit()
-    for class_session in sessions:
-        await session.refresh(class_session)
+    if not update_data:
+        result = await session.execute(
+            select(*ClassSession.__table__.columns).where(
+                ClassSession.id.in_(session_id_set)
+            )
+        )
+    else:
+        result = await session.execute(
+            update(ClassSession)
+            .where(ClassSession.id.in_(session_id_set))
+            .values(**update_data)
+            .returning(*ClassSession.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+    sessions = [
+        ClassSessionRead.model_validate(dict(row)) for row in result.mappings()
+    ]
+    if len(sessions) != len(session_id_set):
+        await session.rollback()
+        raise LookupError("Some class sessions were not found.")
+    try:
+        await conflicts.ensure_no_conflicts(
+            session,
+            [
+                conflicts.SessionSlot(
+                    date=item.date,
+                    start_time=item.start_time,
+                    end_time=item.end_time,
+                    room_id=item.room_id,
+                    instructor_id=item.instructor_id,
+                    session_id=item.id,
+                )
+                for item in sessions
+                if item.status == ClassSessionStatus.SCHEDULED
+            ],
+        )
+    except ValueError:
+        await session.rollback()
+        raise
+    async with conflicts.conflict_guard(session):
+        await session.commit()
     return sessions
 
 
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, time
+import uuid
+
+from sqlalchemy import (
+    Date,
+    Integer,
+    Time,
+    bindparam,
+    column,
+    func,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.schedule import ClassSession, ClassSessionStatus
+
+EXCLUSION_VIOLATION = "23P01"
+
+
+@dataclass(frozen=True)
+class SessionSlot:
+    date: date
+    start_time: time
+    end_time: time
+    room_id: int | None = None
+    instructor_id: uuid.UUID | None = None
+    session_id: int | None = None
+    label: str | None = None
+
+    @classmethod
+    def from_session(
+        cls, class_session: ClassSession, label: str | None = None
+    ) -> SessionSlot:
+        return cls(
+            date=class_session.date,
+            start_time=class_session.start_time,
+            end_time=class_session.end_time,
+            room_id=class_session.room_id,
+            instructor_id=class_session.instructor_id,
+            session_id=class_session.id,
+            label=label,
+        )
+
+    def describe(self) -> str:
+        if self.label:
+            return f"{self.date.isoformat()} ({self.label})"
+        return self.date.isoformat()
+
+
+class ScheduleConflictError(ValueError):
+    def __init__(self, conflicts: Iterable[SessionSlot] = ()) -> None:
+        self.conflicts = sorted(
+            set(conflicts),
+            key=lambda slot: (slot.date, slot.start_time, slot.label or ""),
+        )
+        if self.conflicts:
+            conflict_list = ", ".join(
+                dict.fromkeys(slot.describe() for slot in self.conflicts)
+            )
+            message = f"Conflicting sessions found on: {conflict_list}."
+        else:
+            message = "Conflicting sessions found."
+        super().__init__(message)
+
+
+def is_conflict_error(exc: IntegrityError) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == EXCLUSION_VIOLATION
+
+
+@asynccontextmanager
+async def conflict_guard(session: AsyncSession) -> AsyncIterator[None]:
+    try:
+        yield
+    except IntegrityError as exc:
+        if not is_conflict_error(exc):
+            raise
+        await session.rollback()
+        raise ScheduleConflictError() from exc
+
+
+def _validate_slots(slots: list[SessionSlot]) -> None:
+    for slot in slots:
+        if slot.start_time >= slot.end_time:
+            raise ValueError("Start time must be before end time.")
+
+
+def find_batch_conflicts(slots: list[SessionSlot]) -> set[SessionSlot]:
+    """Sweep-line overlap check for slots that are not in the database yet."""
+    conflicts: set[SessionSlot] = set()
+    for resource in ("room_id", "instructor_id"):
+        ordered = sorted(
+            (slot for slot in slots if getattr(slot, resource) is not None),
+            key=lambda slot: (
+                str(getattr(slot, resource)),
+                slot.date,
+                slot.start_time,
+            ),
+        )
+        latest: SessionSlot | None = None
+        for current in ordered:
+            if (
+                latest is not None
+                and getattr(latest, resource) == getattr(current, resource)
+                and latest.date == current.date
+                and current.start_time < latest.end_time
+            ):
+                conflicts.update((latest, current))
+                if current.end_time <= latest.end_time:
+                    continue
+            latest = current
+    return conflicts
+
+
+async def find_existing_conflicts(
+    session: AsyncSession, slots: list[SessionSlot]
+) -> set[SessionSlot]:
+    slots = [
+        slot
+        for slot in slots
+        if slot.room_id is not None or slot.instructor_id is not None
+    ]
+    if not slots:
+        return set()
+
+    columns = {
+        "slot_index": Integer,
+        "date": Date,
+        "start_time": Time,
+        "end_time": Time,
+        "room_id": Integer,
+        "instructor_id": UUID(as_uuid=True),
+    }
+    candidate = (
+        func.unnest(
+            *(
+                bindparam(
+                    name,
+                    [
+                        index if name == "slot_index" else getattr(slot, name)
+                        for index, slot in enumerate(slots)
+                    ],
+                    ARRAY(type_),
+                )
+                for name, type_ in columns.items()
+            )
+        )
+        .table_valued(
+            *(column(name, type_) for name, type_ in columns.items())
+        )
+        .render_derived(name="candidate")
+    )
+    existing_range = func.tsrange(
+        ClassSession.date + ClassSession.start_time,
+        ClassSession.date + ClassSession.end_time,
+    )
+    candidate_range = func.tsrange(
+        candidate.c.date + candidate.c.start_time,
+        candidate.c.date + candidate.c.end_time,
+    )
+    excluded_ids = [
+        slot.session_id for slot in slots if slot.session_id is not None
+    ]
+
+    def overlapping(resource: str):
+        query = (
+            select(candidate.c.slot_index)
+            .join(
+                ClassSession,
+                getattr(ClassSession, resource)
+                == getattr(candidate.c, resource),
+            )
+            .where(
+                ClassSession.status == ClassSessionStatus.SCHEDULED,
+                existing_range.op("&&")(candidate_range),
+            )
+        )
+        if excluded_ids:
+            query = query.where(ClassSession.id.not_in(excluded_ids))
+        return query
+
+    result = await session.execute(
+        union_all(overlapping("room_id"), overlapping("instructor_id"))
+    )
+    return {slots[slot_index] for slot_index in result.scalars()}
+
+
+async def ensure_no_conflicts(
+    session: AsyncSession, slots: list[SessionSlot]
+) -> None:
+    """Raise `ScheduleConflictError` if any slot overlaps a scheduled session.
+
+    Slots are compared with each other in memory and with the stored
+    sessions in one query. The exclusion constraints on `class_session`
+    remain the final guard against concurrent writers.
+    """
+    _validate_slots(slots)
+    conflicts = find_batch_conflicts(slots)
+    conflicts |= await find_existing_conflicts(session, slots)
+    if conflicts:
+        raise ScheduleConflictError(conflicts)
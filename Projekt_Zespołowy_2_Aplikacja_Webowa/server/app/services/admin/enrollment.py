@@ -3,13 +3,14 @@ from __future__ import annotations
 from datetime import datetime, timezone
 import uuid
 
-from sqlalchemy import case, func, select, update
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.schedule import ClassGroup
 from app.models.package import UserPackage
+from app.services.common.waitlist import fill_free_seats
 
 
 async def list_enrollments(
@@ -64,11 +65,17 @@ async def create_enrollment(
 async def update_enrollment(
     session: AsyncSession, enrollment: Enrollment, status: EnrollmentStatus
 ) -> Enrollment:
+    frees_seat = (
+        enrollment.status == EnrollmentStatus.ACTIVE
+        and status != EnrollmentStatus.ACTIVE
+    )
     enrollment.status = status
     if status == EnrollmentStatus.CANCELLED:
         enrollment.cancelled_at = datetime.now(timezone.utc)
     else:
         enrollment.cancelled_at = None
+    if frees_seat:
+        await fill_free_seats(session, enrollment.class_group_id)
     await session.commit()
     await session.refresh(enrollment)
     return enrollment
@@ -83,46 +90,14 @@ async def delete_enrollment(
         .values(enrollment_id=None)
     )
     await session.delete(enrollment)
+    if enrollment.status == EnrollmentStatus.ACTIVE:
+        await fill_free_seats(session, enrollment.class_group_id)
     await session.commit()
 
 
 async def promote_waitlist(
     session: AsyncSession, class_group_id: int
-) -> Enrollment | None:
-    counts = await session.execute(
-        select(
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Enrollment.status == EnrollmentStatus.ACTIVE, 1),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("active_count")
-        ).where(Enrollment.class_group_id == class_group_id)
-    )
-    active_count = int(counts.scalar() or 0)
-    class_group = await session.get(ClassGroup, class_group_id)
-    if not class_group:
-        return None
-    if active_count >= class_group.capacity:
-        return None
-
-    result = await session.execute(
-        select(Enrollment)
-        .where(
-            Enrollment.class_group_id == class_group_id,
-            Enrollment.status == EnrollmentStatus.WAITLISTED,
-        )
-        .order_by(Enrollment.joined_at.asc())
-        .limit(1)
-    )
-    enrollment = result.scalar_one_or_none()
-    if not enrollment:
-        return None
-    enrollment.status = EnrollmentStatus.ACTIVE
-    enrollment.cancelled_at = None
+) -> list[Enrollment]:
+    promoted = await fill_free_seats(session, class_group_id)
     await session.commit()
-    await session.refresh(enrollment)
-    return enrollment
+    return promoted
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Select, select
+
+from app.models.payment import Charge, Payment, PaymentAllocation
+
+
+def payments_export_query(
+    paid_from: datetime | None = None, paid_to: datetime | None = None
+) -> Select:
+    query = select(
+        Payment.id,
+        Payment.user_id.label("student_id"),
+        Payment.amount,
+        Payment.paid_at,
+        Payment.payment_method,
+        Payment.notes,
+    )
+    if paid_from is not None:
+        query = query.where(Payment.paid_at >= paid_from)
+    if paid_to is not None:
+        query = query.where(Payment.paid_at <= paid_to)
+    return query.order_by(Payment.paid_at, Payment.id)
+
+
+def charges_export_query(
+    due_from: date | None = None, due_to: date | None = None
+) -> Select:
+    query = select(
+        Charge.id,
+        Charge.student_id,
+        Charge.due_date,
+        Charge.amount_due,
+        Charge.type,
+        Charge.status,
+        Charge.billing_period,
+        Charge.semester_id,
+        Charge.created_at,
+    )
+    if due_from is not None:
+        query = query.where(Charge.due_date >= due_from)
+    if due_to is not None:
+        query = query.where(Charge.due_date <= due_to)
+    return query.order_by(Charge.due_date, Charge.id)
+
+
+def allocations_export_query(
+    paid_from: datetime | None = None, paid_to: datetime | None = None
+) -> Select:
+    query = (
+        select(
+            PaymentAllocation.payment_id,
+            PaymentAllocation.charge_id,
+            Payment.user_id.label("student_id"),
+            PaymentAllocation.amount_allocated,
+            Payment.paid_at,
+            Charge.due_date,
+        )
+        .join(Payment, Payment.id == PaymentAllocation.payment_id)
+        .join(Charge, Charge.id == PaymentAllocation.charge_id)
+    )
+    if paid_from is not None:
+        query = query.where(Payment.paid_at >= paid_from)
+    if paid_to is not None:
+        query = query.where(Payment.paid_at <= paid_to)
+    return query.order_by(
+        Payment.paid_at,
+        PaymentAllocation.payment_id,
+        PaymentAllocation.charge_id,
+    )
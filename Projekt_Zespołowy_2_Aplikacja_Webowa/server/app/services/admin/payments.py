@@ -4,7 +4,8 @@ from datetime import datetime
 from decimal import Decimal
 import uuid
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,15 +24,18 @@ from app.schemas.payment import (
     PaymentUpdate,
 )
 from app.services.admin import charges as charge_service
+from app.services.common import billing as billing_service
+from app.utils.pagination import Keyset
 
+PAYMENT_KEYSET = Keyset((Payment.paid_at, Payment.id), descending=True)
 
-async def list_payments(
-    session: AsyncSession,
+
+def payments_query(
     student_id: uuid.UUID | None = None,
     paid_from: datetime | None = None,
     paid_to: datetime | None = None,
     method: PaymentMethod | None = None,
-) -> list[Payment]:
+) -> Select:
     query = select(Payment)
     if student_id is not None:
         query = query.where(Payment.user_id == student_id)
@@ -41,9 +45,25 @@ async def list_payments(
         query = query.where(Payment.paid_at <= paid_to)
     if method is not None:
         query = query.where(Payment.payment_method == method)
-    query = query.order_by(Payment.paid_at.desc(), Payment.id.desc())
-    result = await session.execute(query)
-    return list(result.scalars().all())
+    return query
+
+
+async def list_payments(
+    session: AsyncSession,
+    student_id: uuid.UUID | None = None,
+    paid_from: datetime | None = None,
+    paid_to: datetime | None = None,
+    method: PaymentMethod | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> tuple[list[Payment], str | None]:
+    query = payments_query(
+        student_id=student_id,
+        paid_from=paid_from,
+        paid_to=paid_to,
+        method=method,
+    )
+    return await PAYMENT_KEYSET.fetch_page(session, query, cursor, limit)
 
 
 async def get_payment(
@@ -79,21 +99,22 @@ async def update_payment(
 
 
 async def delete_payment(session: AsyncSession, payment: Payment) -> None:
-    result = await session.execute(
-        select(PaymentAllocation).where(
-            PaymentAllocation.payment_id == payment.id
+    # Allocations have no relationship to their payment, so they are deleted
+    # in their own statement before the payment row.
+    charge_ids = list(
+        await session.scalars(
+            delete(PaymentAllocation)
+            .where(PaymentAllocation.payment_id == payment.id)
+            .returning(PaymentAllocation.charge_id)
         )
     )
-    allocations = list(result.scalars().all())
-    charge_ids = {allocation.charge_id for allocation in allocations}
-    for allocation in allocations:
-        await session.delete(allocation)
     await session.delete(payment)
+    await session.flush()
+    if charge_ids:
+        await charge_service.recalculate_charge_statuses(
+            session, charge_ids=sorted(set(charge_ids))
+        )
     await session.commit()
-    for charge_id in charge_ids:
-        charge = await session.get(Charge, charge_id)
-        if charge:
-            await charge_service.recalculate_charge_status(session, charge)
 
 
 async def list_allocations_by_payment(
@@ -152,12 +173,15 @@ async def create_allocation(
     )
     session.add(allocation)
     try:
-        await session.commit()
+        await session.flush()
     except IntegrityError as exc:
         await session.rollback()
         raise ValueError("Allocation already exists.") from exc
+    await charge_service.recalculate_charge_statuses(
+        session, charge_ids=[charge.id]
+    )
+    await session.commit()
     await session.refresh(allocation)
-    await charge_service.recalculate_charge_status(session, charge)
     return allocation
 
 
@@ -167,11 +191,12 @@ async def update_allocation(
     data: PaymentAllocationUpdate,
 ) -> PaymentAllocation:
     allocation.amount_allocated = data.amount_allocated
+    await session.flush()
+    await charge_service.recalculate_charge_statuses(
+        session, charge_ids=[allocation.charge_id]
+    )
     await session.commit()
     await session.refresh(allocation)
-    charge = await session.get(Charge, allocation.charge_id)
-    if charge:
-        await charge_service.recalculate_charge_status(session, charge)
     return allocation
 
 
@@ -180,59 +205,157 @@ async def delete_allocation(
 ) -> None:
     charge_id = allocation.charge_id
     await session.delete(allocation)
+    await session.flush()
+    await charge_service.recalculate_charge_statuses(
+        session, charge_ids=[charge_id]
+    )
     await session.commit()
-    charge = await session.get(Charge, charge_id)
-    if charge:
-        await charge_service.recalculate_charge_status(session, charge)
 
 
-async def summarize_student_billing(
-    session: AsyncSession, student_id: uuid.UUID
-) -> dict:
-    open_charges = await session.execute(
-        select(Charge)
-        .where(
-            Charge.student_id == student_id,
-            Charge.status.in_([ChargeStatus.OPEN, ChargeStatus.PARTIAL]),
+async def _allocate_payment(
+    session: AsyncSession, payment_id: int
+) -> list[PaymentAllocation]:
+    payment = await session.scalar(
+        select(Payment).where(Payment.id == payment_id).with_for_update()
+    )
+    if not payment:
+        raise LookupError("Payment not found.")
+    already_allocated = await session.scalar(
+        select(
+            func.coalesce(
+                func.sum(PaymentAllocation.amount_allocated), Decimal("0")
+            )
+        ).where(PaymentAllocation.payment_id == payment.id)
+    )
+    available = payment.amount - already_allocated
+    if available <= Decimal("0"):
+        return []
+
+    # Locking the open charges keeps two payments of one student from
+    # filling the same charge. The amounts are read after the locks are
+    # held, so allocations committed meanwhile are seen.
+    charge_ids = list(
+        await session.scalars(
+            select(Charge.id)
+            .where(
+                Charge.student_id == payment.user_id,
+                Charge.status.in_([ChargeStatus.OPEN, ChargeStatus.PARTIAL]),
+            )
+            .order_by(Charge.due_date, Charge.id)
+            .with_for_update()
         )
-        .order_by(Charge.due_date)
-    )
-    open_charges_list = list(open_charges.scalars().all())
-    if not open_charges_list:
-        return {
-            "total_open": Decimal("0"),
-            "total_overdue": Decimal("0"),
-            "next_due_date": None,
-            "open_charges": [],
-        }
-    charge_ids = [charge.id for charge in open_charges_list]
-    allocation_result = await session.execute(
+    )
+    if not charge_ids:
+        return []
+    paid_so_far = (
         select(
-            PaymentAllocation.charge_id,
             func.coalesce(
                 func.sum(PaymentAllocation.amount_allocated), Decimal("0")
-            ).label("allocated"),
+            )
         )
-        .where(PaymentAllocation.charge_id.in_(charge_ids))
-        .group_by(PaymentAllocation.charge_id)
+        .where(PaymentAllocation.charge_id == Charge.id)
+        .scalar_subquery()
     )
-    allocated_map = {
-        row.charge_id: row.allocated for row in allocation_result.all()
-    }
-    today = datetime.now().date()
-    total_open = Decimal("0")
-    total_overdue = Decimal("0")
-    for charge in open_charges_list:
-        allocated = allocated_map.get(charge.id, Decimal("0"))
-        remaining = charge.amount_due - allocated
-        if remaining < Decimal("0"):
-            remaining = Decimal("0")
-        total_open += remaining
-        if charge.due_date < today:
-            total_overdue += remaining
+    result = await session.execute(
+        select(Charge.id, Charge.amount_due, paid_so_far)
+        .where(Charge.id.in_(charge_ids), Charge.amount_due > paid_so_far)
+        .order_by(Charge.due_date, Charge.id)
+    )
+    rows = []
+    for charge_id, amount_due, paid in result.all():
+        if available <= Decimal("0"):
+            break
+        amount = min(available, amount_due - paid)
+        available -= amount
+        rows.append(
+            {
+                "payment_id": payment.id,
+                "charge_id": charge_id,
+                "amount_allocated": amount,
+            }
+        )
+    if not rows:
+        return []
+
+    statement = insert(PaymentAllocation).values(rows)
+    statement = statement.on_conflict_do_update(
+        constraint="uq_payment_allocation_payment_charge",
+        set_={
+            "amount_allocated": PaymentAllocation.amount_allocated
+            + statement.excluded.amount_allocated
+        },
+    ).returning(PaymentAllocation)
+    allocations = list(
+        await session.scalars(
+            statement, execution_options={"populate_existing": True}
+        )
+    )
+    await charge_service.recalculate_charge_statuses(
+        session, charge_ids=[row["charge_id"] for row in rows]
+    )
+    return allocations
+
+
+async def auto_allocate_payment(
+    session: AsyncSession, payment_id: int
+) -> list[PaymentAllocation]:
+    """Spread the unallocated part of a payment over open charges.
+
+    The student's charges are paid oldest due date first. All allocations
+    and charge status changes are committed together.
+    """
+    allocations = await _allocate_payment(session, payment_id)
+    await session.commit()
+    return allocations
+
+
+async def auto_allocate_payments(session: AsyncSession) -> int:
+    """Auto-allocate every payment that still has money left over.
+
+    Payments are handled oldest first, each in its own transaction.
+    Returns the number of allocations written.
+    """
+    allocated = (
+        select(
+            func.coalesce(
+                func.sum(PaymentAllocation.amount_allocated), Decimal("0")
+            )
+        )
+        .where(PaymentAllocation.payment_id == Payment.id)
+        .scalar_subquery()
+    )
+    payment_ids = list(
+        await session.scalars(
+            select(Payment.id)
+            .where(
+                Payment.amount > allocated,
+                select(Charge.id)
+                .where(
+                    Charge.student_id == Payment.user_id,
+                    Charge.status.in_(
+                        [ChargeStatus.OPEN, ChargeStatus.PARTIAL]
+                    ),
+                )
+                .exists(),
+            )
+            .order_by(Payment.paid_at, Payment.id)
+        )
+    )
+    await session.commit()
+    written = 0
+    for payment_id in payment_ids:
+        written += len(await _allocate_payment(session, payment_id))
+        await session.commit()
+    return written
+
+
+async def summarize_student_billing(
+    session: AsyncSession, student_id: uuid.UUID
+) -> dict:
+    summary = await billing_service.summarize_open_charges(session, student_id)
     return {
-        "total_open": total_open,
-        "total_overdue": total_overdue,
-        "next_due_date": open_charges_list[0].due_date,
-        "open_charges": open_charges_list,
+        "total_open": summary["total_open"],
+        "total_overdue": summary["total_overdue"],
+        "next_due_date": summary["next_due_date"],
+        "open_charges": summary["open_charges"],
     }
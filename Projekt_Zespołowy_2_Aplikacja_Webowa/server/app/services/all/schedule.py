@@ -2,11 +2,16 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import date, datetime
+import hashlib
+import json
 
-from sqlalchemy import case, func, select
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.core.cache import TTLCache, invalidate_on_commit
+from app.core.config import get_settings
+from app.models.enrollment import Enrollment
 from app.models.room import Room
 from app.models.schedule import (
     ClassGroup,
@@ -16,6 +21,49 @@ from app.models.schedule import (
 )
 from app.models.semester import SkillLevel, Topic
 
+settings = get_settings()
+
+public_schedule_cache: TTLCache[tuple, tuple[str, dict]] = TTLCache(
+    maxsize=settings.PUBLIC_SCHEDULE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PUBLIC_SCHEDULE_CACHE_TTL_SECONDS,
+)
+invalidate_on_commit(
+    public_schedule_cache,
+    Enrollment,
+    ClassSession,
+    ClassGroup,
+    Room,
+    SkillLevel,
+    Topic,
+)
+
+
+def _schedule_cache_key(
+    from_date: date,
+    to_date: date,
+    level: str | None,
+    topic: str | None,
+    room_id: int | None,
+    weekday: int | None,
+    include_full: bool,
+) -> tuple:
+    return (
+        from_date,
+        to_date,
+        level.lower() if level else None,
+        topic.lower() if topic else None,
+        room_id,
+        weekday,
+        include_full,
+    )
+
+
+def _schedule_etag(payload: dict) -> str:
+    encoded = json.dumps(
+        jsonable_encoder(payload), sort_keys=True, separators=(",", ":")
+    )
+    return '"' + hashlib.sha256(encoded.encode()).hexdigest()[:32] + '"'
+
 
 async def list_public_schedule(
     session: AsyncSession,
@@ -27,45 +75,24 @@ async def list_public_schedule(
     weekday: int | None = None,
     include_full: bool = False,
 ) -> dict:
-    counts_subq = (
-        select(
-            Enrollment.class_group_id.label("class_group_id"),
-            func.sum(
-                case(
-                    (Enrollment.status == EnrollmentStatus.ACTIVE, 1),
-                    else_=0,
-                )
-            ).label("enrolled_count"),
-            func.sum(
-                case(
-                    (Enrollment.status == EnrollmentStatus.WAITLISTED, 1),
-                    else_=0,
-                )
-            ).label("waitlist_count"),
-        )
-        .group_by(Enrollment.class_group_id)
-        .subquery()
-    )
-
     query = (
         select(
             ClassGroup,
             SkillLevel.name.label("level_name"),
             Topic.name.label("topic_name"),
             Room,
-            counts_subq.c.enrolled_count,
-            counts_subq.c.waitlist_count,
         )
         .join(SkillLevel, ClassGroup.level_id == SkillLevel.id)
         .join(Topic, ClassGroup.topic_id == Topic.id)
         .outerjoin(Room, ClassGroup.room_id == Room.id)
-        .outerjoin(counts_subq, counts_subq.c.class_group_id == ClassGroup.id)
         .where(
             ClassGroup.is_public.is_(True),
             ClassGroup.status == ClassGroupStatus.OPEN,
         )
     )
 
+    if not include_full:
+        query = query.where(ClassGroup.enrolled_count < ClassGroup.capacity)
     if level:
         query = query.where(SkillLevel.name.ilike(level))
     if topic:
@@ -111,17 +138,13 @@ async def list_public_schedule(
         level_name,
         topic_name,
         room,
-        enrolled_count,
-        waitlist_count,
     ) in rows:
         occurrences = occurrences_map.get(class_group.id, [])
         if not occurrences:
             continue
-        enrolled_count = int(enrolled_count or 0)
-        waitlist_count = int(waitlist_count or 0)
-        available_spots = max(class_group.capacity - enrolled_count, 0)
-        if not include_full and available_spots <= 0:
-            continue
+        available_spots = max(
+            class_group.capacity - class_group.enrolled_count, 0
+        )
         groups.append(
             {
                 "group_id": class_group.id,
@@ -130,9 +153,9 @@ async def list_public_schedule(
                 "topic": topic_name,
                 "room": ({"id": room.id, "name": room.name} if room else None),
                 "capacity": class_group.capacity,
-                "enrolled_count": enrolled_count,
+                "enrolled_count": class_group.enrolled_count,
                 "available_spots": available_spots,
-                "waitlist_count": waitlist_count,
+                "waitlist_count": class_group.waitlist_count,
                 "can_join_waitlist": available_spots <= 0,
                 "occurrences": occurrences,
             }
@@ -144,3 +167,35 @@ async def list_public_schedule(
         "range": {"from": from_date, "to": to_date},
         "groups": groups,
     }
+
+
+async def get_public_schedule(
+    session: AsyncSession,
+    from_date: date,
+    to_date: date,
+    level: str | None = None,
+    topic: str | None = None,
+    room_id: int | None = None,
+    weekday: int | None = None,
+    include_full: bool = False,
+) -> tuple[str, dict]:
+    key = _schedule_cache_key(
+        from_date, to_date, level, topic, room_id, weekday, include_full
+    )
+    cached = public_schedule_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = public_schedule_cache.generation
+    payload = await list_public_schedule(
+        session,
+        from_date=from_date,
+        to_date=to_date,
+        level=level,
+        topic=topic,
+        room_id=room_id,
+        weekday=weekday,
+        include_full=include_full,
+    )
+    entry = (_schedule_etag(payload), payload)
+    public_schedule_cache.set(key, entry, generation=generation)
+    return entry
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+import uuid
+
+from sqlalchemy import Subquery, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.payment import Charge, ChargeStatus, PaymentAllocation
+from app.models.user import User
+
+ZERO = Decimal("0")
+AGING_BUCKETS = (
+    ("overdue_up_to_30", 1, 30),
+    ("overdue_31_to_60", 31, 60),
+    ("overdue_61_to_90", 61, 90),
+    ("overdue_over_90", 91, None),
+)
+
+
+def open_balances(student_id: uuid.UUID | None = None) -> Subquery:
+    """Remaining amount of every open or partly paid charge."""
+    allocated = func.coalesce(
+        func.sum(PaymentAllocation.amount_allocated), ZERO
+    )
+    query = (
+        select(
+            Charge.id.label("charge_id"),
+            Charge.student_id,
+            Charge.due_date,
+            func.greatest(Charge.amount_due - allocated, ZERO).label(
+                "remaining"
+            ),
+        )
+        .outerjoin(PaymentAllocation, PaymentAllocation.charge_id == Charge.id)
+        .where(Charge.status.in_([ChargeStatus.OPEN, ChargeStatus.PARTIAL]))
+        .group_by(Charge.id)
+    )
+    if student_id is not None:
+        query = query.where(Charge.student_id == student_id)
+    return query.subquery("balances")
+
+
+async def summarize_open_charges(
+    session: AsyncSession, student_id: uuid.UUID, today: date | None = None
+) -> dict:
+    """Open charges of a student with their totals, in one query."""
+    today = today or date.today()
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    balances = open_balances(student_id)
+    remaining = balances.c.remaining
+    result = await session.execute(
+        select(
+            Charge,
+            func.sum(remaining).over(),
+            func.sum(remaining).filter(balances.c.due_date < today).over(),
+            func.sum(remaining)
+            .filter(
+                balances.c.due_date >= month_start,
+                balances.c.due_date < next_month,
+            )
+            .over(),
+        )
+        .join(balances, balances.c.charge_id == Charge.id)
+        .order_by(Charge.due_date, Charge.id)
+    )
+    rows = result.all()
+    _, total_open, total_overdue, current_month_due = (
+        rows[0] if rows else (None, ZERO, ZERO, ZERO)
+    )
+    open_charges = [row[0] for row in rows]
+    return {
+        "open_charges": open_charges,
+        "total_open": total_open,
+        "total_overdue": total_overdue or ZERO,
+        "current_month_due": current_month_due or ZERO,
+        "next_due_date": open_charges[0].due_date if open_charges else None,
+    }
+
+
+async def receivables_aging(
+    session: AsyncSession, today: date | None = None
+) -> list[dict]:
+    """Overdue balance of every student, bucketed by days past due."""
+    today = today or date.today()
+    balances = open_balances()
+    days_overdue = today - balances.c.due_date
+    buckets = []
+    for name, low, high in AGING_BUCKETS:
+        in_bucket = days_overdue >= low
+        if high is not None:
+            in_bucket &= days_overdue <= high
+        buckets.append(
+            func.coalesce(
+                func.sum(balances.c.remaining).filter(in_bucket), ZERO
+            ).label(name)
+        )
+    total_overdue = func.sum(balances.c.remaining)
+    result = await session.execute(
+        select(
+            User.id.label("student_id"),
+            User.first_name,
+            User.last_name,
+            User.email,
+            *buckets,
+            total_overdue.label("total_overdue"),
+        )
+        .join(balances, balances.c.student_id == User.id)
+        .where(balances.c.due_date < today, balances.c.remaining > ZERO)
+        .group_by(User.id)
+        .order_by(total_overdue.desc(), User.id)
+    )
+    return [dict(row._mapping) for row in result.all()]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date
+import uuid
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.schedule import ClassGroup, ClassSession
+
+CALENDAR_COLUMNS = (
+    ClassSession.id.label("class_session_id"),
+    ClassGroup.id.label("class_group_id"),
+    ClassGroup.name.label("class_group_name"),
+    ClassSession.date,
+    ClassSession.start_time,
+    ClassSession.end_time,
+    ClassSession.status,
+    ClassSession.room_id,
+    ClassSession.instructor_id,
+    ClassGroup.topic_id,
+    ClassGroup.level_id,
+)
+
+
+def calendar_query(
+    from_date: date | None = None,
+    to_date: date | None = None,
+    room_id: int | None = None,
+    instructor_id: uuid.UUID | None = None,
+    student_id: uuid.UUID | None = None,
+    topic_id: int | None = None,
+    level_id: int | None = None,
+) -> Select:
+    """Calendar rows with only the columns of `CalendarEntryRead`.
+
+    `student_id` limits the rows to groups the student is actively
+    enrolled in.
+    """
+    query = (
+        select(*CALENDAR_COLUMNS)
+        .join(ClassGroup, ClassSession.class_group_id == ClassGroup.id)
+        .order_by(ClassSession.date, ClassSession.start_time)
+    )
+    if student_id is not None:
+        query = query.join(
+            Enrollment, Enrollment.class_group_id == ClassGroup.id
+        ).where(
+            Enrollment.student_id == student_id,
+            Enrollment.status == EnrollmentStatus.ACTIVE,
+        )
+    if from_date is not None:
+        query = query.where(ClassSession.date >= from_date)
+    if to_date is not None:
+        query = query.where(ClassSession.date <= to_date)
+    if room_id is not None:
+        query = query.where(ClassSession.room_id == room_id)
+    if instructor_id is not None:
+        query = query.where(ClassSession.instructor_id == instructor_id)
+    if topic_id is not None:
+        query = query.where(ClassGroup.topic_id == topic_id)
+    if level_id is not None:
+        query = query.where(ClassGroup.level_id == level_id)
+    return query
+
+
+async def fetch_calendar_entries(
+    session: AsyncSession, query: Select
+) -> list[dict]:
+    result = await session.execute(query)
+    return [dict(row) for row in result.mappings()]
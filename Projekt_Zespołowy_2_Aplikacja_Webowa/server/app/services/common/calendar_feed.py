@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+import logging
+import secrets
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Row,
+    Select,
+    Text,
+    cast,
+    delete,
+    func,
+    or_,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.calendar_change import CalendarChange
+from app.models.room import Room
+from app.models.schedule import ClassSession, ClassSessionStatus
+from app.models.user import User, UserRole
+from app.utils.icalendar import CalendarEvent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+EVENT_UID = "class-session-{}@tiptap"
+CALENDAR_FEED_PATHS = {
+    UserRole.STUDENT: "/me/calendar.ics",
+    UserRole.INSTRUCTOR: "/instructor/calendar.ics",
+    UserRole.ADMIN: "/admin/schedule/calendar.ics",
+}
+
+
+@dataclass
+class CalendarFeed:
+    sync_token: int
+    events: list[CalendarEvent] = field(default_factory=list)
+    full: bool = False
+
+
+def calendar_feed_url(user: User) -> str:
+    path = CALENDAR_FEED_PATHS[UserRole(user.role)]
+    return (
+        f"{settings.BACKEND_BASE_URL}{settings.API_V1_STR}{path}"
+        f"?token={user.calendar_token}"
+    )
+
+
+async def rotate_calendar_token(session: AsyncSession, user: User) -> str:
+    """Give the user a new feed URL, which also revokes the old one."""
+    token = secrets.token_urlsafe(32)
+    user.calendar_token = token
+    await session.commit()
+    return token
+
+
+async def revoke_calendar_token(session: AsyncSession, user: User) -> None:
+    user.calendar_token = None
+    await session.commit()
+
+
+async def get_calendar_token_user(
+    session: AsyncSession, token: str
+) -> User | None:
+    return await session.scalar(
+        select(User).where(
+            User.calendar_token == token, User.is_active.is_(True)
+        )
+    )
+
+
+async def current_sync_token(session: AsyncSession) -> int:
+    """Oldest transaction that may still be invisible to this session.
+
+    Every change written by an older transaction is already committed, so
+    a client that later asks for changes from transactions >= this token
+    cannot miss one, at worst it gets a few changes again.
+    """
+    xmin = func.pg_snapshot_xmin(func.pg_current_snapshot())
+    return await session.scalar(select(cast(cast(xmin, Text), BigInteger)))
+
+
+def _removed_event(
+    class_session_id: int, session_date: date, start: time, end: time
+) -> CalendarEvent:
+    return CalendarEvent(
+        uid=EVENT_UID.format(class_session_id),
+        start=datetime.combine(session_date, start),
+        end=datetime.combine(session_date, end),
+        cancelled=True,
+    )
+
+
+async def _session_events(
+    session: AsyncSession, rows: Sequence[Row]
+) -> list[CalendarEvent]:
+    room_ids = {row.room_id for row in rows if row.room_id is not None}
+    rooms: dict[int, str] = {}
+    if room_ids:
+        result = await session.execute(
+            select(Room.id, Room.name).where(Room.id.in_(room_ids))
+        )
+        rooms = dict(result.tuples().all())
+    return [
+        CalendarEvent(
+            uid=EVENT_UID.format(row.class_session_id),
+            start=datetime.combine(row.date, row.start_time),
+            end=datetime.combine(row.date, row.end_time),
+            summary=row.class_group_name,
+            cancelled=row.status == ClassSessionStatus.CANCELLED,
+            location=rooms.get(row.room_id),
+        )
+        for row in rows
+    ]
+
+
+async def build_calendar_feed(
+    session: AsyncSession,
+    query: Select,
+    relevant: ColumnElement[bool],
+    since: int | None = None,
+) -> CalendarFeed:
+    """Render the sessions of `query` changed since the `since` token.
+
+    `query` is a `calendar_query` of the rows visible to the user,
+    and `relevant` picks the change log rows that may affect them. Sessions
+    that changed but are no longer visible come back as cancelled events.
+    Without a token, or with one older than every change still in the
+    log, the whole calendar is returned.
+    """
+    sync_token = await current_sync_token(session)
+    if since is not None:
+        oldest = await session.scalar(
+            select(func.min(CalendarChange.transaction_id))
+        )
+        if oldest is not None and since < oldest:
+            # Changes made after the token may have been pruned.
+            since = None
+    if since is None:
+        rows = (await session.execute(query)).all()
+        return CalendarFeed(
+            sync_token, await _session_events(session, rows), full=True
+        )
+
+    result = await session.scalars(
+        select(CalendarChange)
+        .where(CalendarChange.transaction_id >= since, relevant)
+        .order_by(CalendarChange.id)
+    )
+    changes = result.all()
+    changed_sessions = {
+        change.class_session_id: change
+        for change in changes
+        if change.class_session_id is not None
+    }
+    changed_groups = {
+        change.class_group_id
+        for change in changes
+        if change.class_session_id is None
+    }
+    if not changed_sessions and not changed_groups:
+        return CalendarFeed(sync_token)
+
+    rows = (
+        await session.execute(
+            query.where(
+                or_(
+                    ClassSession.id.in_(list(changed_sessions)),
+                    ClassSession.class_group_id.in_(changed_groups),
+                )
+            )
+        )
+    ).all()
+    events = await _session_events(session, rows)
+    visible_ids = {row.class_session_id for row in rows}
+    events.extend(
+        _removed_event(
+            class_session_id, change.date, change.start_time, change.end_time
+        )
+        for class_session_id, change in changed_sessions.items()
+        if class_session_id not in visible_ids
+    )
+
+    left_groups = {
+        change.class_group_id
+        for change in changes
+        if change.student_id is not None
+    }
+    if left_groups:
+        result = await session.execute(
+            select(
+                ClassSession.id,
+                ClassSession.date,
+                ClassSession.start_time,
+                ClassSession.end_time,
+            ).where(
+                ClassSession.class_group_id.in_(left_groups),
+                ClassSession.id.not_in(visible_ids | set(changed_sessions)),
+            )
+        )
+        events.extend(_removed_event(*row) for row in result.all())
+    return CalendarFeed(sync_token, events)
+
+
+async def prune_calendar_changes(
+    session: AsyncSession, batch_size: int | None = None
+) -> int:
+    """Delete change log rows older than the retention horizon.
+
+    Rows go in transaction order, up to the oldest transaction that is
+    still within the horizon, and the newest transaction is always kept.
+    The oldest transaction left therefore tells `build_calendar_feed`
+    which sync tokens may have missed a pruned change. Returns the number
+    of rows deleted.
+    """
+    batch_size = batch_size or settings.CALENDAR_CHANGE_PRUNE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=settings.CALENDAR_CHANGE_RETENTION_DAYS
+    )
+    kept_from = await session.scalar(
+        select(CalendarChange.transaction_id)
+        .where(CalendarChange.changed_at >= cutoff)
+        .order_by(CalendarChange.transaction_id)
+        .limit(1)
+    )
+    if kept_from is None:
+        kept_from = await session.scalar(
+            select(func.max(CalendarChange.transaction_id))
+        )
+    if kept_from is None:
+        return 0
+    pruned = 0
+    while True:
+        expired = (
+            select(CalendarChange.id)
+            .where(CalendarChange.transaction_id < kept_from)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            delete(CalendarChange)
+            .where(CalendarChange.id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        pruned += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    if pruned:
+        logger.info("Pruned %d calendar changes", pruned)
+    return pruned
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Subquery, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.schedule import ClassGroup
+
+logger = logging.getLogger(__name__)
+
+
+def _actual_counts() -> Subquery:
+    return (
+        select(
+            ClassGroup.id.label("class_group_id"),
+            func.count(Enrollment.id)
+            .filter(Enrollment.status == EnrollmentStatus.ACTIVE)
+            .label("enrolled_count"),
+            func.count(Enrollment.id)
+            .filter(Enrollment.status == EnrollmentStatus.WAITLISTED)
+            .label("waitlist_count"),
+        )
+        .outerjoin(Enrollment, Enrollment.class_group_id == ClassGroup.id)
+        .group_by(ClassGroup.id)
+        .subquery()
+    )
+
+
+def _drifted(actual: Subquery):
+    return tuple_(
+        ClassGroup.enrolled_count, ClassGroup.waitlist_count
+    ).is_distinct_from(
+        tuple_(actual.c.enrolled_count, actual.c.waitlist_count)
+    )
+
+
+async def reconcile_enrollment_counters(session: AsyncSession) -> int:
+    """Recount the enrollment counters of groups that drifted.
+
+    The counters are maintained by triggers, so drift only comes from
+    changes made with the triggers disabled (bulk loads, manual repairs).
+    Returns the number of repaired groups.
+    """
+    actual = _actual_counts()
+    drifted_ids = list(
+        await session.scalars(
+            select(ClassGroup.id)
+            .join(actual, actual.c.class_group_id == ClassGroup.id)
+            .where(_drifted(actual))
+        )
+    )
+    if not drifted_ids:
+        return 0
+
+    # Waiting for the row locks lets in-flight enrollments commit first,
+    # and the recount below then sees them.
+    await session.execute(
+        select(ClassGroup.id)
+        .where(ClassGroup.id.in_(drifted_ids))
+        .order_by(ClassGroup.id)
+        .with_for_update(key_share=True)
+    )
+    actual = _actual_counts()
+    result = await session.execute(
+        update(ClassGroup)
+        .where(
+            ClassGroup.id == actual.c.class_group_id,
+            ClassGroup.id.in_(drifted_ids),
+            _drifted(actual),
+        )
+        .values(
+            enrolled_count=actual.c.enrolled_count,
+            waitlist_count=actual.c.waitlist_count,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    if result.rowcount:
+        logger.warning(
+            "Repaired enrollment counters of %d class groups",
+            result.rowcount,
+        )
+    return result.rowcount
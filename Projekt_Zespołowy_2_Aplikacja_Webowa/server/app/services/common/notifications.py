@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, timedelta, timezone
+import logging
+import uuid
+
+from pydantic import NameEmail
+from sqlalchemy import func, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.email.rendering import render_bodies, render_template
+from app.email.send_email import (
+    ENROLLMENT_CONFIRMATION_TEMPLATE,
+    NEW_CHARGE_TEMPLATE,
+    PAYMENT_OVERDUE_TEMPLATE,
+    EmailSchema,
+    build_enrollment_confirmation_email,
+    build_new_charge_email,
+    build_payment_overdue_email,
+    send_html,
+)
+from app.models.enrollment import Enrollment
+from app.models.notification import (
+    Notification,
+    NotificationStatus,
+    NotificationType,
+)
+from app.models.payment import Charge, ChargeStatus, PaymentAllocation
+from app.models.schedule import ClassGroup
+from app.models.user import User
+from app.services.common.billing import ZERO
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+NOTIFICATION_TEMPLATES = {
+    NotificationType.ENROLL_CONFIRM: ENROLLMENT_CONFIRMATION_TEMPLATE,
+    NotificationType.NEW_CHARGE: NEW_CHARGE_TEMPLATE,
+    NotificationType.PAYMENT_OVERDUE: PAYMENT_OVERDUE_TEMPLATE,
+}
+
+
+async def _students_by_id(
+    session: AsyncSession, student_ids: Iterable[uuid.UUID]
+) -> dict[uuid.UUID, User]:
+    return {
+        student.id: student
+        for student in await session.scalars(
+            select(User).where(User.id.in_(set(student_ids)))
+        )
+    }
+
+
+def _notification_row(
+    notification_type: NotificationType, student: User, email: EmailSchema
+) -> dict:
+    return {
+        "type": notification_type,
+        "recipient_user_id": student.id,
+        "email_to": student.email,
+        "subject": email.subject,
+        "body": email.body,
+    }
+
+
+async def enqueue_enrollment_confirmations(
+    session: AsyncSession,
+    class_group: ClassGroup,
+    enrollments: Sequence[Enrollment],
+) -> None:
+    """Queue confirmation emails in the caller's transaction."""
+    if not enrollments:
+        return
+    students = await _students_by_id(
+        session, [item.student_id for item in enrollments]
+    )
+    rows = []
+    for enrollment in enrollments:
+        student = students[enrollment.student_id]
+        email = build_enrollment_confirmation_email(
+            student, class_group, enrollment.status
+        )
+        rows.append(
+            _notification_row(NotificationType.ENROLL_CONFIRM, student, email)
+        )
+    await session.execute(insert(Notification), rows)
+
+
+async def enqueue_new_charge_emails(
+    session: AsyncSession, charges: Sequence[Charge]
+) -> None:
+    """Queue new charge emails in the caller's transaction."""
+    if not charges:
+        return
+    students = await _students_by_id(
+        session, [charge.student_id for charge in charges]
+    )
+    rows = [
+        _notification_row(
+            NotificationType.NEW_CHARGE,
+            students[charge.student_id],
+            build_new_charge_email(students[charge.student_id], charge),
+        )
+        for charge in charges
+    ]
+    await session.execute(insert(Notification), rows)
+
+
+async def enqueue_overdue_reminders(
+    session: AsyncSession, today: date | None = None
+) -> int:
+    """Queue one reminder for every charge that became overdue.
+
+    Open and partly paid charges that fell due within the last
+    `PAYMENT_OVERDUE_LOOKBACK_DAYS` are found with one query over the
+    `(status, due_date)` index, skipping charges that were already
+    reminded about, and their reminders are inserted in bulk. The
+    unique index on the reminder's charge keeps concurrent scans from
+    queueing a charge twice. Returns the number of reminders queued.
+    """
+    today = today or date.today()
+    earliest_due = today - timedelta(
+        days=settings.PAYMENT_OVERDUE_LOOKBACK_DAYS
+    )
+    reminded = select(Notification.id).where(
+        Notification.type == NotificationType.PAYMENT_OVERDUE,
+        Notification.charge_id == Charge.id,
+    )
+    remaining = Charge.amount_due - func.coalesce(
+        func.sum(PaymentAllocation.amount_allocated), ZERO
+    )
+    result = await session.execute(
+        select(Charge, User, remaining)
+        .join(User, User.id == Charge.student_id)
+        .outerjoin(PaymentAllocation, PaymentAllocation.charge_id == Charge.id)
+        .where(
+            Charge.status.in_([ChargeStatus.OPEN, ChargeStatus.PARTIAL]),
+            Charge.due_date < today,
+            Charge.due_date >= earliest_due,
+            User.is_active.is_(True),
+            ~reminded.exists(),
+        )
+        .group_by(Charge.id, User.id)
+        .having(remaining > ZERO)
+        .order_by(Charge.id)
+    )
+    rows = [
+        {
+            **_notification_row(
+                NotificationType.PAYMENT_OVERDUE,
+                student,
+                build_payment_overdue_email(student, charge, amount_remaining),
+            ),
+            "charge_id": charge.id,
+        }
+        for charge, student, amount_remaining in result.all()
+    ]
+    if not rows:
+        return 0
+    queued = await session.scalars(
+        pg_insert(Notification)
+        .on_conflict_do_nothing(
+            index_elements=[Notification.charge_id],
+            index_where=text("type = 'PAYMENT_OVERDUE'"),
+        )
+        .returning(Notification.id),
+        rows,
+    )
+    return len(queued.all())
+
+
+async def scan_overdue_charges(session: AsyncSession) -> int:
+    """Queue reminders for newly overdue charges and commit them."""
+    queued = await enqueue_overdue_reminders(session)
+    await session.commit()
+    if queued:
+        logger.info("Queued %d overdue payment reminders", queued)
+    return queued
+
+
+def _render_one(
+    notification_type: NotificationType, body: dict
+) -> str | Exception:
+    try:
+        return render_template(NOTIFICATION_TEMPLATES[notification_type], body)
+    except Exception as exc:
+        return exc
+
+
+def _render_batch(
+    messages: Sequence[tuple[NotificationType, dict]],
+) -> list[str | Exception]:
+    # Each template renders all of its bodies in one go. If that fails, the
+    # bodies are rendered one by one, so only the broken ones fail.
+    indexes_by_type = defaultdict(list)
+    for index, (notification_type, _) in enumerate(messages):
+        indexes_by_type[notification_type].append(index)
+    rendered: list[str | Exception] = [""] * len(messages)
+    for notification_type, indexes in indexes_by_type.items():
+        bodies = [messages[index][1] for index in indexes]
+        try:
+            html = render_bodies(
+                NOTIFICATION_TEMPLATES[notification_type], bodies
+            )
+        except Exception:
+            html = [_render_one(notification_type, body) for body in bodies]
+        for index, item in zip(indexes, html):
+            rendered[index] = item
+    return rendered
+
+
+async def _deliver(
+    notification: Notification, name: str, html: str | Exception
+) -> None:
+    if isinstance(html, Exception):
+        raise html
+    await send_html(
+        EmailSchema(
+            subject=notification.subject or "",
+            email=[
+                NameEmail(
+                    email=notification.email_to,
+                    name=name or notification.email_to,
+                )
+            ],
+            body=notification.body or {},
+        ),
+        html,
+    )
+
+
+def _record_failure(notification: Notification, exc: BaseException) -> None:
+    notification.attempts += 1
+    notification.error = str(exc)
+    if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = NotificationStatus.FAILED
+        return
+    delay = settings.NOTIFICATION_RETRY_BACKOFF_SECONDS * 2 ** (
+        notification.attempts - 1
+    )
+    notification.scheduled_for = datetime.now(timezone.utc) + timedelta(
+        seconds=delay
+    )
+
+
+async def _send_batch(session: AsyncSession, batch_size: int) -> int:
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        select(Notification, User.first_name, User.last_name)
+        .outerjoin(User, User.id == Notification.recipient_user_id)
+        .where(
+            Notification.status == NotificationStatus.PENDING,
+            or_(
+                Notification.scheduled_for.is_(None),
+                Notification.scheduled_for <= now,
+            ),
+        )
+        .order_by(Notification.id)
+        .limit(batch_size)
+        .with_for_update(of=Notification, skip_locked=True)
+    )
+    rows = result.all()
+    rendered = await run_in_threadpool(
+        _render_batch,
+        [
+            (notification.type, notification.body or {})
+            for notification, _, _ in rows
+        ],
+    )
+    outcomes = await asyncio.gather(
+        *(
+            _deliver(
+                notification,
+                f"{first_name or ''} {last_name or ''}".strip(),
+                html,
+            )
+            for (notification, first_name, last_name), html in zip(
+                rows, rendered
+            )
+        ),
+        return_exceptions=True,
+    )
+    for (notification, _, _), outcome in zip(rows, outcomes):
+        if isinstance(outcome, BaseException):
+            _record_failure(notification, outcome)
+        else:
+            notification.status = NotificationStatus.SENT
+            notification.sent_at = datetime.now(timezone.utc)
+            notification.error = None
+    await session.commit()
+    return len(rows)
+
+
+async def send_pending_notifications(
+    session: AsyncSession, batch_size: int | None = None
+) -> int:
+    """Drain the outbox of notifications that are due.
+
+    Each batch is rendered in a worker thread, one template at a time, then
+    sent concurrently over the pooled SMTP connections and committed on its
+    own. Failed sends are retried with exponential backoff
+    until `NOTIFICATION_MAX_ATTEMPTS`. Rows being sent by another process
+    are skipped. Returns the number of notifications handled.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    handled = 0
+    while True:
+        sent = await _send_batch(session, batch_size)
+        handled += sent
+        if sent < batch_size:
+            return handled
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.schedule import ClassGroup
+from app.services.common.notifications import (
+    enqueue_enrollment_confirmations,
+)
+
+
+async def fill_free_seats(
+    session: AsyncSession, class_group_id: int
+) -> list[Enrollment]:
+    """Promote waitlisted students, oldest first, into every free seat.
+
+    Runs in the caller's transaction and leaves the commit to it, so a
+    cancellation and the promotions it allows are committed together.
+    Confirmation emails are queued as notifications.
+    """
+    # The caller's changes are flushed first, so the counter triggers have
+    # updated the group before it is re-read. The group row lock serializes
+    # promotions and enrollments of one group.
+    await session.flush()
+    class_group = await session.scalar(
+        select(ClassGroup)
+        .where(ClassGroup.id == class_group_id)
+        .with_for_update(key_share=True)
+        .execution_options(populate_existing=True)
+    )
+    if class_group is None:
+        return []
+    free_seats = class_group.capacity - class_group.enrolled_count
+    if free_seats <= 0:
+        return []
+
+    # Students leaving the waitlist right now hold their row, skip them.
+    promoted = list(
+        await session.scalars(
+            select(Enrollment)
+            .where(
+                Enrollment.class_group_id == class_group_id,
+                Enrollment.status == EnrollmentStatus.WAITLISTED,
+            )
+            .order_by(Enrollment.joined_at, Enrollment.id)
+            .limit(free_seats)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    for enrollment in promoted:
+        enrollment.status = EnrollmentStatus.ACTIVE
+        enrollment.cancelled_at = None
+    await session.flush()
+    await enqueue_enrollment_confirmations(session, class_group, promoted)
+    return promoted
@@ -3,7 +3,18 @@ from __future__ import annotations
 from datetime import datetime, timezone
 import uuid
 
-from sqlalchemy import and_, select
+from sqlalchemy import (
+    Boolean,
+    String,
+    and_,
+    cast,
+    column,
+    func,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.attendance import Attendance, AttendanceStatus
@@ -63,66 +74,80 @@ async def upsert_attendance_bulk(
 ) -> list[Attendance]:
     if not items:
         return []
-    student_ids = {item.student_id for item in items}
-    regular_ids = {item.student_id for item in items if not item.is_makeup}
-    makeup_ids = student_ids - regular_ids
-    if regular_ids:
-        enrollment_result = await session.execute(
-            select(Enrollment).where(
-                Enrollment.class_group_id == class_session.class_group_id,
-                Enrollment.student_id.in_(regular_ids),
-                Enrollment.status == EnrollmentStatus.ACTIVE,
-            )
+    # The last entry for a student wins, as ON CONFLICT may touch a row
+    # only once per statement.
+    latest = list({item.student_id: item for item in items}.values())
+    marked = (
+        func.unnest(
+            literal(
+                [item.student_id for item in latest],
+                ARRAY(UUID(as_uuid=True)),
+            ),
+            literal([item.status.value for item in latest], ARRAY(String)),
+            literal([item.is_makeup for item in latest], ARRAY(Boolean)),
         )
-        enrollments = {item.student_id for item in enrollment_result.scalars()}
-        missing = regular_ids - enrollments
-        if missing:
-            raise ValueError("Some students are not enrolled in this group.")
-    if makeup_ids:
-        enrollment_result = await session.execute(
-            select(Enrollment).where(
-                Enrollment.student_id.in_(makeup_ids),
-                Enrollment.status == EnrollmentStatus.ACTIVE,
-            )
+        .table_valued(
+            column("student_id", UUID(as_uuid=True)),
+            column("status", String()),
+            column("is_makeup", Boolean()),
         )
-        enrollments = {item.student_id for item in enrollment_result.scalars()}
-        missing = makeup_ids - enrollments
-        if missing:
-            raise ValueError("Some students are not enrolled in any group.")
-
-    attendance_result = await session.execute(
-        select(Attendance).where(
-            Attendance.class_session_id == class_session.id,
-            Attendance.student_id.in_(student_ids),
+        .render_derived(name="marked")
+    )
+    # Regular students need an active enrollment in the session's group,
+    # make-up students one in any group.
+    enrolled = (
+        select(Enrollment.id)
+        .where(
+            Enrollment.student_id == marked.c.student_id,
+            Enrollment.status == EnrollmentStatus.ACTIVE,
+            or_(
+                marked.c.is_makeup,
+                Enrollment.class_group_id == class_session.class_group_id,
+            ),
         )
+        .exists()
     )
-    existing = {
-        item.student_id: item for item in attendance_result.scalars().all()
-    }
-    now = datetime.now(timezone.utc)
-    saved: list[Attendance] = []
-    for item in items:
-        attendance = existing.get(item.student_id)
-        if attendance:
-            attendance.status = item.status
-            attendance.is_makeup = item.is_makeup
-            attendance.marked_by = marked_by
-            attendance.marked_at = now
-        else:
-            attendance = Attendance(
-                class_session_id=class_session.id,
-                student_id=item.student_id,
-                status=item.status,
-                is_makeup=item.is_makeup,
-                marked_by=marked_by,
-                marked_at=now,
-            )
-            session.add(attendance)
-        saved.append(attendance)
+    statement = insert(Attendance).from_select(
+        [
+            "class_session_id",
+            "student_id",
+            "status",
+            "is_makeup",
+            "marked_by",
+            "marked_at",
+        ],
+        select(
+            literal(class_session.id),
+            marked.c.student_id,
+            cast(marked.c.status, Attendance.__table__.c.status.type),
+            marked.c.is_makeup,
+            literal(marked_by, UUID(as_uuid=True)),
+            func.now(),
+        ).where(enrolled),
+    )
+    statement = statement.on_conflict_do_update(
+        constraint="uq_attendance_session_student",
+        set_={
+            "status": statement.excluded.status,
+            "is_makeup": statement.excluded.is_makeup,
+            "marked_by": statement.excluded.marked_by,
+            "marked_at": statement.excluded.marked_at,
+        },
+    )
+    result = await session.scalars(
+        statement.returning(Attendance),
+        execution_options={"populate_existing": True},
+    )
+    saved = {attendance.student_id: attendance for attendance in result}
+
+    missing = [item for item in latest if item.student_id not in saved]
+    if missing:
+        await session.rollback()
+        if any(not item.is_makeup for item in missing):
+            raise ValueError("Some students are not enrolled in this group.")
+        raise ValueError("Some students are not enrolled in any group.")
     await session.commit()
-    for attendance in saved:
-        await session.refresh(attendance)
-    return saved
+    return [saved[item.student_id] for item in items]
 
 
 async def upsert_attendance_single(
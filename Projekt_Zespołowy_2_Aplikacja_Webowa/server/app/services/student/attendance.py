@@ -6,7 +6,11 @@ import uuid
 from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance import (
+    Attendance,
+    AttendanceRollup,
+    AttendanceStatus,
+)
 from app.models.schedule import ClassGroup, ClassSession
 
 
@@ -62,6 +66,55 @@ async def list_student_attendance(
     return items
 
 
+def summary_payload(
+    present_count: int | None,
+    absent_count: int | None,
+    excused_count: int | None,
+    makeup_count: int | None,
+) -> dict:
+    present_count = int(present_count or 0)
+    absent_count = int(absent_count or 0)
+    excused_count = int(excused_count or 0)
+    total_count = present_count + absent_count + excused_count
+    return {
+        "total_count": total_count,
+        "present_count": present_count,
+        "absent_count": absent_count,
+        "excused_count": excused_count,
+        "makeup_count": int(makeup_count or 0),
+        "attendance_rate": (
+            present_count / total_count if total_count > 0 else None
+        ),
+    }
+
+
+async def _summarize_from_rollup(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+    semester_id: int | None,
+    class_group_id: int | None,
+) -> dict:
+    query = select(
+        func.sum(AttendanceRollup.present_count).label("present_count"),
+        func.sum(AttendanceRollup.absent_count).label("absent_count"),
+        func.sum(AttendanceRollup.excused_count).label("excused_count"),
+        func.sum(AttendanceRollup.makeup_count).label("makeup_count"),
+    ).where(AttendanceRollup.student_id == student_id)
+    if semester_id is not None:
+        query = query.join(
+            ClassGroup, AttendanceRollup.class_group_id == ClassGroup.id
+        ).where(ClassGroup.semester_id == semester_id)
+    if class_group_id is not None:
+        query = query.where(AttendanceRollup.class_group_id == class_group_id)
+    row = (await session.execute(query)).one()
+    return summary_payload(
+        row.present_count,
+        row.absent_count,
+        row.excused_count,
+        row.makeup_count,
+    )
+
+
 async def summarize_student_attendance(
     session: AsyncSession,
     student_id: uuid.UUID,
@@ -72,9 +125,14 @@ async def summarize_student_attendance(
     status: AttendanceStatus | None = None,
     is_makeup: bool | None = None,
 ) -> dict:
+    # The rollup only holds totals per group, narrower filters scan the
+    # attendance history.
+    if (from_date, to_date, status, is_makeup) == (None, None, None, None):
+        return await _summarize_from_rollup(
+            session, student_id, semester_id, class_group_id
+        )
     query = (
         select(
-            func.count(Attendance.id).label("total_count"),
             func.sum(
                 case(
                     (Attendance.status == AttendanceStatus.PRESENT, 1),
@@ -115,17 +173,9 @@ async def summarize_student_attendance(
         query = query.where(Attendance.is_makeup.is_(is_makeup))
     result = await session.execute(query)
     row = result.one()
-    total_count = int(row.total_count or 0)
-    present_count = int(row.present_count or 0)
-    absent_count = int(row.absent_count or 0)
-    excused_count = int(row.excused_count or 0)
-    makeup_count = int(row.makeup_count or 0)
-    attendance_rate = present_count / total_count if total_count > 0 else None
-    return {
-        "total_count": total_count,
-        "present_count": present_count,
-        "absent_count": absent_count,
-        "excused_count": excused_count,
-        "makeup_count": makeup_count,
-        "attendance_rate": attendance_rate,
-    }
+    return summary_payload(
+        row.present_count,
+        row.absent_count,
+        row.excused_count,
+        row.makeup_count,
+    )
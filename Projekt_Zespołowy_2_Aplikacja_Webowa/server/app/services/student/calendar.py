@@ -3,11 +3,19 @@ from __future__ import annotations
 from datetime import date
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.calendar_change import CalendarChange
 from app.models.enrollment import Enrollment, EnrollmentStatus
-from app.models.schedule import ClassGroup, ClassSession
+from app.services.common.calendar import (
+    calendar_query,
+    fetch_calendar_entries,
+)
+from app.services.common.calendar_feed import (
+    CalendarFeed,
+    build_calendar_feed,
+)
 
 
 async def list_calendar_entries(
@@ -16,40 +24,38 @@ async def list_calendar_entries(
     from_date: date | None = None,
     to_date: date | None = None,
     room_id: int | None = None,
+    topic_id: int | None = None,
+    level_id: int | None = None,
 ) -> list[dict]:
-    query = (
-        select(ClassSession, ClassGroup)
-        .join(ClassGroup, ClassSession.class_group_id == ClassGroup.id)
-        .join(Enrollment, Enrollment.class_group_id == ClassGroup.id)
-        .where(
-            Enrollment.student_id == student_id,
-            Enrollment.status == EnrollmentStatus.ACTIVE,
-        )
-        .order_by(ClassSession.date, ClassSession.start_time)
+    return await fetch_calendar_entries(
+        session,
+        calendar_query(
+            from_date=from_date,
+            to_date=to_date,
+            room_id=room_id,
+            student_id=student_id,
+            topic_id=topic_id,
+            level_id=level_id,
+        ),
     )
-    if from_date is not None:
-        query = query.where(ClassSession.date >= from_date)
-    if to_date is not None:
-        query = query.where(ClassSession.date <= to_date)
-    if room_id is not None:
-        query = query.where(ClassSession.room_id == room_id)
 
-    result = await session.execute(query)
-    entries = []
-    for class_session, class_group in result.all():
-        entries.append(
-            {
-                "class_session_id": class_session.id,
-                "class_group_id": class_group.id,
-                "class_group_name": class_group.name,
-                "date": class_session.date,
-                "start_time": class_session.start_time,
-                "end_time": class_session.end_time,
-                "status": class_session.status,
-                "room_id": class_session.room_id,
-                "instructor_id": class_session.instructor_id,
-                "topic_id": class_group.topic_id,
-                "level_id": class_group.level_id,
-            }
-        )
-    return entries
+
+async def get_calendar_feed(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+    since: int | None = None,
+) -> CalendarFeed:
+    active_groups = select(Enrollment.class_group_id).where(
+        Enrollment.student_id == student_id,
+        Enrollment.status == EnrollmentStatus.ACTIVE,
+    )
+    relevant = or_(
+        CalendarChange.student_id == student_id,
+        and_(
+            CalendarChange.student_id.is_(None),
+            CalendarChange.class_group_id.in_(active_groups),
+        ),
+    )
+    return await build_calendar_feed(
+        session, calendar_query(student_id=student_id), relevant, since
+    )
@@ -2,10 +2,9 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Select, case, func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.schedule import (
     ClassGroup,
     ClassGroupStatus,
@@ -31,17 +30,14 @@ def _apply_class_group_filters(
 
 
 def _availability_payload(
-    class_group: ClassGroup,
-    enrolled_count: int,
-    waitlist_count: int,
-    next_session_at: datetime | None,
+    class_group: ClassGroup, next_session_at: datetime | None
 ) -> dict:
-    available_spots = max(class_group.capacity - enrolled_count, 0)
+    available_spots = max(class_group.capacity - class_group.enrolled_count, 0)
     is_full = available_spots <= 0
     return {
-        "enrolled_count": enrolled_count,
+        "enrolled_count": class_group.enrolled_count,
         "available_spots": available_spots,
-        "waitlist_count": waitlist_count,
+        "waitlist_count": class_group.waitlist_count,
         "is_full": is_full,
         "can_join_waitlist": is_full,
         "next_session_at": next_session_at,
@@ -51,53 +47,20 @@ def _availability_payload(
 async def get_class_group_availability(
     session: AsyncSession, class_group_id: int
 ) -> dict | None:
-    counts_subq = (
-        select(
-            Enrollment.class_group_id.label("class_group_id"),
-            func.sum(
-                case(
-                    (Enrollment.status == EnrollmentStatus.ACTIVE, 1),
-                    else_=0,
-                )
-            ).label("enrolled_count"),
-            func.sum(
-                case(
-                    (Enrollment.status == EnrollmentStatus.WAITLISTED, 1),
-                    else_=0,
-                )
-            ).label("waitlist_count"),
-        )
-        .where(Enrollment.class_group_id == class_group_id)
-        .group_by(Enrollment.class_group_id)
-        .subquery()
-    )
-
-    result = await session.execute(
-        select(
-            ClassGroup,
-            counts_subq.c.enrolled_count,
-            counts_subq.c.waitlist_count,
-        )
-        .outerjoin(counts_subq, counts_subq.c.class_group_id == ClassGroup.id)
-        .where(ClassGroup.id == class_group_id)
-    )
-    row = result.first()
-    if not row:
+    class_group = await session.get(ClassGroup, class_group_id)
+    if not class_group:
         return None
-    class_group, enrolled_count, waitlist_count = row
     if (
         not class_group.is_public
         or class_group.status != ClassGroupStatus.OPEN
     ):
         return None
-    enrolled_count = int(enrolled_count or 0)
-    waitlist_count = int(waitlist_count or 0)
-    available_spots = max(class_group.capacity - enrolled_count, 0)
+    available_spots = max(class_group.capacity - class_group.enrolled_count, 0)
     return {
         "capacity": class_group.capacity,
-        "enrolled_count": enrolled_count,
+        "enrolled_count": class_group.enrolled_count,
         "available_spots": available_spots,
-        "waitlist_count": waitlist_count,
+        "waitlist_count": class_group.waitlist_count,
         "is_full": available_spots <= 0,
         "can_join_waitlist": available_spots <= 0,
     }
@@ -114,45 +77,19 @@ async def list_class_groups(
     offset: int = 0,
     sort: str | None = None,
 ) -> list[ClassGroupWithAvailability]:
-    counts_subq = (
-        select(
-            Enrollment.class_group_id.label("class_group_id"),
-            func.sum(
-                case(
-                    (Enrollment.status == EnrollmentStatus.ACTIVE, 1),
-                    else_=0,
-                )
-            ).label("enrolled_count"),
-            func.sum(
-                case(
-                    (Enrollment.status == EnrollmentStatus.WAITLISTED, 1),
-                    else_=0,
-                )
-            ).label("waitlist_count"),
-        )
-        .group_by(Enrollment.class_group_id)
-        .subquery()
-    )
-
-    query = (
-        select(
-            ClassGroup,
-            counts_subq.c.enrolled_count,
-            counts_subq.c.waitlist_count,
-        )
-        .outerjoin(counts_subq, counts_subq.c.class_group_id == ClassGroup.id)
-        .where(
-            ClassGroup.is_public.is_(True),
-            ClassGroup.status == ClassGroupStatus.OPEN,
-        )
+    query = select(ClassGroup).where(
+        ClassGroup.is_public.is_(True),
+        ClassGroup.status == ClassGroupStatus.OPEN,
     )
+    if only_available and not include_waitlist:
+        query = query.where(ClassGroup.enrolled_count < ClassGroup.capacity)
     query = _apply_class_group_filters(
         query, semester_id, skill_level_id, topic_id
     )
     result = await session.execute(query)
-    rows = result.all()
+    class_groups = result.scalars().all()
 
-    class_group_ids = [row[0].id for row in rows]
+    class_group_ids = [class_group.id for class_group in class_groups]
     next_session_map: dict[int, datetime] = {}
     if class_group_ids:
         sessions_result = await session.execute(
@@ -174,21 +111,15 @@ async def list_class_groups(
                 )
 
     items: list[ClassGroupWithAvailability] = []
-    for class_group, enrolled_count, waitlist_count in rows:
-        enrolled_count = int(enrolled_count or 0)
-        waitlist_count = int(waitlist_count or 0)
+    for class_group in class_groups:
         next_session_at = next_session_map.get(class_group.id)
-        payload = _availability_payload(
-            class_group, enrolled_count, waitlist_count, next_session_at
-        )
+        payload = _availability_payload(class_group, next_session_at)
         base = ClassGroupRead.model_validate(class_group)
-        item = ClassGroupWithAvailability.model_validate(
-            {**base.model_dump(), **payload}
+        items.append(
+            ClassGroupWithAvailability.model_validate(
+                {**base.model_dump(), **payload}
+            )
         )
-        if only_available and item.available_spots <= 0:
-            if not include_waitlist:
-                continue
-        items.append(item)
 
     if sort == "availability":
         items.sort(key=lambda item: item.available_spots, reverse=True)
@@ -7,10 +7,13 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.email.send_email import send_enrollment_confirmation_email
 from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.schedule import ClassGroup, ClassGroupStatus
 from app.models.user import User
+from app.services.common.notifications import (
+    enqueue_enrollment_confirmations,
+)
+from app.services.common.waitlist import fill_free_seats
 from app.services.student import class_group as class_group_service
 
 
@@ -48,7 +51,15 @@ async def create_student_enrollment(
     student = await session.get(User, student_id)
     if not student:
         raise LookupError("Student not found.")
-    class_group = await session.get(ClassGroup, class_group_id)
+    # Enrollments into the same group wait for each other on its row, so
+    # each one counts the seats taken by the previous ones. NO KEY UPDATE
+    # does not block foreign key checks against the group.
+    class_group = await session.scalar(
+        select(ClassGroup)
+        .where(ClassGroup.id == class_group_id)
+        .with_for_update(key_share=True)
+        .execution_options(populate_existing=True)
+    )
     if not class_group:
         raise LookupError("Class group not found.")
     if (
@@ -76,22 +87,24 @@ async def create_student_enrollment(
     )
     session.add(enrollment)
     try:
-        await session.commit()
+        await session.flush()
     except IntegrityError as exc:
         await session.rollback()
         raise ValueError("Enrollment already exists.") from exc
+    await enqueue_enrollment_confirmations(session, class_group, [enrollment])
+    await session.commit()
     await session.refresh(enrollment)
-    await send_enrollment_confirmation_email(
-        user=student, class_group=class_group, status=enrollment.status
-    )
     return enrollment, availability
 
 
 async def cancel_enrollment(
     session: AsyncSession, enrollment: Enrollment
 ) -> Enrollment:
+    frees_seat = enrollment.status == EnrollmentStatus.ACTIVE
     enrollment.status = EnrollmentStatus.CANCELLED
     enrollment.cancelled_at = datetime.now(timezone.utc)
+    if frees_seat:
+        await fill_free_seats(session, enrollment.class_group_id)
     await session.commit()
     await session.refresh(enrollment)
     return enrollment
@@ -114,8 +127,4 @@ async def update_self_enrollment(
 ) -> Enrollment:
     if status != EnrollmentStatus.CANCELLED:
         raise ValueError("Only cancellation is allowed.")
-    enrollment.status = EnrollmentStatus.CANCELLED
-    enrollment.cancelled_at = datetime.now(timezone.utc)
-    await session.commit()
-    await session.refresh(enrollment)
-    return enrollment
+    return await cancel_enrollment(session, enrollment)
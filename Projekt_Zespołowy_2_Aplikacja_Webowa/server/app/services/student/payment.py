@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
-from decimal import Decimal
+from datetime import date
 import uuid
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.payment import Charge, ChargeStatus, ChargeType, Payment
-from app.models.payment import PaymentAllocation
+from app.services.common import billing as billing_service
 
 
 async def list_student_charges(
@@ -64,55 +63,15 @@ async def get_student_payment(
     return await session.get(Payment, payment_id)
 
 
-async def _allocation_totals(
-    session: AsyncSession, charge_ids: list[int]
-) -> dict[int, Decimal]:
-    if not charge_ids:
-        return {}
-    result = await session.execute(
-        select(
-            PaymentAllocation.charge_id,
-            func.coalesce(
-                func.sum(PaymentAllocation.amount_allocated), Decimal("0")
-            ).label("allocated"),
-        )
-        .where(PaymentAllocation.charge_id.in_(charge_ids))
-        .group_by(PaymentAllocation.charge_id)
-    )
-    return {row.charge_id: row.allocated for row in result.all()}
-
-
 async def summarize_student_billing(
     session: AsyncSession,
     student_id: uuid.UUID,
     full_name: str | None = None,
 ) -> dict:
-    result = await session.execute(
-        select(Charge)
-        .where(
-            Charge.student_id == student_id,
-            Charge.status.in_([ChargeStatus.OPEN, ChargeStatus.PARTIAL]),
-        )
-        .order_by(Charge.due_date)
-    )
-    open_charges = list(result.scalars().all())
-    charge_ids = [charge.id for charge in open_charges]
-    allocated_map = await _allocation_totals(session, charge_ids)
     today = date.today()
-    month_start = today.replace(day=1)
-    next_month = (month_start + timedelta(days=32)).replace(day=1)
-    month_end = next_month - timedelta(days=1)
-    current_month_due = Decimal("0")
-    total_overdue = Decimal("0")
-    for charge in open_charges:
-        allocated = allocated_map.get(charge.id, Decimal("0"))
-        remaining = charge.amount_due - allocated
-        if remaining < Decimal("0"):
-            remaining = Decimal("0")
-        if month_start <= charge.due_date <= month_end:
-            current_month_due += remaining
-        if charge.due_date < today:
-            total_overdue += remaining
+    summary = await billing_service.summarize_open_charges(
+        session, student_id, today
+    )
     last_payment_result = await session.execute(
         select(func.max(Payment.paid_at)).where(Payment.user_id == student_id)
     )
@@ -121,9 +80,9 @@ async def summarize_student_billing(
     if full_name:
         transfer_title = f"{full_name} - {today:%Y-%m}"
     return {
-        "current_month_due": current_month_due,
-        "total_overdue": total_overdue,
-        "open_charges": open_charges,
+        "current_month_due": summary["current_month_due"],
+        "total_overdue": summary["total_overdue"],
+        "open_charges": summary["open_charges"],
         "last_payment_at": last_payment_at,
         "recommended_transfer_title": transfer_title,
     }
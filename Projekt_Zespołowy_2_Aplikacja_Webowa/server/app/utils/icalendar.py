@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from fastapi import Response
+
+ICALENDAR_MEDIA_TYPE = "text/calendar; charset=utf-8"
+SYNC_TOKEN_HEADER = "X-Sync-Token"
+SYNC_FULL_HEADER = "X-Sync-Full"
+PRODUCT_ID = "-//TipTap//Calendar//PL"
+MAX_LINE_OCTETS = 75
+
+
+@dataclass(frozen=True)
+class CalendarEvent:
+    uid: str
+    start: datetime
+    end: datetime
+    summary: str | None = None
+    cancelled: bool = False
+    location: str | None = None
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Split a content line into chunks of at most 75 octets (RFC 5545)."""
+    chunks: list[str] = []
+    current = ""
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        octets = len(char.encode())
+        if size + octets > limit:
+            chunks.append(current)
+            current, size = "", 0
+            # Continuation lines start with a space, which counts too.
+            limit = MAX_LINE_OCTETS - 1
+        current += char
+        size += octets
+    chunks.append(current)
+    return "\r\n ".join(chunks)
+
+
+def _format_datetime(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+        return value.strftime("%Y%m%dT%H%M%SZ")
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _event_lines(event: CalendarEvent, stamp: str) -> list[str]:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.uid}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{_format_datetime(event.start)}",
+        f"DTEND:{_format_datetime(event.end)}",
+        f"STATUS:{'CANCELLED' if event.cancelled else 'CONFIRMED'}",
+    ]
+    if event.summary:
+        lines.append(f"SUMMARY:{escape_text(event.summary)}")
+    if event.location:
+        lines.append(f"LOCATION:{escape_text(event.location)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_calendar(
+    events: Iterable[CalendarEvent],
+    name: str,
+    sync_token: int | None = None,
+) -> str:
+    stamp = _format_datetime(datetime.now(timezone.utc))
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    if sync_token is not None:
+        lines.append(f"X-TIPTAP-SYNC-TOKEN:{sync_token}")
+    for event in events:
+        lines.extend(_event_lines(event, stamp))
+    lines.append("END:VCALENDAR")
+    return "".join(fold_line(line) + "\r\n" for line in lines)
+
+
+def ics_response(
+    events: Iterable[CalendarEvent],
+    name: str,
+    sync_token: int,
+    full: bool = False,
+) -> Response:
+    """A calendar response; `full` marks a whole calendar, not a delta."""
+    headers = {SYNC_TOKEN_HEADER: str(sync_token)}
+    if full:
+        headers[SYNC_FULL_HEADER] = "true"
+    return Response(
+        content=render_calendar(events, name, sync_token),
+        media_type=ICALENDAR_MEDIA_TYPE,
+        headers=headers,
+    )
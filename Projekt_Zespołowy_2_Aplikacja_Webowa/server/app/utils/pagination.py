@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Sequence
+from dataclasses import dataclass
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Ordering key used for cursor pagination.
+
+    The columns must form a unique key (end with the primary key) so that
+    `(columns) > (last seen values)` never skips or repeats rows.
+    """
+
+    columns: tuple[Any, ...]
+    descending: bool = False
+
+    def encode(self, values: Sequence[Any]) -> str:
+        raw = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> tuple[Any, ...]:
+        types = tuple(column.type.python_type for column in self.columns)
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = json.loads(base64.urlsafe_b64decode(padded))
+            return TypeAdapter(tuple[types]).validate_python(raw)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor.") from exc
+
+    def apply(self, query: Select, cursor: str | None = None) -> Select:
+        if cursor is not None:
+            key = tuple_(*self.columns)
+            after = tuple_(*self.decode(cursor))
+            query = query.where(
+                key < after if self.descending else key > after
+            )
+        if self.descending:
+            return query.order_by(*(column.desc() for column in self.columns))
+        return query.order_by(*self.columns)
+
+    async def fetch_page(
+        self,
+        session: AsyncSession,
+        query: Select,
+        cursor: str | None,
+        limit: int | None,
+    ) -> tuple[list[Any], str | None]:
+        query = self.apply(query, cursor)
+        if limit is None:
+            result = await session.execute(query)
+            return list(result.scalars().all()), None
+        query = query.add_columns(*self.columns)
+        rows = (await session.execute(query.limit(limit + 1))).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode(tuple(rows[-1])[1:])
+        return [row[0] for row in rows], next_cursor
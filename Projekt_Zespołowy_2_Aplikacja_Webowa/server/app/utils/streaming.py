@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+async def _ndjson_lines(
+    session: AsyncSession,
+    query: Select,
+    schema: type[BaseModel],
+    batch_size: int,
+) -> AsyncIterator[str]:
+    result = await session.stream_scalars(
+        query.execution_options(yield_per=batch_size)
+    )
+    try:
+        async for partition in result.partitions():
+            yield "".join(
+                schema.model_validate(item).model_dump_json(by_alias=True)
+                + "\n"
+                for item in partition
+            )
+            session.expunge_all()
+    finally:
+        await result.close()
+
+
+def ndjson_response(
+    session: AsyncSession,
+    query: Select,
+    schema: type[BaseModel],
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> StreamingResponse:
+    """Stream `query` as newline-delimited JSON from a server-side cursor.
+
+    The session must stay open until the response is sent, which holds for
+    sessions provided by `get_async_session`.
+    """
+    return StreamingResponse(
+        _ndjson_lines(session, query, schema, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
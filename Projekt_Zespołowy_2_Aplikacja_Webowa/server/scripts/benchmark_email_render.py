@@ -0,0 +1,111 @@
+"""Measure the per-message cost of rendering email templates.
+
+Renders the same personalized bodies a billing run would queue, with the
+template parsed for every message, looked up with reload checks, and
+precompiled into the shared environment:
+
+    uv run python -m scripts.benchmark_email_render --messages 2000
+
+No database or SMTP server is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time as clock
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from app.email.rendering import (
+    TEMPLATE_FOLDER,
+    precompile_templates,
+    render_bodies,
+    render_template,
+)
+from app.email.send_email import NEW_CHARGE_TEMPLATE
+
+
+def reload_environment() -> Environment:
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER),
+        autoescape=select_autoescape(["html"]),
+    )
+
+
+def bodies(count: int) -> list[dict]:
+    return [
+        {
+            "first_name": f"Student {index}",
+            "amount_due": f"{100 + index % 50},00 zł",
+            "due_date": "10.11.2026",
+            "charge_type": "Opłata miesięczna",
+            "charge_id": index,
+            "billing_link": "http://localhost/billing",
+        }
+        for index in range(count)
+    ]
+
+
+# Every variant keeps what it rendered, as a mailing has to send it on.
+def parse_each(items: list[dict]) -> list[str]:
+    """A fresh environment per message, so every render parses."""
+    return [
+        reload_environment().get_template(NEW_CHARGE_TEMPLATE).render(body)
+        for body in items
+    ]
+
+
+def lookup_each(items: list[dict]) -> list[str]:
+    """A shared environment that checks the file for changes each time."""
+    environment = reload_environment()
+    return [
+        environment.get_template(NEW_CHARGE_TEMPLATE).render(body)
+        for body in items
+    ]
+
+
+def precompiled_each(items: list[dict]) -> list[str]:
+    return [render_template(NEW_CHARGE_TEMPLATE, body) for body in items]
+
+
+def precompiled_bulk(items: list[dict]) -> list[str]:
+    return render_bodies(NEW_CHARGE_TEMPLATE, items)
+
+
+def measure(render, items: list[dict], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = clock.perf_counter()
+        render(items)
+        times.append(clock.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    started = clock.perf_counter()
+    compiled = precompile_templates()
+    startup = clock.perf_counter() - started
+    print(f"precompiled {compiled} templates in {startup * 1000:.1f} ms")
+
+    items = bodies(args.messages)
+    print(f"{args.messages} messages, median of {args.repeat} runs")
+    print(f"{'variant':<14}{'total (ms)':>12}{'per message (us)':>20}")
+    for name, render in (
+        ("parse", parse_each),
+        ("lookup", lookup_each),
+        ("precompiled", precompiled_each),
+        ("bulk", precompiled_bulk),
+    ):
+        total = measure(render, items, args.repeat)
+        per_message = total / args.messages * 1_000_000
+        print(f"{name:<14}{total * 1000:>12.1f}{per_message:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
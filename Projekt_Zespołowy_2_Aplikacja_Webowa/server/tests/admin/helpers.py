@@ -1,3 +1,5 @@
+import json
+
 from fastapi import status
 from httpx import AsyncClient
 
@@ -70,3 +72,29 @@ async def create_instructor_and_login(client: AsyncClient):
         role=UserRole.INSTRUCTOR,
     )
     await login(client, "instructor@example.com", "Instructor_Password1")
+
+
+async def fetch_all_pages(
+    client: AsyncClient, url: str, params: dict
+) -> list[dict]:
+    """Follow X-Next-Cursor until the last page, checking each page size."""
+    items: list[dict] = []
+    page_params = dict(params)
+    while True:
+        response = await client.get(url, params=page_params)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) <= params["limit"]
+        items.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return items
+        page_params["cursor"] = cursor
+
+
+async def stream_items(
+    client: AsyncClient, url: str, params: dict
+) -> list[dict]:
+    response = await client.get(url, params={**params, "stream": True})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
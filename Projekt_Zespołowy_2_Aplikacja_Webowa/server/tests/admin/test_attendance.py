@@ -5,7 +5,13 @@ from httpx import AsyncClient
 from app.core.config import get_settings
 from app.models.attendance import AttendanceStatus
 from app.models.user import UserRole
-from tests.admin.helpers import create_admin_and_login, create_verified_user
+from tests.admin.helpers import (
+    create_admin_and_login,
+    create_verified_user,
+    fetch_all_pages,
+    login,
+    stream_items,
+)
 
 settings = get_settings()
 
@@ -45,11 +51,14 @@ async def create_schedule_dependencies(client: AsyncClient) -> dict:
 
 
 async def create_class_group(
-    client: AsyncClient, deps: dict, instructor_id: str
+    client: AsyncClient,
+    deps: dict,
+    instructor_id: str,
+    name: str = "Salsa - Start",
 ) -> dict:
     payload = {
         "semesterId": deps["semester_id"],
-        "name": "Salsa - Start",
+        "name": name,
         "levelId": deps["skill_level_id"],
         "topicId": deps["topic_id"],
         "dayOfWeek": 1,
@@ -139,3 +148,238 @@ async def test_admin_can_manage_attendance(
         f"{settings.API_V1_STR}/admin/attendance/{attendance['id']}"
     )
     assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_attendance_reports_follow_attendance_writes(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="report_instructor@example.com",
+        password="Instructor_Password1",
+        first_name="Report",
+        last_name="Instructor",
+        role=UserRole.INSTRUCTOR,
+    )
+    student = await create_verified_user(
+        email="report_student@example.com",
+        password="Student_Password1",
+        first_name="Report",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    attendance_ids = []
+    for day, attendance_status in (
+        (15, AttendanceStatus.PRESENT),
+        (22, AttendanceStatus.PRESENT),
+        (29, AttendanceStatus.ABSENT),
+    ):
+        session_response = await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+            json={
+                "classGroupId": class_group["id"],
+                "date": f"2024-01-{day}",
+                "startTime": "18:00",
+                "endTime": "19:30",
+                "roomId": deps["room_id"],
+                "instructorId": str(instructor.id),
+            },
+        )
+        assert session_response.status_code == status.HTTP_201_CREATED
+        create_response = await client.post(
+            f"{settings.API_V1_STR}/admin/attendance",
+            json={
+                "classSessionId": session_response.json()["id"],
+                "studentId": str(student.id),
+                "status": attendance_status.value,
+                "isMakeup": day == 22,
+            },
+        )
+        assert create_response.status_code == status.HTTP_201_CREATED
+        attendance_ids.append(create_response.json()["id"])
+
+    patch_response = await client.patch(
+        f"{settings.API_V1_STR}/admin/attendance/{attendance_ids[2]}",
+        json={"status": AttendanceStatus.EXCUSED.value},
+    )
+    assert patch_response.status_code == status.HTTP_200_OK
+    delete_response = await client.delete(
+        f"{settings.API_V1_STR}/admin/attendance/{attendance_ids[0]}"
+    )
+    assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+
+    group_report = await client.get(
+        f"{settings.API_V1_STR}/admin/attendance/reports/class-groups/"
+        f"{class_group['id']}"
+    )
+    assert group_report.status_code == status.HTTP_200_OK
+    assert group_report.json() == [
+        {
+            "studentId": str(student.id),
+            "firstName": "Report",
+            "lastName": "Student",
+            "totalCount": 2,
+            "presentCount": 1,
+            "absentCount": 0,
+            "excusedCount": 1,
+            "makeupCount": 1,
+            "attendanceRate": 0.5,
+        }
+    ]
+
+    semester_report = await client.get(
+        f"{settings.API_V1_STR}/admin/attendance/reports/semesters/"
+        f"{deps['semester_id']}"
+    )
+    assert semester_report.status_code == status.HTTP_200_OK
+    [row] = semester_report.json()
+    assert row["classGroupId"] == class_group["id"]
+    assert row["totalCount"] == 2
+    assert row["presentCount"] == 1
+
+    await login(client, "report_student@example.com", "Student_Password1")
+    summary_response = await client.get(
+        f"{settings.API_V1_STR}/me/attendance/summary"
+    )
+    assert summary_response.status_code == status.HTTP_200_OK
+    assert summary_response.json()["totalCount"] == 2
+    assert summary_response.json()["attendanceRate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_attendance_reports_follow_session_moves(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="move_instructor@example.com",
+        password="Instructor_Password1",
+        first_name="Move",
+        last_name="Instructor",
+        role=UserRole.INSTRUCTOR,
+    )
+    student = await create_verified_user(
+        email="move_student@example.com",
+        password="Student_Password1",
+        first_name="Move",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    old_group = await create_class_group(client, deps, str(instructor.id))
+    new_group = await create_class_group(
+        client, deps, str(instructor.id), name="Salsa - Dalej"
+    )
+    session_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+        json={
+            "classGroupId": old_group["id"],
+            "date": "2024-01-15",
+            "startTime": "18:00",
+            "endTime": "19:30",
+            "roomId": deps["room_id"],
+            "instructorId": str(instructor.id),
+        },
+    )
+    assert session_response.status_code == status.HTTP_201_CREATED
+    class_session_id = session_response.json()["id"]
+    create_response = await client.post(
+        f"{settings.API_V1_STR}/admin/attendance",
+        json={
+            "classSessionId": class_session_id,
+            "studentId": str(student.id),
+            "status": AttendanceStatus.PRESENT.value,
+            "isMakeup": True,
+        },
+    )
+    assert create_response.status_code == status.HTTP_201_CREATED
+
+    move_response = await client.patch(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions/"
+        f"{class_session_id}",
+        json={"classGroupId": new_group["id"]},
+    )
+    assert move_response.status_code == status.HTTP_200_OK
+
+    reports_url = f"{settings.API_V1_STR}/admin/attendance/reports"
+    old_report = await client.get(
+        f"{reports_url}/class-groups/{old_group['id']}"
+    )
+    assert [row["totalCount"] for row in old_report.json()] == [0]
+    new_report = await client.get(
+        f"{reports_url}/class-groups/{new_group['id']}"
+    )
+    [row] = new_report.json()
+    assert row["presentCount"] == 1
+    assert row["makeupCount"] == 1
+
+    semester_report = await client.get(
+        f"{reports_url}/semesters/{deps['semester_id']}"
+    )
+    totals = {
+        row["classGroupId"]: row["totalCount"]
+        for row in semester_report.json()
+    }
+    assert totals == {old_group["id"]: 0, new_group["id"]: 1}
+
+
+@pytest.mark.asyncio
+async def test_admin_can_page_and_stream_attendance(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="page_instructor@example.com",
+        password="Instructor_Password1",
+        first_name="Page",
+        last_name="Instructor",
+        role=UserRole.INSTRUCTOR,
+    )
+    students = [
+        await create_verified_user(
+            email=f"page_student{number}@example.com",
+            password="Student_Password1",
+            first_name="Page",
+            last_name=str(number),
+            role=UserRole.STUDENT,
+        )
+        for number in range(2)
+    ]
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    keys = []
+    for session_date in ("2024-01-15", "2024-01-29", "2024-01-22"):
+        session_response = await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+            json={
+                "classGroupId": class_group["id"],
+                "date": session_date,
+                "startTime": "18:00",
+                "endTime": "19:30",
+                "roomId": deps["room_id"],
+                "instructorId": str(instructor.id),
+            },
+        )
+        assert session_response.status_code == status.HTTP_201_CREATED
+        for student in students:
+            response = await client.post(
+                f"{settings.API_V1_STR}/admin/attendance",
+                json={
+                    "classSessionId": session_response.json()["id"],
+                    "studentId": str(student.id),
+                    "status": AttendanceStatus.PRESENT.value,
+                },
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            keys.append((session_date, response.json()["id"]))
+    expected = [mark_id for _, mark_id in sorted(keys, reverse=True)]
+
+    url = f"{settings.API_V1_STR}/admin/attendance"
+    params = {"class_group_id": class_group["id"]}
+    pages = await fetch_all_pages(client, url, {**params, "limit": 4})
+    assert [item["id"] for item in pages] == expected
+    streamed = await stream_items(client, url, params)
+    assert [item["id"] for item in streamed] == expected
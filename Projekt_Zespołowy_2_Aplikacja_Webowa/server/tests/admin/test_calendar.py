@@ -125,6 +125,23 @@ async def test_admin_can_view_calendar(
     assert filtered_response.status_code == status.HTTP_200_OK
     assert len(filtered_response.json()) == 2
 
+    topic_filtered = await client.get(
+        f"{settings.API_V1_STR}/admin/schedule/calendar",
+        params={
+            "topic_id": deps["topic_id"],
+            "level_id": deps["skill_level_id"],
+        },
+    )
+    assert topic_filtered.status_code == status.HTTP_200_OK
+    assert len(topic_filtered.json()) == 2
+
+    other_topic = await client.get(
+        f"{settings.API_V1_STR}/admin/schedule/calendar",
+        params={"topic_id": deps["topic_id"] + 1},
+    )
+    assert other_topic.status_code == status.HTTP_200_OK
+    assert other_topic.json() == []
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("role", [UserRole.STUDENT, UserRole.INSTRUCTOR])
@@ -140,3 +157,27 @@ async def test_non_admin_cannot_view_calendar(
         f"{settings.API_V1_STR}/admin/schedule/calendar"
     )
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_admin_calendar_feed_requires_an_admin_feed_url(
+    client: AsyncClient,
+) -> None:
+    await create_student_and_login(client)
+    token_url = f"{settings.API_V1_STR}/users/me/calendar-token"
+    feed_url = f"{settings.API_V1_STR}/admin/schedule/calendar.ics"
+    student_token = (await client.post(token_url)).json()["token"]
+    student_feed = await client.get(feed_url, params={"token": student_token})
+    assert student_feed.status_code == status.HTTP_403_FORBIDDEN
+
+    await create_admin_and_login(client)
+    token_response = await client.post(token_url)
+    assert token_response.json()["feedUrl"].endswith(
+        f"{feed_url}?token={token_response.json()['token']}"
+    )
+    client.cookies.clear()
+    admin_feed = await client.get(
+        feed_url, params={"token": token_response.json()["token"]}
+    )
+    assert admin_feed.status_code == status.HTTP_200_OK
+    assert admin_feed.headers["content-type"].startswith("text/calendar")
@@ -1,13 +1,24 @@
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import func, select
 
 from app.core.config import get_settings
-from app.models.payment import ChargeStatus, ChargeType
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.notification import Notification, NotificationType
+from app.models.payment import ChargeStatus, ChargeType, PaymentMethod
+from app.models.schedule import ClassGroup, ClassGroupStatus
+from app.models.semester import Semester, SkillLevel, Topic
 from app.models.user import UserRole
-from tests.admin.helpers import create_admin_and_login, create_verified_user
+from app.services.common.notifications import enqueue_overdue_reminders
+from tests.admin.helpers import (
+    create_admin_and_login,
+    create_verified_user,
+    fetch_all_pages,
+    stream_items,
+)
 
 settings = get_settings()
 
@@ -79,3 +90,332 @@ async def test_admin_can_manage_charges(client: AsyncClient) -> None:
     )
     assert patch_response.status_code == status.HTTP_200_OK
     assert patch_response.json()["status"] == ChargeStatus.CANCELLED.value
+
+
+@pytest.mark.asyncio
+async def test_billing_run_charges_each_student_once_per_month(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    students = [
+        await create_verified_user(
+            email=f"billed{number}@example.com",
+            password="Student_Password1",
+            first_name="Billed",
+            last_name=str(number),
+            role=UserRole.STUDENT,
+        )
+        for number in range(3)
+    ]
+    async with db_sessionmaker() as session:
+        semester = Semester(
+            name="2024/2025 Zima",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 6, 30),
+        )
+        level = SkillLevel(name="Poczatkujacy")
+        topic = Topic(name="Salsa")
+        session.add_all([semester, level, topic])
+        await session.flush()
+        groups = [
+            ClassGroup(
+                semester_id=semester.id,
+                name=f"Salsa {day}",
+                level_id=level.id,
+                topic_id=topic.id,
+                capacity=10,
+                day_of_week=day,
+                start_time=time(18),
+                end_time=time(19),
+                is_public=True,
+                status=ClassGroupStatus.OPEN,
+            )
+            for day in (1, 2)
+        ]
+        session.add_all(groups)
+        await session.flush()
+        session.add_all(
+            [
+                Enrollment(
+                    student_id=students[0].id,
+                    class_group_id=groups[0].id,
+                    status=EnrollmentStatus.ACTIVE,
+                ),
+                Enrollment(
+                    student_id=students[0].id,
+                    class_group_id=groups[1].id,
+                    status=EnrollmentStatus.ACTIVE,
+                ),
+                Enrollment(
+                    student_id=students[1].id,
+                    class_group_id=groups[0].id,
+                    status=EnrollmentStatus.ACTIVE,
+                ),
+                Enrollment(
+                    student_id=students[2].id,
+                    class_group_id=groups[1].id,
+                    status=EnrollmentStatus.WAITLISTED,
+                ),
+            ]
+        )
+        await session.commit()
+        semester_id = semester.id
+
+    payload = {
+        "semesterId": semester_id,
+        "period": "2024-03-15",
+        "dueDate": "2024-03-10",
+        "amountPerClassGroup": "120.00",
+    }
+    run_response = await client.post(
+        f"{settings.API_V1_STR}/admin/billing-runs", json=payload
+    )
+    assert run_response.status_code == status.HTTP_200_OK
+    assert run_response.json() == {
+        "billingPeriod": "2024-03-01",
+        "chargesCreated": 2,
+    }
+
+    charges_response = await client.get(
+        f"{settings.API_V1_STR}/admin/charges",
+        params={"type": ChargeType.MONTHLY_FEE.value},
+    )
+    charges = {item["studentId"]: item for item in charges_response.json()}
+    assert set(charges) == {str(students[0].id), str(students[1].id)}
+    assert charges[str(students[0].id)]["amountDue"] == "240.00"
+    assert charges[str(students[1].id)]["amountDue"] == "120.00"
+    assert all(
+        item["billingPeriod"] == "2024-03-01"
+        and item["status"] == ChargeStatus.OPEN.value
+        for item in charges.values()
+    )
+
+    rerun_response = await client.post(
+        f"{settings.API_V1_STR}/admin/billing-runs", json=payload
+    )
+    assert rerun_response.json()["chargesCreated"] == 0
+
+    async with db_sessionmaker() as session:
+        queued = await session.scalar(
+            select(func.count()).where(
+                Notification.type == NotificationType.NEW_CHARGE
+            )
+        )
+    assert queued == 2
+
+    missing_response = await client.post(
+        f"{settings.API_V1_STR}/admin/billing-runs",
+        json={**payload, "semesterId": 999999},
+    )
+    assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_billing_runs_of_overlapping_semesters_charge_separately(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    student = await create_verified_user(
+        email="overlap_billed@example.com",
+        password="Student_Password1",
+        first_name="Overlap",
+        last_name="Billed",
+        role=UserRole.STUDENT,
+    )
+    async with db_sessionmaker() as session:
+        semesters = [
+            Semester(
+                name="2024 Wiosna",
+                start_date=date(2024, 2, 1),
+                end_date=date(2024, 6, 15),
+            ),
+            Semester(
+                name="2024 Lato",
+                start_date=date(2024, 6, 1),
+                end_date=date(2024, 8, 31),
+            ),
+        ]
+        level = SkillLevel(name="Sredniozaawansowany")
+        topic = Topic(name="Bachata")
+        session.add_all([*semesters, level, topic])
+        await session.flush()
+        groups = [
+            ClassGroup(
+                semester_id=semester.id,
+                name=f"Bachata {semester.name}",
+                level_id=level.id,
+                topic_id=topic.id,
+                capacity=10,
+                day_of_week=3,
+                start_time=time(18),
+                end_time=time(19),
+                is_public=True,
+                status=ClassGroupStatus.OPEN,
+            )
+            for semester in semesters
+        ]
+        session.add_all(groups)
+        await session.flush()
+        session.add_all(
+            [
+                Enrollment(
+                    student_id=student.id,
+                    class_group_id=group.id,
+                    status=EnrollmentStatus.ACTIVE,
+                )
+                for group in groups
+            ]
+        )
+        await session.commit()
+        semester_ids = [semester.id for semester in semesters]
+
+    for semester_id in semester_ids:
+        run_response = await client.post(
+            f"{settings.API_V1_STR}/admin/billing-runs",
+            json={
+                "semesterId": semester_id,
+                "period": "2024-06-01",
+                "dueDate": "2024-06-10",
+                "amountPerClassGroup": "100.00",
+            },
+        )
+        assert run_response.status_code == status.HTTP_200_OK
+        assert run_response.json()["chargesCreated"] == 1
+
+    rerun_response = await client.post(
+        f"{settings.API_V1_STR}/admin/billing-runs",
+        json={
+            "semesterId": semester_ids[0],
+            "period": "2024-06-20",
+            "dueDate": "2024-06-10",
+            "amountPerClassGroup": "100.00",
+        },
+    )
+    assert rerun_response.json()["chargesCreated"] == 0
+
+    charges_response = await client.get(
+        f"{settings.API_V1_STR}/admin/charges",
+        params={"type": ChargeType.MONTHLY_FEE.value},
+    )
+    charges = charges_response.json()
+    assert sorted(item["semesterId"] for item in charges) == semester_ids
+    assert all(
+        item["billingPeriod"] == "2024-06-01" and item["amountDue"] == "100.00"
+        for item in charges
+    )
+
+
+@pytest.mark.asyncio
+async def test_overdue_scan_reminds_once_per_charge(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    student = await create_verified_user(
+        email="overdue_student@example.com",
+        password="Student_Password1",
+        first_name="Overdue",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    charges = []
+    for days, amount in (
+        (-10, "120.00"),
+        (-5, "80.00"),
+        (10, "60.00"),
+        (-settings.PAYMENT_OVERDUE_LOOKBACK_DAYS - 1, "50.00"),
+    ):
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/charges",
+            json={
+                "dueDate": (date.today() + timedelta(days=days)).isoformat(),
+                "amountDue": amount,
+                "type": ChargeType.MONTHLY_FEE.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        charges.append(response.json())
+    partly_paid, cancelled, not_due, _ = charges
+
+    payment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/students/{student.id}/payments",
+        json={
+            "amount": "20.00",
+            "paidAt": datetime.now(timezone.utc).isoformat(),
+            "paymentMethod": PaymentMethod.CASH.value,
+        },
+    )
+    allocation_response = await client.post(
+        f"{settings.API_V1_STR}/admin/payments/"
+        f"{payment_response.json()['id']}/allocations",
+        json={"chargeId": partly_paid["id"], "amountAllocated": "20.00"},
+    )
+    assert allocation_response.status_code == status.HTTP_201_CREATED
+    cancel_response = await client.patch(
+        f"{settings.API_V1_STR}/admin/charges/{cancelled['id']}",
+        json={"status": ChargeStatus.CANCELLED.value},
+    )
+    assert cancel_response.status_code == status.HTTP_200_OK
+
+    async with db_sessionmaker() as session:
+        assert await enqueue_overdue_reminders(session) == 1
+        await session.commit()
+        assert await enqueue_overdue_reminders(session) == 0
+        assert (
+            await enqueue_overdue_reminders(
+                session, today=date.today() + timedelta(days=11)
+            )
+            == 1
+        )
+        await session.commit()
+        reminders = (
+            await session.scalars(
+                select(Notification)
+                .where(Notification.type == NotificationType.PAYMENT_OVERDUE)
+                .order_by(Notification.id)
+            )
+        ).all()
+
+    assert [item.charge_id for item in reminders] == [
+        partly_paid["id"],
+        not_due["id"],
+    ]
+    assert reminders[0].email_to == "overdue_student@example.com"
+    assert reminders[0].body["amount_remaining"] == "100,00 zł"
+
+
+@pytest.mark.asyncio
+async def test_admin_can_page_and_stream_charges(client: AsyncClient) -> None:
+    await create_admin_and_login(client)
+    student = await create_verified_user(
+        email="page_charges@example.com",
+        password="Student_Password1",
+        first_name="Page",
+        last_name="Charges",
+        role=UserRole.STUDENT,
+    )
+    keys = []
+    for due_date in (
+        "2024-03-10",
+        "2024-01-10",
+        "2024-03-10",
+        "2024-02-10",
+        "2024-01-10",
+    ):
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/charges",
+            json={
+                "dueDate": due_date,
+                "amountDue": "50.00",
+                "type": ChargeType.MONTHLY_FEE.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        keys.append((due_date, response.json()["id"]))
+    expected = [charge_id for _, charge_id in sorted(keys, reverse=True)]
+
+    url = f"{settings.API_V1_STR}/admin/charges"
+    params = {"student_id": str(student.id)}
+    pages = await fetch_all_pages(client, url, {**params, "limit": 2})
+    assert [item["id"] for item in pages] == expected
+    streamed = await stream_items(client, url, params)
+    assert [item["id"] for item in streamed] == expected
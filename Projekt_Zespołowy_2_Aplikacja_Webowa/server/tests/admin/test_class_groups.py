@@ -218,6 +218,102 @@ async def test_generate_sessions_detects_conflicts(
     assert generate_response.status_code == status.HTTP_409_CONFLICT
 
 
+@pytest.mark.asyncio
+async def test_admin_can_generate_sessions_for_many_class_groups(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="bulk@example.com",
+        password="Instructor_Password1",
+        first_name="Bulk",
+        last_name="User",
+        role=UserRole.INSTRUCTOR,
+    )
+    monday_group = (
+        await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-groups",
+            json=build_class_group_payload(deps, str(instructor.id)),
+        )
+    ).json()
+    wednesday_group = (
+        await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-groups",
+            json=build_class_group_payload(
+                deps,
+                str(instructor.id),
+                {"name": "Salsa - Sroda", "dayOfWeek": 3},
+            ),
+        )
+    ).json()
+    clashing_group = (
+        await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-groups",
+            json=build_class_group_payload(
+                deps,
+                str(instructor.id),
+                {"name": "Salsa - Kolizja", "startTime": "19:00"},
+            ),
+        )
+    ).json()
+
+    conflict_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-groups/generate-sessions",
+        json={
+            "classGroupIds": [monday_group["id"], clashing_group["id"]],
+            "startDate": "2024-01-01",
+            "endDate": "2024-01-31",
+        },
+    )
+    assert conflict_response.status_code == status.HTTP_409_CONFLICT
+
+    missing_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-groups/generate-sessions",
+        json={
+            "classGroupIds": [monday_group["id"], 999999],
+            "startDate": "2024-01-01",
+            "endDate": "2024-01-31",
+        },
+    )
+    assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+    generate_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-groups/generate-sessions",
+        json={
+            "classGroupIds": [monday_group["id"], wednesday_group["id"]],
+            "startDate": "2024-01-01",
+            "endDate": "2024-01-31",
+            "skipDates": ["2024-01-15"],
+        },
+    )
+    assert generate_response.status_code == status.HTTP_201_CREATED
+    sessions = generate_response.json()
+    assert len(sessions) == 9
+    assert all(item["id"] and item["createdAt"] for item in sessions)
+    monday_dates = sorted(
+        item["date"]
+        for item in sessions
+        if item["classGroupId"] == monday_group["id"]
+    )
+    assert monday_dates == [
+        "2024-01-01",
+        "2024-01-08",
+        "2024-01-22",
+        "2024-01-29",
+    ]
+
+    repeat_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-groups/generate-sessions",
+        json={
+            "classGroupIds": [wednesday_group["id"]],
+            "startDate": "2024-01-01",
+            "endDate": "2024-01-31",
+        },
+    )
+    assert repeat_response.status_code == status.HTTP_409_CONFLICT
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("role", [UserRole.STUDENT, UserRole.INSTRUCTOR])
 async def test_non_admin_cannot_manage_class_groups(
@@ -1,8 +1,17 @@
+from datetime import date, time
+import importlib.util
+import json
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import insert, text, update
 
 from app.core.config import get_settings
+from app.models.schedule import ClassSession, ClassSessionStatus
 from app.models.user import UserRole
 from tests.admin.helpers import (
     create_admin_and_login,
@@ -12,6 +21,12 @@ from tests.admin.helpers import (
 )
 
 settings = get_settings()
+OVERLAP_MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / "alembic"
+    / "versions"
+    / "c41e7a9d2b58_add_class_session_overlap_constraints.py"
+)
 
 
 async def create_schedule_dependencies(client: AsyncClient) -> dict:
@@ -384,3 +399,256 @@ async def test_non_admin_cannot_manage_class_sessions(
         },
     )
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_admin_can_page_and_stream_class_sessions(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="paging@example.com",
+        password="Instructor_Password1",
+        first_name="Paging",
+        last_name="User",
+        role=UserRole.INSTRUCTOR,
+    )
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    created_ids = []
+    for day in ["2024-01-29", "2024-01-08", "2024-01-22", "2024-01-15"]:
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+            json={
+                "classGroupId": class_group["id"],
+                "date": day,
+                "startTime": "18:00",
+                "endTime": "19:30",
+                "roomId": deps["room_id"],
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        created_ids.append(response.json()["id"])
+
+    seen_dates = []
+    params = {"class_group_id": class_group["id"], "limit": 3}
+    first_page = await client.get(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions", params=params
+    )
+    assert first_page.status_code == status.HTTP_200_OK
+    assert len(first_page.json()) == 3
+    seen_dates.extend(item["date"] for item in first_page.json())
+    next_cursor = first_page.headers["x-next-cursor"]
+
+    second_page = await client.get(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+        params={**params, "cursor": next_cursor},
+    )
+    assert second_page.status_code == status.HTTP_200_OK
+    assert "x-next-cursor" not in second_page.headers
+    seen_dates.extend(item["date"] for item in second_page.json())
+    assert seen_dates == [
+        "2024-01-08",
+        "2024-01-15",
+        "2024-01-22",
+        "2024-01-29",
+    ]
+
+    invalid_cursor = await client.get(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+        params={"cursor": "not-a-cursor"},
+    )
+    assert invalid_cursor.status_code == status.HTTP_400_BAD_REQUEST
+
+    streamed = await client.get(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+        params={"class_group_id": class_group["id"], "stream": True},
+    )
+    assert streamed.status_code == status.HTTP_200_OK
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [line["date"] for line in lines] == seen_dates
+    assert sorted(line["id"] for line in lines) == sorted(created_ids)
+
+
+@pytest.mark.asyncio
+async def test_class_session_writes_reject_conflicts(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="conflicts@example.com",
+        password="Instructor_Password1",
+        first_name="Conflict",
+        last_name="User",
+        role=UserRole.INSTRUCTOR,
+    )
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    sessions_url = f"{settings.API_V1_STR}/admin/schedule/class-sessions"
+
+    base_payload = {
+        "classGroupId": class_group["id"],
+        "date": "2024-03-04",
+        "startTime": "18:00",
+        "endTime": "19:30",
+        "roomId": deps["room_id"],
+        "instructorId": str(instructor.id),
+    }
+    first = await client.post(sessions_url, json=base_payload)
+    assert first.status_code == status.HTTP_201_CREATED
+
+    overlapping = await client.post(
+        sessions_url,
+        json={**base_payload, "startTime": "19:00", "endTime": "20:00"},
+    )
+    assert overlapping.status_code == status.HTTP_409_CONFLICT
+
+    adjacent = await client.post(
+        sessions_url,
+        json={**base_payload, "startTime": "19:30", "endTime": "20:30"},
+    )
+    assert adjacent.status_code == status.HTTP_201_CREATED
+
+    invalid = await client.post(
+        sessions_url,
+        json={**base_payload, "date": "2024-03-05", "startTime": "20:00"},
+    )
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+    update_response = await client.patch(
+        f"{sessions_url}/{adjacent.json()['id']}",
+        json={"startTime": "19:00"},
+    )
+    assert update_response.status_code == status.HTTP_409_CONFLICT
+
+    reschedule_response = await client.post(
+        f"{sessions_url}/{adjacent.json()['id']}/reschedule",
+        json={
+            "newDate": "2024-03-04",
+            "newStartTime": "17:30",
+            "newEndTime": "18:30",
+        },
+    )
+    assert reschedule_response.status_code == status.HTTP_409_CONFLICT
+
+    other = await client.post(
+        sessions_url,
+        json={
+            **base_payload,
+            "roomId": None,
+            "instructorId": None,
+        },
+    )
+    assert other.status_code == status.HTTP_201_CREATED
+    bulk_response = await client.patch(
+        f"{sessions_url}/bulk-update",
+        json={
+            "sessionIds": [other.json()["id"]],
+            "updates": {"instructorId": str(instructor.id)},
+        },
+    )
+    assert bulk_response.status_code == status.HTTP_409_CONFLICT
+
+    cancel_response = await client.post(
+        f"{sessions_url}/{first.json()['id']}/cancel", json={}
+    )
+    assert cancel_response.status_code == status.HTTP_200_OK
+    retry = await client.post(
+        sessions_url,
+        json={**base_payload, "startTime": "18:30", "endTime": "19:15"},
+    )
+    assert retry.status_code == status.HTTP_201_CREATED
+
+
+def run_overlap_migration(connection) -> None:
+    spec = importlib.util.spec_from_file_location(
+        "overlap_migration", OVERLAP_MIGRATION
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+
+
+@pytest.mark.asyncio
+async def test_overlap_migration_lists_existing_conflicts(
+    client: AsyncClient, db_engine
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="migration@example.com",
+        password="Instructor_Password1",
+        first_name="Migration",
+        last_name="User",
+        role=UserRole.INSTRUCTOR,
+    )
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    session_values = {
+        "class_group_id": class_group["id"],
+        "date": date(2024, 3, 4),
+        "room_id": deps["room_id"],
+        "instructor_id": instructor.id,
+    }
+
+    async with db_engine.begin() as conn:
+        await conn.execute(
+            text(
+                "ALTER TABLE class_session "
+                "DROP CONSTRAINT ex_class_session_room_overlap, "
+                "DROP CONSTRAINT ex_class_session_instructor_overlap"
+            )
+        )
+        first_id, second_id, _ = (
+            await conn.scalars(
+                insert(ClassSession).returning(ClassSession.id),
+                [
+                    {
+                        **session_values,
+                        "start_time": time(18, 0),
+                        "end_time": time(19, 30),
+                        "status": ClassSessionStatus.SCHEDULED,
+                    },
+                    {
+                        **session_values,
+                        "start_time": time(19, 0),
+                        "end_time": time(20, 0),
+                        "status": ClassSessionStatus.SCHEDULED,
+                    },
+                    {
+                        **session_values,
+                        "start_time": time(18, 30),
+                        "end_time": time(19, 0),
+                        "status": ClassSessionStatus.CANCELLED,
+                    },
+                ],
+            )
+        ).all()
+
+        with pytest.raises(RuntimeError) as error:
+            await conn.run_sync(run_overlap_migration)
+        message = str(error.value)
+        assert f"sessions {first_id} and {second_id} share room_id" in message
+        assert (
+            f"sessions {first_id} and {second_id} share instructor_id"
+            in message
+        )
+        assert message.count(" share ") == 2
+
+        await conn.execute(
+            update(ClassSession)
+            .where(ClassSession.id == second_id)
+            .values(status=ClassSessionStatus.CANCELLED)
+        )
+        await conn.run_sync(run_overlap_migration)
+        constraints = await conn.scalars(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conname LIKE 'ex_class_session_%' ORDER BY conname"
+            )
+        )
+        assert constraints.all() == [
+            "ex_class_session_instructor_overlap",
+            "ex_class_session_room_overlap",
+        ]
@@ -1,10 +1,16 @@
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import func, select, update
 
 from app.core.config import get_settings
 from app.models.enrollment import EnrollmentStatus
+from app.models.notification import Notification, NotificationType
+from app.models.schedule import ClassGroup
 from app.models.user import UserRole
+from app.services.common.enrollment_counters import (
+    reconcile_enrollment_counters,
+)
 from tests.admin.helpers import create_admin_and_login, create_verified_user
 
 settings = get_settings()
@@ -68,6 +74,17 @@ async def create_class_group(
     return response.json()
 
 
+async def enrollment_statuses(
+    client: AsyncClient, class_group_id: int
+) -> dict[int, str]:
+    response = await client.get(
+        f"{settings.API_V1_STR}/admin/enrollments",
+        params={"class_group_id": class_group_id},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return {item["id"]: item["status"] for item in response.json()}
+
+
 @pytest.mark.asyncio
 async def test_admin_can_manage_enrollments(
     client: AsyncClient,
@@ -185,8 +202,147 @@ async def test_admin_can_promote_waitlist(
     )
     assert cancel_response.status_code == status.HTTP_200_OK
 
+    statuses = await enrollment_statuses(client, class_group["id"])
+    assert statuses[waitlist_response.json()["id"]] == (
+        EnrollmentStatus.ACTIVE.value
+    )
+
     promote_response = await client.post(
         f"{settings.API_V1_STR}/admin/class-groups/{class_group['id']}/waitlist/promote"
     )
     assert promote_response.status_code == status.HTTP_200_OK
-    assert promote_response.json()["status"] == EnrollmentStatus.ACTIVE.value
+    assert promote_response.json() == []
+
+
+async def read_counters(db_sessionmaker, class_group_id: int) -> tuple:
+    async with db_sessionmaker() as session:
+        result = await session.execute(
+            select(ClassGroup.enrolled_count, ClassGroup.waitlist_count).where(
+                ClassGroup.id == class_group_id
+            )
+        )
+        return tuple(result.one())
+
+
+@pytest.mark.asyncio
+async def test_enrollment_counters_follow_changes_and_reconcile(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="inst3@example.com",
+        password="Instructor_Password1",
+        first_name="Inst",
+        last_name="Three",
+        role=UserRole.INSTRUCTOR,
+    )
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    enrollment_ids = []
+    for number, enrollment_status in enumerate(
+        (EnrollmentStatus.ACTIVE, EnrollmentStatus.WAITLISTED)
+    ):
+        student = await create_verified_user(
+            email=f"counted{number}@example.com",
+            password="Student_Password1",
+            first_name="Student",
+            last_name=str(number),
+            role=UserRole.STUDENT,
+        )
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/enrollments",
+            json={
+                "studentId": str(student.id),
+                "classGroupId": class_group["id"],
+                "status": enrollment_status.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        enrollment_ids.append(response.json()["id"])
+    assert await read_counters(db_sessionmaker, class_group["id"]) == (1, 1)
+
+    cancel_response = await client.patch(
+        f"{settings.API_V1_STR}/admin/enrollments/{enrollment_ids[0]}",
+        json={"status": EnrollmentStatus.CANCELLED.value},
+    )
+    assert cancel_response.status_code == status.HTTP_200_OK
+    delete_response = await client.delete(
+        f"{settings.API_V1_STR}/admin/enrollments/{enrollment_ids[1]}"
+    )
+    assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+    assert await read_counters(db_sessionmaker, class_group["id"]) == (0, 0)
+
+    async with db_sessionmaker() as session:
+        await session.execute(
+            update(ClassGroup)
+            .where(ClassGroup.id == class_group["id"])
+            .values(enrolled_count=5, waitlist_count=3)
+        )
+        await session.commit()
+        assert await reconcile_enrollment_counters(session) == 1
+        assert await reconcile_enrollment_counters(session) == 0
+    assert await read_counters(db_sessionmaker, class_group["id"]) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_raising_capacity_promotes_waitlist_in_order(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="inst4@example.com",
+        password="Instructor_Password1",
+        first_name="Inst",
+        last_name="Four",
+        role=UserRole.INSTRUCTOR,
+    )
+    class_group = await create_class_group(
+        client, deps, str(instructor.id), capacity=1
+    )
+    enrollment_ids = []
+    for number in range(4):
+        student = await create_verified_user(
+            email=f"queued{number}@example.com",
+            password="Student_Password1",
+            first_name="Student",
+            last_name=str(number),
+            role=UserRole.STUDENT,
+        )
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/enrollments",
+            json={
+                "studentId": str(student.id),
+                "classGroupId": class_group["id"],
+                "status": (
+                    EnrollmentStatus.ACTIVE
+                    if number == 0
+                    else EnrollmentStatus.WAITLISTED
+                ).value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        enrollment_ids.append(response.json()["id"])
+
+    update_response = await client.patch(
+        f"{settings.API_V1_STR}/admin/schedule/class-groups/"
+        f"{class_group['id']}",
+        json={"capacity": 3},
+    )
+    assert update_response.status_code == status.HTTP_200_OK
+
+    statuses = await enrollment_statuses(client, class_group["id"])
+    assert [statuses[enrollment_id] for enrollment_id in enrollment_ids] == [
+        EnrollmentStatus.ACTIVE.value,
+        EnrollmentStatus.ACTIVE.value,
+        EnrollmentStatus.ACTIVE.value,
+        EnrollmentStatus.WAITLISTED.value,
+    ]
+    assert await read_counters(db_sessionmaker, class_group["id"]) == (3, 1)
+    async with db_sessionmaker() as session:
+        queued = await session.scalar(
+            select(func.count()).where(
+                Notification.type == NotificationType.ENROLL_CONFIRM
+            )
+        )
+    assert queued == 2
@@ -0,0 +1,124 @@
+import csv
+from datetime import datetime, timezone
+import io
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.core.config import get_settings
+from app.models.payment import ChargeType, PaymentMethod
+from app.models.user import UserRole
+from tests.admin.helpers import create_admin_and_login, create_verified_user
+
+settings = get_settings()
+
+
+async def create_ledger(client: AsyncClient) -> dict:
+    student = await create_verified_user(
+        email="export_student@example.com",
+        password="Student_Password1",
+        first_name="Export",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    charge_ids = []
+    for due_date in ("2024-01-10", "2024-02-10"):
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/charges",
+            json={
+                "dueDate": due_date,
+                "amountDue": "100.00",
+                "type": ChargeType.MONTHLY_FEE.value,
+            },
+        )
+        charge_ids.append(response.json()["id"])
+    payment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/students/{student.id}/payments",
+        json={
+            "amount": "150.00",
+            "paidAt": datetime(2024, 1, 5, tzinfo=timezone.utc).isoformat(),
+            "paymentMethod": PaymentMethod.TRANSFER.value,
+        },
+    )
+    payment_id = payment_response.json()["id"]
+    await client.post(
+        f"{settings.API_V1_STR}/admin/payments/{payment_id}/allocations/auto"
+    )
+    return {
+        "student_id": str(student.id),
+        "charge_ids": charge_ids,
+        "payment_id": payment_id,
+    }
+
+
+def read_csv(text: str) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+@pytest.mark.asyncio
+async def test_ledger_exports_stream_csv(client: AsyncClient) -> None:
+    await create_admin_and_login(client)
+    ledger = await create_ledger(client)
+
+    payments_response = await client.get(
+        f"{settings.API_V1_STR}/admin/exports/payments"
+    )
+    assert payments_response.status_code == status.HTTP_200_OK
+    assert payments_response.headers["content-type"].startswith("text/csv")
+    assert "payments.csv" in payments_response.headers["content-disposition"]
+    payments = read_csv(payments_response.text)
+    assert [
+        (row["id"], row["student_id"], row["amount"], row["payment_method"])
+        for row in payments
+    ] == [
+        (
+            str(ledger["payment_id"]),
+            ledger["student_id"],
+            "150.00",
+            PaymentMethod.TRANSFER.value,
+        )
+    ]
+
+    charges_response = await client.get(
+        f"{settings.API_V1_STR}/admin/exports/charges",
+        params={"due_from": "2024-02-01"},
+    )
+    charges = read_csv(charges_response.text)
+    assert [(row["id"], row["status"]) for row in charges] == [
+        (str(ledger["charge_ids"][1]), "PARTIAL")
+    ]
+
+    allocations_response = await client.get(
+        f"{settings.API_V1_STR}/admin/exports/allocations"
+    )
+    allocations = read_csv(allocations_response.text)
+    assert [
+        (row["charge_id"], row["amount_allocated"]) for row in allocations
+    ] == [
+        (str(ledger["charge_ids"][0]), "100.00"),
+        (str(ledger["charge_ids"][1]), "50.00"),
+    ]
+
+    empty_response = await client.get(
+        f"{settings.API_V1_STR}/admin/exports/payments",
+        params={"paid_from": "2025-01-01T00:00:00Z"},
+    )
+    assert read_csv(empty_response.text) == []
+
+
+@pytest.mark.asyncio
+async def test_ledger_exports_stream_parquet(client: AsyncClient) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    await create_admin_and_login(client)
+    ledger = await create_ledger(client)
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/admin/exports/charges",
+        params={"format": "parquet"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names[:3] == ["id", "student_id", "due_date"]
+    assert table.column("id").to_pylist() == ledger["charge_ids"]
+    assert table.column("status").to_pylist() == ["PAID", "PARTIAL"]
@@ -1,13 +1,26 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import select, update
 
 from app.core.config import get_settings
-from app.models.payment import ChargeStatus, ChargeType, PaymentMethod
+from app.models.payment import (
+    Charge,
+    ChargeStatus,
+    ChargeType,
+    PaymentMethod,
+)
 from app.models.user import UserRole
-from tests.admin.helpers import create_admin_and_login, create_verified_user
+from app.services.admin.charges import reconcile_charge_statuses
+from tests.admin.helpers import (
+    create_admin_and_login,
+    create_verified_user,
+    fetch_all_pages,
+    stream_items,
+)
 
 settings = get_settings()
 
@@ -114,3 +127,283 @@ async def test_admin_can_manage_payments_and_allocations(
         f"{settings.API_V1_STR}/admin/payments/{payment['id']}"
     )
     assert delete_payment.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_auto_allocation_pays_oldest_charges_first(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    student = await create_verified_user(
+        email="fifo_student@example.com",
+        password="Student_Password1",
+        first_name="Fifo",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+
+    charge_ids = {}
+    for due_date, amount in (
+        ("2024-03-01", "100.00"),
+        ("2024-01-01", "100.00"),
+        ("2024-02-01", "80.00"),
+    ):
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/charges",
+            json={
+                "dueDate": due_date,
+                "amountDue": amount,
+                "type": ChargeType.MONTHLY_FEE.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        charge_ids[due_date] = response.json()["id"]
+
+    async def create_payment(amount: str) -> int:
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/payments",
+            json={
+                "amount": amount,
+                "paidAt": datetime.now(timezone.utc).isoformat(),
+                "paymentMethod": PaymentMethod.TRANSFER.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["id"]
+
+    async def charge_status(due_date: str) -> str:
+        response = await client.get(
+            f"{settings.API_V1_STR}/admin/charges/{charge_ids[due_date]}"
+        )
+        return response.json()["status"]
+
+    first_payment = await create_payment("130.00")
+    auto_response = await client.post(
+        f"{settings.API_V1_STR}/admin/payments/{first_payment}"
+        "/allocations/auto"
+    )
+    assert auto_response.status_code == status.HTTP_200_OK
+    assert {
+        item["chargeId"]: item["amountAllocated"]
+        for item in auto_response.json()
+    } == {
+        charge_ids["2024-01-01"]: "100.00",
+        charge_ids["2024-02-01"]: "30.00",
+    }
+    assert await charge_status("2024-01-01") == ChargeStatus.PAID.value
+    assert await charge_status("2024-02-01") == ChargeStatus.PARTIAL.value
+    assert await charge_status("2024-03-01") == ChargeStatus.OPEN.value
+
+    second_payment = await create_payment("150.00")
+    batch_response = await client.post(
+        f"{settings.API_V1_STR}/admin/payments/auto-allocate"
+    )
+    assert batch_response.status_code == status.HTTP_200_OK
+    assert batch_response.json() == {"allocationsWritten": 2}
+    allocations = await client.get(
+        f"{settings.API_V1_STR}/admin/payments/{second_payment}/allocations"
+    )
+    assert {
+        item["chargeId"]: item["amountAllocated"]
+        for item in allocations.json()
+    } == {
+        charge_ids["2024-02-01"]: "50.00",
+        charge_ids["2024-03-01"]: "100.00",
+    }
+    assert await charge_status("2024-02-01") == ChargeStatus.PAID.value
+    assert await charge_status("2024-03-01") == ChargeStatus.PAID.value
+
+    repeat_response = await client.post(
+        f"{settings.API_V1_STR}/admin/payments/auto-allocate"
+    )
+    assert repeat_response.json() == {"allocationsWritten": 0}
+
+    missing_response = await client.post(
+        f"{settings.API_V1_STR}/admin/payments/999999/allocations/auto"
+    )
+    assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_charge_statuses_follow_payment_deletes_and_reconcile(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    student = await create_verified_user(
+        email="ledger_student@example.com",
+        password="Student_Password1",
+        first_name="Ledger",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+
+    charge_ids = []
+    for due_date in ("2024-01-01", "2024-02-01"):
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/charges",
+            json={
+                "dueDate": due_date,
+                "amountDue": "100.00",
+                "type": ChargeType.MONTHLY_FEE.value,
+            },
+        )
+        charge_ids.append(response.json()["id"])
+    payment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/students/{student.id}/payments",
+        json={
+            "amount": "150.00",
+            "paidAt": datetime.now(timezone.utc).isoformat(),
+            "paymentMethod": PaymentMethod.CASH.value,
+        },
+    )
+    payment_id = payment_response.json()["id"]
+    await client.post(
+        f"{settings.API_V1_STR}/admin/payments/{payment_id}/allocations/auto"
+    )
+
+    async def read_statuses() -> list[ChargeStatus]:
+        async with db_sessionmaker() as session:
+            result = await session.scalars(
+                select(Charge.status)
+                .where(Charge.id.in_(charge_ids))
+                .order_by(Charge.id)
+            )
+            return list(result)
+
+    assert await read_statuses() == [ChargeStatus.PAID, ChargeStatus.PARTIAL]
+
+    async with db_sessionmaker() as session:
+        await session.execute(
+            update(Charge)
+            .where(Charge.id.in_(charge_ids))
+            .values(status=ChargeStatus.OPEN)
+        )
+        await session.commit()
+        assert await reconcile_charge_statuses(session) == 2
+        assert await reconcile_charge_statuses(session) == 0
+    assert await read_statuses() == [ChargeStatus.PAID, ChargeStatus.PARTIAL]
+
+    delete_response = await client.delete(
+        f"{settings.API_V1_STR}/admin/payments/{payment_id}"
+    )
+    assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+    assert await read_statuses() == [ChargeStatus.OPEN, ChargeStatus.OPEN]
+
+
+@pytest.mark.asyncio
+async def test_receivables_aging_buckets_overdue_balances(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    as_of = date(2024, 6, 30)
+    students = []
+    for name, charges in (
+        (
+            "aging_a",
+            ((10, "100.00"), (45, "50.00"), (100, "70.00"), (-5, "30.00")),
+        ),
+        ("aging_b", ((70, "20.00"),)),
+    ):
+        student = await create_verified_user(
+            email=f"{name}@example.com",
+            password="Student_Password1",
+            first_name="Aging",
+            last_name=name,
+            role=UserRole.STUDENT,
+        )
+        students.append(student)
+        for days_overdue, amount in charges:
+            response = await client.post(
+                f"{settings.API_V1_STR}/admin/students/{student.id}/charges",
+                json={
+                    "dueDate": (
+                        as_of - timedelta(days=days_overdue)
+                    ).isoformat(),
+                    "amountDue": amount,
+                    "type": ChargeType.MONTHLY_FEE.value,
+                },
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            if days_overdue == 10:
+                partly_paid_charge = response.json()["id"]
+
+    payment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/students/{students[0].id}/payments",
+        json={
+            "amount": "40.00",
+            "paidAt": datetime.now(timezone.utc).isoformat(),
+            "paymentMethod": PaymentMethod.CASH.value,
+        },
+    )
+    await client.post(
+        f"{settings.API_V1_STR}/admin/payments/"
+        f"{payment_response.json()['id']}/allocations",
+        json={"chargeId": partly_paid_charge, "amountAllocated": "40.00"},
+    )
+
+    aging_response = await client.get(
+        f"{settings.API_V1_STR}/admin/billing/aging",
+        params={"as_of": as_of.isoformat()},
+    )
+    assert aging_response.status_code == status.HTTP_200_OK
+    rows = aging_response.json()
+    assert [row["studentId"] for row in rows] == [
+        str(students[0].id),
+        str(students[1].id),
+    ]
+    buckets = [
+        tuple(
+            Decimal(row[key])
+            for key in (
+                "overdueUpTo30",
+                "overdue31To60",
+                "overdue61To90",
+                "overdueOver90",
+                "totalOverdue",
+            )
+        )
+        for row in rows
+    ]
+    assert buckets == [
+        (Decimal("60"), Decimal("50"), 0, Decimal("70"), Decimal("180")),
+        (0, 0, Decimal("20"), 0, Decimal("20")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_admin_can_page_and_stream_payments(client: AsyncClient) -> None:
+    await create_admin_and_login(client)
+    student = await create_verified_user(
+        email="page_payments@example.com",
+        password="Student_Password1",
+        first_name="Page",
+        last_name="Payments",
+        role=UserRole.STUDENT,
+    )
+    paid_at = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+    keys = []
+    # Equal payment times check that the id breaks ties.
+    for days in (0, 2, 1, 2, 0):
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/students/{student.id}/payments",
+            json={
+                "amount": "10.00",
+                "paidAt": (paid_at + timedelta(days=days)).isoformat(),
+                "paymentMethod": PaymentMethod.CASH.value,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        keys.append((days, response.json()["id"]))
+    expected = [payment_id for _, payment_id in sorted(keys, reverse=True)]
+
+    url = f"{settings.API_V1_STR}/admin/payments"
+    params = {"student_id": str(student.id)}
+    pages = await fetch_all_pages(client, url, {**params, "limit": 2})
+    assert [item["id"] for item in pages] == expected
+    streamed = await stream_items(client, url, params)
+    assert [item["id"] for item in streamed] == expected
+
+    invalid_cursor = await client.get(
+        url, params={"limit": 2, "cursor": "not-a-cursor"}
+    )
+    assert invalid_cursor.status_code == status.HTTP_400_BAD_REQUEST
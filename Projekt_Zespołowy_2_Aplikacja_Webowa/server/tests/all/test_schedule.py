@@ -244,3 +244,79 @@ async def test_public_schedule_lists_groups_and_filters(
     assert weekday_response.status_code == status.HTTP_200_OK
     assert len(weekday_response.json()["groups"]) == 1
     assert weekday_response.json()["groups"][0]["groupId"] == group_1["id"]
+
+
+@pytest.mark.asyncio
+async def test_public_schedule_etag_and_invalidation(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    group = await create_class_group(
+        client,
+        {
+            "semesterId": deps["semester_id"],
+            "name": "Hip Hop Kids 8-10",
+            "levelId": deps["level_beginner_id"],
+            "topicId": deps["topic_hip_hop_id"],
+            "dayOfWeek": 2,
+            "startTime": "17:00",
+            "endTime": "18:00",
+            "capacity": 2,
+            "roomId": deps["room_a_id"],
+            "isPublic": True,
+            "status": "OPEN",
+        },
+    )
+    await create_class_session(
+        client,
+        {
+            "classGroupId": group["id"],
+            "date": "2026-01-20",
+            "startTime": "17:00",
+            "endTime": "18:00",
+            "roomId": deps["room_a_id"],
+        },
+    )
+
+    params = {"from": "2026-01-19", "to": "2026-01-25"}
+    first = await client.get(
+        f"{settings.API_V1_STR}/public/schedule", params=params
+    )
+    assert first.status_code == status.HTTP_200_OK
+    etag = first.headers["etag"]
+    assert first.json()["groups"][0]["enrolledCount"] == 0
+
+    not_modified = await client.get(
+        f"{settings.API_V1_STR}/public/schedule",
+        params=params,
+        headers={"If-None-Match": etag},
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.headers["etag"] == etag
+
+    student = await create_verified_user(
+        email="student_etag@example.com",
+        password="Student_Password1",
+        first_name="Etag",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    enrollment = await client.post(
+        f"{settings.API_V1_STR}/admin/enrollments",
+        json={
+            "studentId": str(student.id),
+            "classGroupId": group["id"],
+            "status": EnrollmentStatus.ACTIVE.value,
+        },
+    )
+    assert enrollment.status_code == status.HTTP_201_CREATED
+
+    refreshed = await client.get(
+        f"{settings.API_V1_STR}/public/schedule",
+        params=params,
+        headers={"If-None-Match": etag},
+    )
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["groups"][0]["enrolledCount"] == 1
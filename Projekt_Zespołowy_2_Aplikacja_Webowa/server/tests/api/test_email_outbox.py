@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta, timezone
+import socket
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+import pytest
+import pytest_asyncio
+from pydantic import SecretStr
+from sqlalchemy import insert, select, update
+
+from app.core.config import get_settings
+from app.email.smtp import smtp_pool
+from app.models.notification import (
+    Notification,
+    NotificationStatus,
+    NotificationType,
+)
+from app.services.common.notifications import send_pending_notifications
+
+settings = get_settings()
+
+ENROLLMENT_BODY = {
+    "first_name": "Outbox",
+    "class_group_name": "Salsa",
+    "class_group_schedule": "Poniedziałek 18:00",
+    "enrollment_status": "Aktywny",
+    "status_message": "Do zobaczenia na zajęciach!",
+    "schedule_link": "http://localhost/my-schedule",
+}
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.messages = []
+        self.connections = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, options):
+        if address.startswith("bounce@"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.connections.add(session.peer)
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def smtp_server(monkeypatch):
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=port,
+        auth_require_tls=False,
+        authenticator=lambda *args: AuthResult(success=True),
+    )
+    controller.start()
+    for name, value in {
+        "APP_ENV": "production",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": port,
+        "SMTP_TLS": False,
+        "SMTP_SSL": False,
+        "SMTP_USER": "outbox",
+        "SMTP_PASSWORD": SecretStr("outbox"),
+        "EMAILS_FROM_EMAIL": "noreply@example.com",
+        "SMTP_POOL_SIZE": 1,
+        "NOTIFICATION_MAX_ATTEMPTS": 2,
+        "NOTIFICATION_RETRY_BACKOFF_SECONDS": 60,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    try:
+        yield handler
+    finally:
+        await smtp_pool.close()
+        controller.stop()
+
+
+async def enqueue(db_sessionmaker, *recipients: str) -> None:
+    async with db_sessionmaker() as session:
+        await session.execute(
+            insert(Notification),
+            [
+                {
+                    "type": NotificationType.ENROLL_CONFIRM,
+                    "email_to": recipient,
+                    "subject": "TipTap - Potwierdzenie zapisu na zajęcia",
+                    "body": ENROLLMENT_BODY,
+                }
+                for recipient in recipients
+            ],
+        )
+        await session.commit()
+
+
+async def read_outbox(db_sessionmaker) -> dict[str, Notification]:
+    async with db_sessionmaker() as session:
+        notifications = await session.scalars(select(Notification))
+        return {item.email_to: item for item in notifications}
+
+
+@pytest.mark.asyncio
+async def test_outbox_sends_batches_over_one_connection(
+    smtp_server, db_sessionmaker
+) -> None:
+    recipients = [f"outbox{number}@example.com" for number in range(5)]
+    await enqueue(db_sessionmaker, *recipients)
+
+    async with db_sessionmaker() as session:
+        assert await send_pending_notifications(session, batch_size=2) == 5
+        assert await send_pending_notifications(session) == 0
+
+    assert sorted(
+        envelope.rcpt_tos[0] for envelope in smtp_server.messages
+    ) == sorted(recipients)
+    assert len(smtp_server.connections) == 1
+    assert b"Salsa" in smtp_server.messages[0].content
+    outbox = await read_outbox(db_sessionmaker)
+    assert {item.status for item in outbox.values()} == {
+        NotificationStatus.SENT
+    }
+
+
+@pytest.mark.asyncio
+async def test_outbox_retries_failed_sends_with_backoff(
+    smtp_server, db_sessionmaker
+) -> None:
+    await enqueue(db_sessionmaker, "bounce@example.com", "ok@example.com")
+
+    async with db_sessionmaker() as session:
+        assert await send_pending_notifications(session) == 2
+    outbox = await read_outbox(db_sessionmaker)
+    bounced = outbox["bounce@example.com"]
+    assert outbox["ok@example.com"].status == NotificationStatus.SENT
+    assert bounced.status == NotificationStatus.PENDING
+    assert bounced.attempts == 1
+    assert bounced.error
+    assert bounced.scheduled_for > datetime.now(timezone.utc) + timedelta(
+        seconds=50
+    )
+
+    async with db_sessionmaker() as session:
+        assert await send_pending_notifications(session) == 0
+        await session.execute(
+            update(Notification)
+            .where(Notification.id == bounced.id)
+            .values(scheduled_for=datetime.now(timezone.utc))
+        )
+        await session.commit()
+        assert await send_pending_notifications(session) == 1
+    bounced = (await read_outbox(db_sessionmaker))["bounce@example.com"]
+    assert bounced.status == NotificationStatus.FAILED
+    assert bounced.attempts == 2
+    assert [envelope.rcpt_tos for envelope in smtp_server.messages] == [
+        ["ok@example.com"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_outbox_fails_only_the_body_that_cannot_render(
+    smtp_server, db_sessionmaker
+) -> None:
+    await enqueue(db_sessionmaker, "good@example.com")
+    async with db_sessionmaker() as session:
+        await session.execute(
+            insert(Notification).values(
+                type=NotificationType.ENROLL_CONFIRM,
+                email_to="broken@example.com",
+                subject="TipTap - Potwierdzenie zapisu na zajęcia",
+                body=["not", "a", "mapping"],
+            )
+        )
+        await session.commit()
+
+    async with db_sessionmaker() as session:
+        assert await send_pending_notifications(session) == 2
+    outbox = await read_outbox(db_sessionmaker)
+    assert outbox["good@example.com"].status == NotificationStatus.SENT
+    broken = outbox["broken@example.com"]
+    assert broken.status == NotificationStatus.PENDING
+    assert broken.attempts == 1
+    assert [envelope.rcpt_tos for envelope in smtp_server.messages] == [
+        ["good@example.com"]
+    ]
@@ -0,0 +1,25 @@
+from app.email.rendering import (
+    TEMPLATE_FOLDER,
+    precompile_templates,
+    render_bodies,
+    template_environment,
+)
+from app.email.send_email import NEW_CHARGE_TEMPLATE
+
+
+def test_templates_are_precompiled_and_rendered_in_bulk() -> None:
+    assert precompile_templates() == len(list(TEMPLATE_FOLDER.glob("*.html")))
+    assert template_environment().cache is not None
+    assert len(template_environment().cache) >= precompile_templates()
+
+    html = render_bodies(
+        NEW_CHARGE_TEMPLATE,
+        [
+            {"first_name": "Ala", "amount_due": "100,00 zł"},
+            {"first_name": "<b>Ola</b>", "amount_due": "250,00 zł"},
+        ],
+    )
+
+    assert len(html) == 2
+    assert "Ala" in html[0] and "100,00 zł" in html[0]
+    assert "&lt;b&gt;Ola&lt;/b&gt;" in html[1] and "<b>Ola" not in html[1]
@@ -0,0 +1,36 @@
+from httpx import AsyncClient
+from app.core.config import get_settings
+from app.core.instrumentation import request_metrics
+import pytest
+
+from tests.admin.helpers import create_admin_and_login
+
+settings = get_settings()
+
+
+@pytest.mark.asyncio
+async def test_requests_report_query_metrics(client: AsyncClient) -> None:
+    await create_admin_and_login(client)
+    request_metrics.clear()
+
+    response = await client.get(f"{settings.API_V1_STR}/public/skill-levels")
+    assert response.status_code == 200
+    assert int(response.headers["x-query-count"]) >= 1
+    assert float(response.headers["x-db-time"]) >= 0
+
+    health = await client.get(f"{settings.API_V1_STR}/utils/health")
+    assert health.headers["x-query-count"] == "0"
+
+    metrics = await client.get(f"{settings.API_V1_STR}/utils/metrics")
+    assert metrics.status_code == 200
+    routes = {item["route"]: item for item in metrics.json()["routes"]}
+    skill_levels = routes[f"GET {settings.API_V1_STR}/public/skill-levels"]
+    assert skill_levels["count"] == 1
+    assert skill_levels["latencyMs"]["buckets"]["+Inf"] == 1
+    assert skill_levels["queryCount"]["sum"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_superuser(client: AsyncClient) -> None:
+    response = await client.get(f"{settings.API_V1_STR}/utils/metrics")
+    assert response.status_code == 401
@@ -0,0 +1,71 @@
+from collections.abc import AsyncGenerator
+import os
+
+from fastapi import status
+from httpx import AsyncClient
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import db as core_db
+from app.core.config import get_settings
+from app.models.base import Base
+from app.models.semester import SkillLevel
+from tests.admin.helpers import create_admin_and_login
+
+settings = get_settings()
+REPLICA_URI = os.getenv("TEST_REPLICA_DATABASE_URI")
+
+pytestmark = pytest.mark.skipif(
+    not REPLICA_URI,
+    reason="TEST_REPLICA_DATABASE_URI points to a second Postgres instance",
+)
+
+
+@pytest_asyncio.fixture
+async def replica_sessionmaker(monkeypatch) -> AsyncGenerator:
+    engine = create_async_engine(REPLICA_URI, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(core_db, "replica_session_maker", sessionmaker)
+    try:
+        yield sessionmaker
+    finally:
+        await engine.dispose()
+
+
+async def _skill_level_names(client: AsyncClient) -> list[str]:
+    response = await client.get(f"{settings.API_V1_STR}/public/skill-levels")
+    assert response.status_code == status.HTTP_200_OK
+    return [item["name"] for item in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_except_after_own_write(
+    client: AsyncClient, replica_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    client.cookies.delete(core_db.READ_PRIMARY_COOKIE)
+
+    async with replica_sessionmaker() as session:
+        session.add(SkillLevel(name="Tylko replika"))
+        await session.commit()
+
+    assert await _skill_level_names(client) == ["Tylko replika"]
+
+    response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/skill-levels",
+        json={"name": "Nowy poziom"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert core_db.READ_PRIMARY_COOKIE in response.cookies
+
+    assert await _skill_level_names(client) == ["Nowy poziom"]
+
+    client.cookies.delete(core_db.READ_PRIMARY_COOKIE)
+    assert await _skill_level_names(client) == ["Tylko replika"]
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from httpx import AsyncClient
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.auth.tokens import access_token_cache, prune_expired_access_tokens
+from app.core.config import get_settings
+from app.models.user import AccessToken, UserRole
+from tests.admin.helpers import create_verified_user, login
+
+settings = get_settings()
+
+
+@pytest.mark.asyncio
+async def test_cached_session_is_dropped_on_password_change(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_verified_user(
+        email="cached@example.com",
+        password="Cached_Password1",
+        first_name="Cached",
+        last_name="User",
+        role=UserRole.STUDENT,
+    )
+    await login(client, "cached@example.com", "Cached_Password1")
+    me_response = await client.get(f"{settings.API_V1_STR}/users/me")
+    assert me_response.status_code == status.HTTP_200_OK
+    assert len(access_token_cache) == 1
+
+    async with db_sessionmaker() as session:
+        await session.execute(delete(AccessToken))
+        await session.commit()
+    cached_response = await client.get(f"{settings.API_V1_STR}/users/me")
+    assert cached_response.status_code == status.HTTP_200_OK
+    assert cached_response.json()["email"] == "cached@example.com"
+
+    update_response = await client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        json={
+            "password": "Changed_Password1",
+            "currentPassword": "Cached_Password1",
+        },
+    )
+    assert update_response.status_code == status.HTTP_200_OK
+    assert len(access_token_cache) == 0
+    expired_response = await client.get(f"{settings.API_V1_STR}/users/me")
+    assert expired_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_profile_change_is_visible_on_next_request(
+    client: AsyncClient,
+) -> None:
+    await create_verified_user(
+        email="profile@example.com",
+        password="Profile_Password1",
+        first_name="Old",
+        last_name="User",
+        role=UserRole.STUDENT,
+    )
+    await login(client, "profile@example.com", "Profile_Password1")
+    me_response = await client.get(f"{settings.API_V1_STR}/users/me")
+    assert me_response.json()["firstName"] == "Old"
+
+    update_response = await client.patch(
+        f"{settings.API_V1_STR}/users/me", json={"firstName": "New"}
+    )
+    assert update_response.status_code == status.HTTP_200_OK
+    me_response = await client.get(f"{settings.API_V1_STR}/users/me")
+    assert me_response.status_code == status.HTTP_200_OK
+    assert me_response.json()["firstName"] == "New"
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_only_expired_tokens(db_sessionmaker) -> None:
+    user = await create_verified_user(
+        email="tokens@example.com",
+        password="Tokens_Password1",
+        first_name="Tokens",
+        last_name="User",
+        role=UserRole.STUDENT,
+    )
+    now = datetime.now(timezone.utc)
+    expired_at = now - timedelta(seconds=settings.COOKIE_MAX_AGE + 60)
+    async with db_sessionmaker() as session:
+        await session.execute(
+            insert(AccessToken),
+            [
+                {
+                    "token": f"expired{number}",
+                    "user_id": user.id,
+                    "created_at": expired_at,
+                }
+                for number in range(5)
+            ]
+            + [{"token": "fresh", "user_id": user.id, "created_at": now}],
+        )
+        await session.commit()
+
+        assert await prune_expired_access_tokens(session, batch_size=2) == 5
+        remaining = await session.scalars(select(AccessToken.token))
+        assert list(remaining) == ["fresh"]
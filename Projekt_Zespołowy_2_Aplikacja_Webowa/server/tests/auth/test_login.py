@@ -3,6 +3,11 @@ from httpx import AsyncClient
 from app.core.config import get_settings
 import pytest
 from fastapi import status
+from pwdlib.hashers.bcrypt import BcryptHasher
+from sqlalchemy import select, update
+
+from app.models.user import User
+from tests.admin.helpers import create_verified_user, login
 
 settings = get_settings()
 
@@ -165,3 +170,30 @@ async def test_login_unverified_user_nonexistent_email(
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.json()["detail"] == "LOGIN_BAD_CREDENTIALS"
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_legacy_password_hash(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    user = await create_verified_user(
+        email="legacy@example.com",
+        password="Legacy_Password1",
+        first_name="Legacy",
+        last_name="User",
+    )
+    async with db_sessionmaker() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(hashed_password=BcryptHasher().hash("Legacy_Password1"))
+        )
+        await session.commit()
+
+    await login(client, "legacy@example.com", "Legacy_Password1")
+
+    async with db_sessionmaker() as session:
+        hashed_password = await session.scalar(
+            select(User.hashed_password).where(User.id == user.id)
+        )
+    assert hashed_password.startswith("$argon2id$")
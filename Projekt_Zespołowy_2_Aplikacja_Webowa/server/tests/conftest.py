@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+import pytest
 import pytest_asyncio
 from sqlalchemy.pool import NullPool
 from app.main import app
@@ -14,6 +15,8 @@ from app.core.config import get_settings
 from app.core.init_db import init_db
 from app.core import db as core_db
 from app.core.db import get_async_session
+from app.auth.tokens import access_token_cache
+from app.services.all.schedule import public_schedule_cache
 
 
 settings = get_settings()
@@ -34,6 +37,15 @@ async def db_engine() -> AsyncGenerator:
         await engine.dispose()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    public_schedule_cache.clear()
+    access_token_cache.clear()
+    yield
+    public_schedule_cache.clear()
+    access_token_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def db_sessionmaker(db_engine):
     return async_sessionmaker(
@@ -334,3 +334,109 @@ async def test_bulk_attendance_allows_makeup_from_other_group(
     payload = {item["studentId"]: item for item in bulk_response.json()}
     assert payload[str(student_regular.id)]["isMakeup"] is False
     assert payload[str(student_makeup.id)]["isMakeup"] is True
+
+
+@pytest.mark.asyncio
+async def test_bulk_attendance_updates_marks_and_rejects_strangers(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="remark_instructor@example.com",
+        password="Instructor_Password1",
+        first_name="Remark",
+        last_name="Instructor",
+        role=UserRole.INSTRUCTOR,
+    )
+    student = await create_verified_user(
+        email="remark_student@example.com",
+        password="Student_Password1",
+        first_name="Remark",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    stranger = await create_verified_user(
+        email="remark_stranger@example.com",
+        password="Student_Password1",
+        first_name="Remark",
+        last_name="Stranger",
+        role=UserRole.STUDENT,
+    )
+    class_group = await create_class_group(client, deps, str(instructor.id))
+    session_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+        json={
+            "classGroupId": class_group["id"],
+            "date": "2024-03-04",
+            "startTime": "18:00",
+            "endTime": "19:30",
+            "roomId": deps["room_id"],
+            "instructorId": str(instructor.id),
+        },
+    )
+    assert session_response.status_code == status.HTTP_201_CREATED
+    attendance_url = (
+        f"{settings.API_V1_STR}/instructor/sessions/"
+        f"{session_response.json()['id']}/attendance"
+    )
+    enrollment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/enrollments",
+        json={
+            "studentId": str(student.id),
+            "classGroupId": class_group["id"],
+            "status": EnrollmentStatus.ACTIVE.value,
+        },
+    )
+    assert enrollment_response.status_code == status.HTTP_201_CREATED
+
+    await login(
+        client, "remark_instructor@example.com", "Instructor_Password1"
+    )
+    first = await client.post(
+        attendance_url,
+        json={
+            "items": [
+                {
+                    "studentId": str(student.id),
+                    "status": AttendanceStatus.PRESENT.value,
+                }
+            ]
+        },
+    )
+    assert first.status_code == status.HTTP_200_OK
+    second = await client.post(
+        attendance_url,
+        json={
+            "items": [
+                {
+                    "studentId": str(student.id),
+                    "status": AttendanceStatus.ABSENT.value,
+                }
+            ]
+        },
+    )
+    assert second.status_code == status.HTTP_200_OK
+    assert second.json()[0]["id"] == first.json()[0]["id"]
+    assert second.json()[0]["status"] == AttendanceStatus.ABSENT.value
+
+    rejected = await client.post(
+        attendance_url,
+        json={
+            "items": [
+                {
+                    "studentId": str(student.id),
+                    "status": AttendanceStatus.EXCUSED.value,
+                },
+                {
+                    "studentId": str(stranger.id),
+                    "status": AttendanceStatus.PRESENT.value,
+                },
+            ]
+        },
+    )
+    assert rejected.status_code == status.HTTP_400_BAD_REQUEST
+    listed = await client.get(attendance_url)
+    assert [item["status"] for item in listed.json()] == [
+        AttendanceStatus.ABSENT.value
+    ]
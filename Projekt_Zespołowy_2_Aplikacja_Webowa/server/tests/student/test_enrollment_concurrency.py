@@ -0,0 +1,95 @@
+import asyncio
+from collections import Counter
+from datetime import date, time
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.schedule import ClassGroup, ClassGroupStatus
+from app.models.semester import Semester, SkillLevel, Topic
+from app.models.user import User, UserRole
+from app.services.student import enrollment as enrollment_service
+
+STUDENT_COUNT = 200
+CAPACITY = 10
+MAX_CONNECTIONS = 40
+
+
+@pytest.mark.asyncio
+async def test_parallel_enrollments_never_exceed_capacity(
+    db_sessionmaker,
+) -> None:
+    async with db_sessionmaker() as session:
+        semester = Semester(
+            name="2024/2025 Zima",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 6, 30),
+        )
+        level = SkillLevel(name="Poczatkujacy")
+        topic = Topic(name="Salsa")
+        session.add_all([semester, level, topic])
+        await session.flush()
+        class_group = ClassGroup(
+            semester_id=semester.id,
+            name="Salsa - Oblezona",
+            level_id=level.id,
+            topic_id=topic.id,
+            capacity=CAPACITY,
+            day_of_week=1,
+            start_time=time(18),
+            end_time=time(19, 30),
+            is_public=True,
+            status=ClassGroupStatus.OPEN,
+        )
+        students = [
+            User(
+                email=f"rush{number}@example.com",
+                hashed_password="not-used",
+                is_active=True,
+                is_verified=True,
+                first_name="Rush",
+                last_name=str(number),
+                role=UserRole.STUDENT,
+            )
+            for number in range(STUDENT_COUNT)
+        ]
+        session.add(class_group)
+        session.add_all(students)
+        await session.commit()
+        class_group_id = class_group.id
+        student_ids = [student.id for student in students]
+
+    connections = asyncio.Semaphore(MAX_CONNECTIONS)
+
+    async def enroll(student_id) -> EnrollmentStatus:
+        async with connections, db_sessionmaker() as session:
+            enrollment, _ = await enrollment_service.create_student_enrollment(
+                session, student_id=student_id, class_group_id=class_group_id
+            )
+            return enrollment.status
+
+    statuses = Counter(
+        await asyncio.gather(
+            *(enroll(student_id) for student_id in student_ids)
+        )
+    )
+    assert statuses == {
+        EnrollmentStatus.ACTIVE: CAPACITY,
+        EnrollmentStatus.WAITLISTED: STUDENT_COUNT - CAPACITY,
+    }
+
+    async with db_sessionmaker() as session:
+        stored = dict(
+            (
+                await session.execute(
+                    select(Enrollment.status, func.count())
+                    .where(Enrollment.class_group_id == class_group_id)
+                    .group_by(Enrollment.status)
+                )
+            ).all()
+        )
+    assert stored == {
+        EnrollmentStatus.ACTIVE: CAPACITY,
+        EnrollmentStatus.WAITLISTED: STUDENT_COUNT - CAPACITY,
+    }
@@ -1,10 +1,15 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import func, select, update
 
 from app.core.config import get_settings
+from app.models.calendar_change import CalendarChange
 from app.models.enrollment import EnrollmentStatus
 from app.models.user import UserRole
+from app.services.common.calendar_feed import prune_calendar_changes
 from tests.admin.helpers import (
     create_admin_and_login,
     create_verified_user,
@@ -147,3 +152,212 @@ async def test_student_can_view_calendar(
     assert all(
         entry["classGroupId"] == enrolled_group["id"] for entry in entries
     )
+
+
+@pytest.mark.asyncio
+async def test_student_calendar_feed_returns_changes_since_token(
+    client: AsyncClient,
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="feed_instructor@example.com",
+        password="Instructor_Password1",
+        first_name="Feed",
+        last_name="Instructor",
+        role=UserRole.INSTRUCTOR,
+    )
+    student = await create_verified_user(
+        email="feed_student@example.com",
+        password="Student_Password1",
+        first_name="Feed",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    group = await create_class_group(
+        client, deps, str(instructor.id), "Salsa - Feed"
+    )
+    session_ids = []
+    for session_date in ["2024-01-08", "2024-01-15"]:
+        response = await client.post(
+            f"{settings.API_V1_STR}/admin/schedule/class-sessions",
+            json={
+                "classGroupId": group["id"],
+                "date": session_date,
+                "startTime": "18:00",
+                "endTime": "19:30",
+                "roomId": deps["room_id"],
+                "instructorId": str(instructor.id),
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        session_ids.append(response.json()["id"])
+    enrollment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/enrollments",
+        json={
+            "studentId": str(student.id),
+            "classGroupId": group["id"],
+            "status": EnrollmentStatus.ACTIVE.value,
+        },
+    )
+    assert enrollment_response.status_code == status.HTTP_201_CREATED
+
+    await login(client, "feed_student@example.com", "Student_Password1")
+    token_response = await client.post(
+        f"{settings.API_V1_STR}/users/me/calendar-token"
+    )
+    assert token_response.status_code == status.HTTP_200_OK
+    feed_token = token_response.json()["token"]
+    feed_url = f"{settings.API_V1_STR}/me/calendar.ics"
+    assert token_response.json()["feedUrl"].endswith(
+        f"{feed_url}?token={feed_token}"
+    )
+    # Calendar apps poll the feed without the session cookie.
+    client.cookies.clear()
+    full_feed = await client.get(feed_url, params={"token": feed_token})
+    assert full_feed.status_code == status.HTTP_200_OK
+    assert full_feed.headers["content-type"].startswith("text/calendar")
+    assert full_feed.text.count("BEGIN:VEVENT") == 2
+    assert "SUMMARY:Salsa - Feed" in full_feed.text
+    assert "LOCATION:Sala A" in full_feed.text
+    token = full_feed.headers["x-sync-token"]
+
+    unchanged = await client.get(
+        feed_url, params={"token": feed_token, "sync_token": token}
+    )
+    assert unchanged.status_code == status.HTTP_200_OK
+    assert "BEGIN:VEVENT" not in unchanged.text
+    token = unchanged.headers["x-sync-token"]
+
+    await login(client, "admin@example.com", "Admin_Password1")
+    cancel_response = await client.post(
+        f"{settings.API_V1_STR}/admin/schedule/class-sessions/"
+        f"{session_ids[0]}/cancel",
+        json={"reason": "Choroba"},
+    )
+    assert cancel_response.status_code == status.HTTP_200_OK
+
+    client.cookies.clear()
+    delta = await client.get(
+        feed_url, params={"token": feed_token, "sync_token": token}
+    )
+    assert delta.status_code == status.HTTP_200_OK
+    assert delta.text.count("BEGIN:VEVENT") == 1
+    assert "x-sync-full" not in delta.headers
+    assert f"UID:class-session-{session_ids[0]}@tiptap" in delta.text
+    assert "STATUS:CANCELLED" in delta.text
+
+
+@pytest.mark.asyncio
+async def test_calendar_feed_url_can_be_revoked(client: AsyncClient) -> None:
+    await create_verified_user(
+        email="revoke_student@example.com",
+        password="Student_Password1",
+        first_name="Revoke",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    await login(client, "revoke_student@example.com", "Student_Password1")
+    token_url = f"{settings.API_V1_STR}/users/me/calendar-token"
+    feed_url = f"{settings.API_V1_STR}/me/calendar.ics"
+    old_token = (await client.post(token_url)).json()["token"]
+    new_token = (await client.post(token_url)).json()["token"]
+    assert new_token != old_token
+
+    old_feed = await client.get(feed_url, params={"token": old_token})
+    assert old_feed.status_code == status.HTTP_404_NOT_FOUND
+    new_feed = await client.get(feed_url, params={"token": new_token})
+    assert new_feed.status_code == status.HTTP_200_OK
+
+    revoke_response = await client.delete(token_url)
+    assert revoke_response.status_code == status.HTTP_204_NO_CONTENT
+    revoked_feed = await client.get(feed_url, params={"token": new_token})
+    assert revoked_feed.status_code == status.HTTP_404_NOT_FOUND
+    missing_token = await client.get(feed_url)
+    assert missing_token.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_calendar_feed_is_full_for_tokens_older_than_the_log(
+    client: AsyncClient, db_sessionmaker
+) -> None:
+    await create_admin_and_login(client)
+    deps = await create_schedule_dependencies(client)
+    instructor = await create_verified_user(
+        email="pruned_instructor@example.com",
+        password="Instructor_Password1",
+        first_name="Pruned",
+        last_name="Instructor",
+        role=UserRole.INSTRUCTOR,
+    )
+    student = await create_verified_user(
+        email="pruned_student@example.com",
+        password="Student_Password1",
+        first_name="Pruned",
+        last_name="Student",
+        role=UserRole.STUDENT,
+    )
+    group = await create_class_group(
+        client, deps, str(instructor.id), "Salsa - Pruned"
+    )
+    sessions_url = f"{settings.API_V1_STR}/admin/schedule/class-sessions"
+    session_ids = []
+    for session_date in ["2024-01-08", "2024-01-15"]:
+        response = await client.post(
+            sessions_url,
+            json={
+                "classGroupId": group["id"],
+                "date": session_date,
+                "startTime": "18:00",
+                "endTime": "19:30",
+                "roomId": deps["room_id"],
+                "instructorId": str(instructor.id),
+            },
+        )
+        session_ids.append(response.json()["id"])
+    enrollment_response = await client.post(
+        f"{settings.API_V1_STR}/admin/enrollments",
+        json={
+            "studentId": str(student.id),
+            "classGroupId": group["id"],
+            "status": EnrollmentStatus.ACTIVE.value,
+        },
+    )
+    assert enrollment_response.status_code == status.HTTP_201_CREATED
+
+    await login(client, "pruned_student@example.com", "Student_Password1")
+    feed_token = (
+        await client.post(f"{settings.API_V1_STR}/users/me/calendar-token")
+    ).json()["token"]
+    feed_url = f"{settings.API_V1_STR}/me/calendar.ics"
+    full_feed = await client.get(feed_url, params={"token": feed_token})
+    assert full_feed.headers["x-sync-full"] == "true"
+    token = full_feed.headers["x-sync-token"]
+
+    await login(client, "admin@example.com", "Admin_Password1")
+    await client.post(f"{sessions_url}/{session_ids[0]}/cancel", json={})
+    async with db_sessionmaker() as session:
+        await session.execute(
+            update(CalendarChange).values(
+                changed_at=datetime.now(timezone.utc)
+                - timedelta(days=settings.CALENDAR_CHANGE_RETENTION_DAYS + 1)
+            )
+        )
+        await session.commit()
+    await client.post(f"{sessions_url}/{session_ids[1]}/cancel", json={})
+
+    async with db_sessionmaker() as session:
+        assert await prune_calendar_changes(session, batch_size=2) > 0
+        oldest_kept = await session.scalar(
+            select(func.min(CalendarChange.changed_at))
+        )
+        assert oldest_kept > datetime.now(timezone.utc) - timedelta(days=1)
+
+    # The first cancellation is gone from the log, so a delta would miss
+    # it; the whole calendar comes back instead.
+    feed = await client.get(
+        feed_url, params={"token": feed_token, "sync_token": token}
+    )
+    assert feed.status_code == status.HTTP_200_OK
+    assert feed.headers["x-sync-full"] == "true"
+    assert feed.text.count("STATUS:CANCELLED") == 2